@@ -0,0 +1,39 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import copy
+import timeit
+
+from src.fullSystemCPG import FullSystemCPG
+
+from models.simulationParameters import SimulationParameters
+
+# micro-benchmark of CapitalCostSystem.solve of the default CPG system,
+# compared with the two deep copies of the LCOE model it used to make per solve
+
+if __name__ == '__main__':
+    params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+    params.m_dot_IP = 80
+    full_system = FullSystemCPG.getDefaultCPGSystem(params)
+    full_system.solve()
+    capital_cost_model = full_system.capital_cost_model
+
+    number = 2000
+    t_solve = timeit.timeit(capital_cost_model.solve, number = number) / number
+    t_copies = timeit.timeit(lambda: [copy.deepcopy(capital_cost_model.lcoe_model) for i in range(2)], number = number) / number
+
+    print('CapitalCostSystem.solve:              %6.1f us'%(t_solve * 1e6))
+    print('two deep copies of the LCOE model:    %6.1f us'%(t_copies * 1e6))
+    print('solve with the removed copies:        %6.1f us'%((t_solve + t_copies) * 1e6))
@@ -17,7 +17,8 @@ import os
 import numpy as np
 
 from src.fullSystemCPG import FullSystemCPG
-from src.fullSystemSolver import FullSystemSolver
+from src.fullSystemSolverBrent import FullSystemSolverBrent
+from src.parameterSweep import ParameterSweep, SweepJournal
 
 from models.simulationParameters import SimulationParameters
 
@@ -25,43 +26,25 @@ logTrans = np.arange(2., 8., 1.)
 permeabilities = 1e-15 * 10. ** logTrans
 depths = np.arange(1000, 8000, 1000)
 
-# create output folder
-output_folder = 'results'
-if not os.path.exists(output_folder):
-    os.mkdir(output_folder)
+def setPoint(params, point):
+    params.depth = point['depth']
+    params.permeability = point['permeability'] / 100.
 
-output_file = open(os.path.join(output_folder, 'data_CO2.csv'), 'w')
+if __name__ == '__main__':
+    # create output folder
+    output_folder = 'results'
+    if not os.path.exists(output_folder):
+        os.mkdir(output_folder)
 
-# initialize parameters
-params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+    # initialize parameters
+    params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
 
-# generate the full system
-full_system = FullSystemCPG.getDefaultCPGSystem(params)
-full_system_solver = FullSystemSolver(full_system)
+    # solve the system for all depths and permeabilities on all cores,
+    # every worker reuses one full system and starts from the previous point,
+    # Brent's method refines the bracket around the optimum of the previous point
+    sweep = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, solver = FullSystemSolverBrent, set_params = setPoint, warm_start = True)
+    points = ParameterSweep.getGrid(depth = depths, permeability = permeabilities)
 
-# iterate over all depths and permeabilities and solve the system
-for depth in depths:
-    for permeability in permeabilities:
-        print('Depth: ', depth)
-        print('Permeability: ', permeability)
-        params.depth = depth
-        params.permeability = permeability / 100.
-
-        try:
-            output = full_system_solver.solve()
-            lcoe_b = output.capital_cost_model.LCOE_brownfield.LCOE * 1e6
-            lcoe_g = output.capital_cost_model.LCOE_greenfield.LCOE * 1e6
-            power = output.energy_results.W_net / 1e6
-            optMdot = output.optMdot
-            error_str = ''
-
-        except Exception as error:
-            error_str = str(error).replace("\n", "").replace(",", " - ")
-            lcoe_b = 0.
-            lcoe_g = 0.
-            power = 0.
-            optMdot = 0.
-
-        output_file.write(','.join([str(i) for i in [depth, permeability, optMdot, lcoe_b, lcoe_g, power, """%s\n"""%error_str]]))
-
-output_file.close()
+    # finished points are kept in the journal, a restarted sweep only solves the missing points
+    journal = SweepJournal(os.path.join(output_folder, 'data_CO2.journal'))
+    sweep.run(points, journal = journal, output_path = os.path.join(output_folder, 'data_CO2.csv'))
@@ -13,11 +13,65 @@
 #
 
 ############################
+import copy
+import json
+import hashlib
+from enum import Enum
+
 from models.optimizationType import OptimizationType
 from models.coolingCondensingTowerMode import CoolingCondensingTowerMode
 from models.wellFieldType import WellFieldType
 
-class SimulationParameters(object):
+class SimulationParametersBase(object):
+    """SimulationParametersBase provides the derived quantities, the canonical
+    key and replace of SimulationParameters and FrozenSimulationParameters."""
+
+    __slots__ = ()
+
+    @property
+    def transmissivity(self):
+        return self.permeability * self.reservoir_thickness
+
+    def T_reservoir(self):
+        return abs(self.depth) * abs(self.dT_dz) + self.T_surface_rock
+
+    def P_reservoir(self):
+        return abs(self.depth) * 1000. * self.g
+
+    def P_reservoir_max(self):
+        return abs(self.depth) * 2500. * self.g
+
+    def key(self):
+        # stable hash of all values, independent of the process
+        values = {}
+        for name, val in self.getValues().items():
+            if isinstance(val, Enum):
+                val = '%s.%s'%(type(val).__name__, val.name)
+            elif hasattr(val, 'item'):
+                val = val.item()
+            values[name] = val
+        return hashlib.sha1(json.dumps(values, sort_keys = True, default = str).encode()).hexdigest()
+
+    def checkNames(self, changes):
+        for name in changes:
+            if name not in self.getValues():
+                raise Exception('GenGeo::SimulationParameters:UnknownParameter - Unknown parameter %s!'%name)
+
+    def thaw(self):
+        params = SimulationParameters.__new__(SimulationParameters)
+        params.__dict__.update(self.getValues())
+        return params
+
+    def freeze(self):
+        values = self.getValues()
+        unknown = sorted(set(values) - set(parameter_names))
+        if unknown:
+            # a frozen copy would silently drop them
+            raise Exception('GenGeo::SimulationParameters:UnknownParameter - Unknown parameters %s cannot be frozen!'%', '.join(unknown))
+        return FrozenSimulationParameters.fromValues(values)
+
+
+class SimulationParameters(SimulationParametersBase):
     """SimulationParameters provides physical properties of the system."""
 
     def __init__(self,
@@ -65,6 +119,12 @@ class SimulationParameters(object):
                 k_rock = 2.1,                   # W/m-K
                 useWellboreHeatLoss = True,     # bool
                 well_segments = 100,            # number of well segments
+                well_segments_adaptive = False, # bool, adapt the segment lengths to the tolerances
+                well_tolerance_P = 1.e4,        # Pa, tolerance of the adaptive well outlet pressure
+                well_tolerance_T = 0.1,         # C, tolerance of the adaptive well outlet temperature
+                well_reuse_tolerance_P = 1.,    # Pa, a well solution is reused for initial pressures within this tolerance (far below the 1 kPa of the CO2 dP_pump loop)
+                well_reuse_tolerance_T = 1.e-4, # C, a well solution is reused for initial temperatures within this tolerance
+                well_profiles = False,          # bool, keep the full profiles in the well results, otherwise only the outlet
                 # Friction factor
                 well_relative_roughness = 55 * 1e-6             # um
                     ):
@@ -109,9 +169,97 @@ class SimulationParameters(object):
         self.k_rock = k_rock
         self.useWellboreHeatLoss = useWellboreHeatLoss
         self.well_segments = well_segments
+        self.well_segments_adaptive = well_segments_adaptive
+        self.well_tolerance_P = well_tolerance_P
+        self.well_tolerance_T = well_tolerance_T
+        self.well_reuse_tolerance_P = well_reuse_tolerance_P
+        self.well_reuse_tolerance_T = well_reuse_tolerance_T
+        self.well_profiles = well_profiles
         self.epsilon = well_relative_roughness
 
-    @property
-    def transmissivity(self):
-        return self.permeability * self.reservoir_thickness
+    def getValues(self):
+        return dict(vars(self))
+
+    def replace(self, **changes):
+        self.checkNames(changes)
+        params = copy.copy(self)
+        params.__dict__.update(changes)
+        return params
+
+# names of the parameters as attributes, as set by SimulationParameters.__init__
+parameter_names = ('working_fluid', 'orc_fluid', 'm_dot_IP', 'time_years', 'depth', 'pump_depth',
+                   'well_radius', 'well_spacing', 'monitoring_well_radius', 'dT_dz',
+                   'silica_precipitation', 'T_surface_rock', 'T_ambient_C', 'reservoir_thickness',
+                   'permeability', 'wellFieldType', 'N_5spot', 'has_surface_gathering_system',
+                   'max_pump_dP', 'eta_pump', 'dT_approach', 'dT_pinch', 'eta_pump_orc',
+                   'eta_turbine_orc', 'eta_pump_co2', 'eta_turbine_co2', 'cooling_mode',
+                   'cost_year', 'success_rate', 'F_OM', 'discount_rate', 'lifetime',
+                   'capacity_factor', 'opt_mode', 'g', 'rho_rock', 'c_rock', 'k_rock',
+                   'useWellboreHeatLoss', 'well_segments', 'well_segments_adaptive',
+                   'well_tolerance_P', 'well_tolerance_T', 'well_reuse_tolerance_P',
+                   'well_reuse_tolerance_T', 'well_profiles', 'epsilon')
+
+class FrozenSimulationParameters(SimulationParametersBase):
+    """FrozenSimulationParameters is an immutable, slotted copy of
+    SimulationParameters which can be hashed and used as a cache key. The
+    derived quantities are cached. It is accepted by all models which only
+    read the params; systems which change the params during a solve (e.g. the
+    mass flow of the optimizers) are built on a mutable copy (thaw)."""
+
+    __slots__ = parameter_names + ('cache',)
+
+    def __init__(self, params = None, **kwargs):
+        if params == None:
+            params = SimulationParameters(**kwargs)
+        for name in parameter_names:
+            object.__setattr__(self, name, getattr(params, name))
+        object.__setattr__(self, 'cache', {})
+
+    @staticmethod
+    def fromValues(values):
+        params = FrozenSimulationParameters.__new__(FrozenSimulationParameters)
+        for name in parameter_names:
+            object.__setattr__(params, name, values[name])
+        object.__setattr__(params, 'cache', {})
+        return params
+
+    def __setattr__(self, name, val):
+        raise Exception('GenGeo::FrozenSimulationParameters:Frozen - Use replace to change %s!'%name)
+
+    def __reduce__(self):
+        return (FrozenSimulationParameters.fromValues, (self.getValues(),))
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenSimulationParameters):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def getValues(self):
+        return {name: getattr(self, name) for name in parameter_names}
+
+    def getCached(self, name, function):
+        if name not in self.cache:
+            self.cache[name] = function(self)
+        return self.cache[name]
+
+    def key(self):
+        return self.getCached('key', SimulationParametersBase.key)
+
+    def T_reservoir(self):
+        return self.getCached('T_reservoir', SimulationParametersBase.T_reservoir)
+
+    def P_reservoir(self):
+        return self.getCached('P_reservoir', SimulationParametersBase.P_reservoir)
+
+    def P_reservoir_max(self):
+        return self.getCached('P_reservoir_max', SimulationParametersBase.P_reservoir_max)
+
+    def replace(self, **changes):
+        self.checkNames(changes)
+        values = self.getValues()
+        values.update(changes)
+        return FrozenSimulationParameters.fromValues(values)
 
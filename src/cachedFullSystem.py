@@ -0,0 +1,133 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+
+from utils.constantsAndPaths import getProjectRoot, getFullSystemCache
+from utils.coolPropInterface import tabulated_backend
+from utils.fluidState import FluidState
+
+# increase to invalidate all cached evaluations
+cache_version = 1
+
+def getCodeSalt():
+    # hash of the source code and the data files (e.g. PPI table), cached
+    # evaluations of other code or data versions are not used
+    sha = hashlib.sha1(str(cache_version).encode())
+    for folder, extension in [('src', '.py'), ('utils', '.py'), ('models', '.py'), ('data', '')]:
+        root = os.path.join(getProjectRoot(), folder)
+        for name in sorted(os.listdir(root)):
+            path = os.path.join(root, name)
+            if name.endswith(extension) and os.path.isfile(path):
+                with open(path, 'rb') as source_file:
+                    sha.update(name.encode())
+                    sha.update(source_file.read())
+    return sha.hexdigest()
+
+class CachedFullSystem(object):
+    """CachedFullSystem wraps a full system (e.g. FullSystemCPG) and memoizes its
+    solve in a SQLite file. Entries are keyed by a hash of the params, the
+    system type and a salt of the source code and data; solves failing with a
+    GenGeo:: error are cached with their message and raised again, other
+    errors are not cached. The least recently used entries are
+    evicted above max_entries or max_bytes. It can be used in place of the
+    full system, e.g. FullSystemSolver(CachedFullSystem(full_system))."""
+
+    def __init__(self, full_system, path = None, max_entries = 100000, max_bytes = 1e9, salt = None):
+        self.full_system = full_system
+        self.path = path if path != None else getFullSystemCache()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.salt = salt if salt != None else getCodeSalt()
+        self.hits = 0
+        self.misses = 0
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        # several processes may share the file
+        self.connection = sqlite3.connect(self.path, timeout = 60.)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS evaluations (key TEXT PRIMARY KEY, output BLOB, error TEXT, size INTEGER, accessed REAL)')
+        self.connection.commit()
+
+    @property
+    def params(self):
+        return self.full_system.params
+
+    @property
+    def capital_cost_model(self):
+        return self.full_system.capital_cost_model
+
+    def getKey(self):
+        names = [self.params.key(), type(self.full_system).__name__, self.salt,
+                 FluidState.single_flash, sorted(tabulated_backend.tables)]
+        return hashlib.sha1(json.dumps(names).encode()).hexdigest()
+
+    def solve(self):
+        key = self.getKey()
+        entry = self.connection.execute('SELECT output, error FROM evaluations WHERE key = ?', (key,)).fetchone()
+        if entry != None:
+            self.hits += 1
+            self.connection.execute('UPDATE evaluations SET accessed = ? WHERE key = ?', (time.time(), key))
+            self.connection.commit()
+            output, error = entry
+            if error != None:
+                raise Exception(error)
+            return pickle.loads(output)
+
+        self.misses += 1
+        try:
+            output = self.full_system.solve()
+        except Exception as ex:
+            # only the deterministic errors of the models are cached
+            if str(ex).startswith('GenGeo::'):
+                self.put(key, None, str(ex))
+            raise ex
+        self.put(key, pickle.dumps(output, protocol = pickle.HIGHEST_PROTOCOL), None)
+        return output
+
+    def put(self, key, output, error):
+        size = len(output) if output != None else len(error)
+        self.connection.execute('INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)', (key, output, error, size, time.time()))
+        self.evict()
+        self.connection.commit()
+
+    def evict(self):
+        # least recently used entries first
+        entries, size = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evaluations').fetchone()
+        if entries > self.max_entries:
+            self.deleteOldest(entries - self.max_entries)
+            entries, size = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evaluations').fetchone()
+        while size > self.max_bytes and entries > 1:
+            self.deleteOldest(max(entries // 10, 1))
+            entries, size = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evaluations').fetchone()
+
+    def deleteOldest(self, N):
+        self.connection.execute('DELETE FROM evaluations WHERE key IN (SELECT key FROM evaluations ORDER BY accessed LIMIT ?)', (N,))
+
+    def info(self):
+        entries, size = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evaluations').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
+
+    def clear(self):
+        self.connection.execute('DELETE FROM evaluations')
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -13,6 +13,7 @@
 #
 
 ############################
+import numpy as np
 
 from utils.readXlsxData import readCostTable
 
@@ -64,8 +65,12 @@ class CapitalCostSurfacePipes(object):
                 9: 1.09,
                 10: 1.13
                 }
-            L_surfacePipe = L_surfacePipe_manyN[params.N_5spot]
-            D_surfacePipe = D_surfacePipe_manyN[params.N_5spot]
+            if np.ndim(params.N_5spot) > 0:
+                L_surfacePipe = np.vectorize(L_surfacePipe_manyN.__getitem__, otypes = [float])(params.N_5spot)
+                D_surfacePipe = np.vectorize(D_surfacePipe_manyN.__getitem__, otypes = [float])(params.N_5spot)
+            else:
+                L_surfacePipe = L_surfacePipe_manyN[params.N_5spot]
+                D_surfacePipe = D_surfacePipe_manyN[params.N_5spot]
         else:
             L_surfacePipe = 707
             D_surfacePipe = 0.41
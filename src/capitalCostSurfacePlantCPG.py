@@ -32,8 +32,6 @@ class CapitalCostSurfacePlantCPG(object):
         self.params = params
         if self.params == None:
             self.params = SimulationParameters(**kwargs)
-        self.ppi_T_G = readCostTable('PPI_T-G')
-        self.ppi_pump = readCostTable('PPI_Pump')
 
     def solve(self, energy_results, fluid_system):
 
@@ -60,22 +58,27 @@ class CapitalCostSurfacePlantCPG(object):
         if dT_approach_CT < 0 or dT_range_CT < 0:
             raise Exception('GenGeo::CapitalCostSurfacePlantCPG:NegativedT - Negative Temp Difference')
 
+        return CapitalCostSurfacePlantCPG.plantCosts(self.params, W_turbine, W_pump_inj, Q_desuperheater, Q_condenser, dT_range_CT)
+
+    @staticmethod
+    def plantCosts(params, W_turbine, W_pump_inj, Q_desuperheater, Q_condenser, dT_range_CT = 0.):
+        # powers, heats and params may be arrays of design points
         results = CapitalCostSurfacePlantCPGResults()
 
         # C_T_G
         # Regular fluid
         S_T_fluid = 1.20 #CO2
-        results.C_T_G = 0.67 * self.ppi_T_G[self.params.cost_year] * (S_T_fluid*2830*(W_turbine/1e3)**0.745 + 3680*(W_turbine/1e3)**0.617)
+        results.C_T_G = 0.67 * readCostTable('PPI_T-G', params.cost_year) * (S_T_fluid*2830*(W_turbine/1e3)**0.745 + 3680*(W_turbine/1e3)**0.617)
 
         # C_pump_inj
         C_pump_surface_inj = 1750 * (1.34*-1*(W_pump_inj/1e3))**0.7
         S_pump_inj = 2.09 #CO2
-        results.C_pump_inj = self.ppi_pump[self.params.cost_year] * S_pump_inj * C_pump_surface_inj
+        results.C_pump_inj = readCostTable('PPI_Pump', params.cost_year) * S_pump_inj * C_pump_surface_inj
 
         # C_coolingTowers
         TDC = 1.2
         results.C_coolingTowers = CoolingCondensingTower.specificCaptitalCost(Q_desuperheater, Q_condenser, TDC,
-                                                    T_ambient_C, dT_approach_CT, dT_range_CT, self.params.cost_year, self.params.cooling_mode)
+                                                    params.T_ambient_C, params.dT_approach, dT_range_CT, params.cost_year, params.cooling_mode)
 
         # C_primaryEquipment
         C_primaryEquipment = results.C_T_G + results.C_pump_inj + results.C_coolingTowers
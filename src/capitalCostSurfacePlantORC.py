@@ -33,9 +33,6 @@ class CapitalCostSurfacePlantORC(object):
         self.params = params
         if self.params == None:
             self.params = SimulationParameters(**kwargs)
-        self.ppi_T_G = readCostTable('PPI_T-G')
-        self.ppi_pump = readCostTable('PPI_Pump')
-        self.ppi_HX = readCostTable('PPI_HX')
 
     def solve(self, energy_results, fluid_system):
 
@@ -48,9 +45,6 @@ class CapitalCostSurfacePlantORC(object):
         W_pump_orc = energy_results.W_pump_orc_total
         W_pump_prod = energy_results.W_pump_prod_total
 
-        T_ambient_C = self.params.T_ambient_C
-        dT_approach_CT = self.params.dT_approach
-
         orc_results = fluid_system.pp
         dT_range_CT = orc_results.dT_range_CT
         dT_LMTD_preheater = orc_results.dT_LMTD_preheater
@@ -59,48 +53,64 @@ class CapitalCostSurfacePlantORC(object):
 
         # # TODO: Do some checks if temp is correct
 
+        return CapitalCostSurfacePlantORC.plantCosts(self.params, Q_preheater, Q_boiler, Q_recuperator, Q_desuperheater, Q_condenser,
+                                    W_turbine, W_pump_orc, W_pump_prod, dT_range_CT, dT_LMTD_preheater, dT_LMTD_boiler, dT_LMTD_recuperator)
+
+    @staticmethod
+    def plantCosts(params, Q_preheater, Q_boiler, Q_recuperator, Q_desuperheater, Q_condenser,
+                    W_turbine, W_pump_orc, W_pump_prod, dT_range_CT, dT_LMTD_preheater, dT_LMTD_boiler, dT_LMTD_recuperator):
+        # powers, heats, temperature differences and params may be arrays of design points
         results = CapitalCostSurfacePlantORCResults()
 
         # C_T_G
         #Regular fluid
         S_T_fluid = 1.00  #Not CO2
-        results.C_T_G = 0.67 * self.ppi_T_G[self.params.cost_year] * (S_T_fluid*2830*(W_turbine/1e3)**0.745 + 3680*(W_turbine/1e3)**0.617)
+        results.C_T_G = 0.67 * readCostTable('PPI_T-G', params.cost_year) * (S_T_fluid*2830*(W_turbine/1e3)**0.745 + 3680*(W_turbine/1e3)**0.617)
 
         # C_pump (ORC)
         C_pump_orc_surface = 1750 * (1.34*-1*(W_pump_orc/1e3))**0.7
         S_pump_orc = 1.00  #Water
-        results.C_pump_orc = self.ppi_pump[self.params.cost_year] * S_pump_orc * C_pump_orc_surface
+        results.C_pump_orc = readCostTable('PPI_Pump', params.cost_year) * S_pump_orc * C_pump_orc_surface
 
         # C_coolingTowers
         TDC = 1
         results.C_coolingTowers = CoolingCondensingTower.specificCaptitalCost(Q_desuperheater, Q_condenser, TDC,
-                                                    T_ambient_C, dT_approach_CT, dT_range_CT, self.params.cost_year, self.params.cooling_mode)
+                                                    params.T_ambient_C, params.dT_approach, dT_range_CT, params.cost_year, params.cooling_mode)
 
         # C_heatExchanger
         #dT_LMTD_HX
         #U = 500/1000 #kW/m**2-K
         U = 500 #W/m**2-K
-        if np.isnan(dT_LMTD_preheater) or dT_LMTD_preheater == 0:
-            A_preheater = 0
+        if np.ndim(dT_LMTD_preheater) > 0 or np.ndim(dT_LMTD_recuperator) > 0:
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                no_preheater = np.isnan(dT_LMTD_preheater) | (dT_LMTD_preheater == 0)
+                A_preheater = np.where(no_preheater, 0., Q_preheater / U / dT_LMTD_preheater)
+                no_recuperator = np.isnan(dT_LMTD_recuperator) | (dT_LMTD_recuperator == 0)
+                A_recuperator = Q_recuperator / U / dT_LMTD_recuperator
+            C_recuperator = np.where(no_recuperator, 0., readCostTable('PPI_HX', params.cost_year) * (239*A_recuperator + 13400))
         else:
-            A_preheater = Q_preheater / U / dT_LMTD_preheater
+            if np.isnan(dT_LMTD_preheater) or dT_LMTD_preheater == 0:
+                A_preheater = 0
+            else:
+                A_preheater = Q_preheater / U / dT_LMTD_preheater
+
+            # C_recuperator
+            if np.isnan(dT_LMTD_recuperator) or dT_LMTD_recuperator == 0:
+                A_recuperator = 0
+                C_recuperator = 0
+            else:
+                A_recuperator = Q_recuperator / U / dT_LMTD_recuperator
+                C_recuperator = readCostTable('PPI_HX', params.cost_year) * (239*A_recuperator + 13400)
 
         A_boiler = Q_boiler / U / dT_LMTD_boiler
         A_HX = A_preheater + A_boiler
-        results.C_heatExchanger = self.ppi_HX[self.params.cost_year] * (239*A_HX + 13400)
-
-        # C_recuperator
-        if np.isnan(dT_LMTD_recuperator) or dT_LMTD_recuperator == 0:
-            A_recuperator = 0
-            results.C_recuperator = 0
-        else:
-            A_recuperator = Q_recuperator / U / dT_LMTD_recuperator
-            results.C_recuperator = self.ppi_HX[self.params.cost_year] * (239*A_recuperator + 13400)
+        results.C_heatExchanger = readCostTable('PPI_HX', params.cost_year) * (239*A_HX + 13400)
+        results.C_recuperator = C_recuperator
 
         # C_productionPump
         C_pump_prod_lineshaft = 1750 * (1.34*-1*(W_pump_prod/1e3))**0.7 + 5750 * (1.34*-1*(W_pump_prod/1e3))**0.2
         S_pump_prod = 1.00 #Water
-        results.C_pump_prod = self.ppi_pump[self.params.cost_year] * S_pump_prod * C_pump_prod_lineshaft
+        results.C_pump_prod = readCostTable('PPI_Pump', params.cost_year) * S_pump_prod * C_pump_prod_lineshaft
 
         # THEN
         # C_primaryEquipment
@@ -19,6 +19,27 @@ import numpy as np
 class CapitalCostSystemOutput(object):
     """CapitalCostSystemOutput."""
 
+class CapitalCostComponent(object):
+    """CapitalCostComponent evaluates a capital cost function of the params on
+    demand and memoizes the cost on the values of the params it depends on."""
+
+    def __init__(self, cost_function, params, dependencies):
+        self.cost_function = cost_function
+        self.params = params
+        self.dependencies = dependencies
+        self.key = None
+        self.value = None
+
+    def getKey(self):
+        return tuple(getattr(self.params, name) for name in self.dependencies)
+
+    def cost(self):
+        key = self.getKey()
+        if self.value is None or key != self.key:
+            self.value = self.cost_function(params = self.params)
+            self.key = key
+        return self.value
+
 class CapitalCostSystem(object):
     """CapitalCostSystem."""
 
@@ -38,23 +59,44 @@ class CapitalCostSystem(object):
 
         results = CapitalCostSystemOutput()
 
-        lcoe_model_greenfield = copy.deepcopy(self.lcoe_model)
-        lcoe_model_brownfield = copy.deepcopy(self.lcoe_model)
-
         results.C_surface_plant = self.CapitalCost_SurfacePlant.solve(self.energy_results, self.fluid_system)
-        results.C_gathering_system = self.CapitalCost_SurfacePipe
-        results.C_wells_production = self.CapitalCost_Production_Well
-        results.C_wells_injection = self.CapitalCost_Injection_Well
-        results.C_wellfield = self.CapitalCost_Wellfield
-        results.C_exploration = self.CapitalCost_Exploration
-        results.C_stimulation = self.CapitalCost_Stimulation
+        results.C_gathering_system = CapitalCostSystem.getCost(self.CapitalCost_SurfacePipe)
+        results.C_wells_production = CapitalCostSystem.getCost(self.CapitalCost_Production_Well)
+        results.C_wells_injection = CapitalCostSystem.getCost(self.CapitalCost_Injection_Well)
+        results.C_wellfield = CapitalCostSystem.getCost(self.CapitalCost_Wellfield)
+        results.C_exploration = CapitalCostSystem.getCost(self.CapitalCost_Exploration)
+        results.C_stimulation = CapitalCostSystem.getCost(self.CapitalCost_Stimulation)
 
         C_surface_plant_plant = results.C_surface_plant.C_plant
 
         results.C_greenfield = np.sum([C_surface_plant_plant, results.C_gathering_system, results.C_wells_production, results.C_wells_injection, results.C_wellfield, results.C_exploration, results.C_stimulation])
         results.C_brownfield = np.sum([C_surface_plant_plant, results.C_gathering_system, results.C_wells_production])
 
-        results.LCOE_greenfield = lcoe_model_greenfield.solve(results.C_greenfield, self.energy_results)
-        results.LCOE_brownfield = lcoe_model_brownfield.solve(results.C_brownfield, self.energy_results)
+        # the lcoe model is stateless and returns a new output per call
+        results.LCOE_greenfield = self.lcoe_model.solve(results.C_greenfield, self.energy_results)
+        results.LCOE_brownfield = self.lcoe_model.solve(results.C_brownfield, self.energy_results)
 
         return results
+
+    def copyWithParams(self, params):
+        # same components evaluated from other params, fixed costs are kept
+        capital_cost_system = copy.copy(self)
+        capital_cost_system.energy_results = None
+        capital_cost_system.fluid_system = None
+        for name in ['CapitalCost_SurfacePlant', 'CapitalCost_SurfacePipe', 'CapitalCost_Production_Well',
+                     'CapitalCost_Injection_Well', 'CapitalCost_Wellfield', 'CapitalCost_Exploration',
+                     'CapitalCost_Stimulation', 'lcoe_model']:
+            component = getattr(self, name)
+            if isinstance(component, CapitalCostComponent):
+                component = CapitalCostComponent(component.cost_function, params, component.dependencies)
+            elif hasattr(component, 'params'):
+                component = type(component)(params = params)
+            setattr(capital_cost_system, name, component)
+        return capital_cost_system
+
+    @staticmethod
+    def getCost(component):
+        # components are either fixed costs or evaluated from the current params
+        if isinstance(component, CapitalCostComponent):
+            return component.cost()
+        return component
@@ -0,0 +1,140 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import numpy as np
+
+from src.capitalCostSurfacePlantCPG import CapitalCostSurfacePlantCPG
+from src.capitalCostSurfacePlantORC import CapitalCostSurfacePlantORC
+from src.capitalCostSurfacePipes import CapitalCostSurfacePipes
+from src.capitalCostWell import CapitalCostWell
+from src.capitalCostWellField import CapitalCostWellField
+from src.capitalCostExploration import CapitalCostExploration
+from src.capitalCostWellStimulation import CapitalCostWellStimulation
+from src.lCOESimple import LCOESimple
+
+from models.simulationParameters import SimulationParameters
+
+class CapitalCostSystemVectorizedOutput(object):
+    """CapitalCostSystemVectorizedOutput."""
+    pass
+
+class CapitalCostSystemVectorized(object):
+    """CapitalCostSystemVectorized computes the capital costs and LCOE of many
+    design points at once with the component cost models of the default CPG and
+    ORC systems. Energy results and design parameters (e.g. depth, N_5spot,
+    cost_year, discount_rate) are given as arrays or scalars, which are
+    broadcast against each other; all other parameters are taken from params.
+    Design points which the scalar cost models would reject are nan."""
+
+    cpg_columns = ['W_net_total', 'W_turbine_total', 'W_pump_total', 'Q_condenser_total', 'Q_desuperheater_total']
+    orc_columns = ['W_net_total', 'W_turbine_total', 'W_pump_orc_total', 'W_pump_prod_total', 'Q_preheater_total', 'Q_boiler_total',
+                    'Q_recuperator_total', 'Q_desuperheater_total', 'Q_condenser_total',
+                    'dT_range_CT', 'dT_LMTD_preheater', 'dT_LMTD_boiler', 'dT_LMTD_recuperator']
+    # columns which are taken from the power plant results of the fluid system
+    pp_columns = ['dT_range_CT', 'dT_LMTD_preheater', 'dT_LMTD_boiler', 'dT_LMTD_recuperator']
+
+    def __init__(self, params = None, **kwargs):
+        self.params = params
+        if self.params == None:
+            self.params = SimulationParameters(**kwargs)
+
+    @staticmethod
+    def getEnergyColumns(outputs, columns):
+        # collects the energy columns of a list of FullSystemOutput
+        energy = {}
+        for column in columns:
+            if column in CapitalCostSystemVectorized.pp_columns:
+                energy[column] = np.array([getattr(output.fluid_system_solver.pp, column) for output in outputs], dtype = float)
+            else:
+                energy[column] = np.array([getattr(output.energy_results, column) for output in outputs], dtype = float)
+        return energy
+
+    def getColumns(self, energy, design, columns):
+        missing = [column for column in columns if column not in energy]
+        if missing:
+            raise Exception('GenGeo::CapitalCostSystemVectorized:MissingColumn - Missing energy columns %s!'%missing)
+        for key in design:
+            if not hasattr(self.params, key):
+                raise Exception('GenGeo::CapitalCostSystemVectorized:UnknownParameter - Unknown design parameter %s!'%key)
+        values = [np.asarray(energy[column], dtype = float) for column in columns] + [np.asarray(val) for val in design.values()]
+        shape = np.broadcast(*values).shape
+        energy = {column: np.broadcast_to(val, shape) for column, val in zip(columns, values)}
+        params = self.params.replace(**{key: np.broadcast_to(val, shape) for key, val in zip(design, values[len(columns):])})
+        # checks of LCOESimple
+        with np.errstate(invalid = 'ignore'):
+            valid = (params.F_OM >= 0) & (params.discount_rate >= 0) & (params.lifetime > 0) & (params.capacity_factor > 0) & (params.capacity_factor <= 1)
+        return params, energy, np.broadcast_to(valid, shape)
+
+    def solveCPG(self, energy, **design):
+        params, energy, valid = self.getColumns(energy, design, CapitalCostSystemVectorized.cpg_columns)
+
+        W_turbine = energy['W_turbine_total']
+        W_pump_inj = energy['W_pump_total']
+        Q_condenser = energy['Q_condenser_total']
+        Q_desuperheater = energy['Q_desuperheater_total']
+        W_pump_inj = np.where((0. < W_pump_inj) & (W_pump_inj < 10000.), 0., W_pump_inj)
+
+        # checks of CapitalCostSurfacePlantCPG
+        with np.errstate(invalid = 'ignore'):
+            valid = valid & (W_turbine >= 0) & ~(Q_desuperheater > 0) & ~(Q_condenser > 0) & ~(W_pump_inj > 0) & (params.dT_approach >= 0)
+            C_surface_plant = CapitalCostSurfacePlantCPG.plantCosts(params, W_turbine, W_pump_inj, Q_desuperheater, Q_condenser)
+
+        C_well = CapitalCostWell.cO2Baseline(params = params)
+        C_wellfield = CapitalCostWellField.cO2MonitoringBaseline(params = params)
+        C_exploration = CapitalCostExploration.cO2Baseline(params = params)
+        return self.combine(params, energy, valid, C_surface_plant, C_well, C_wellfield, C_exploration)
+
+    def solveORC(self, energy, **design):
+        params, energy, valid = self.getColumns(energy, design, CapitalCostSystemVectorized.orc_columns)
+
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            C_surface_plant = CapitalCostSurfacePlantORC.plantCosts(params, energy['Q_preheater_total'], energy['Q_boiler_total'],
+                                energy['Q_recuperator_total'], energy['Q_desuperheater_total'], energy['Q_condenser_total'],
+                                energy['W_turbine_total'], energy['W_pump_orc_total'], energy['W_pump_prod_total'],
+                                energy['dT_range_CT'], energy['dT_LMTD_preheater'], energy['dT_LMTD_boiler'], energy['dT_LMTD_recuperator'])
+
+        C_well = CapitalCostWell.waterBaseline(params = params)
+        C_wellfield = CapitalCostWellField.water(params = params)
+        C_exploration = CapitalCostExploration.waterBaseline(params = params)
+        return self.combine(params, energy, valid, C_surface_plant, C_well, C_wellfield, C_exploration)
+
+    def combine(self, params, energy, valid, C_surface_plant, C_well, C_wellfield, C_exploration):
+        shape = valid.shape
+        def column(val):
+            return np.where(valid, np.broadcast_to(val, shape), np.nan)
+
+        results = CapitalCostSystemVectorizedOutput()
+        results.valid = np.array(valid)
+        results.C_surface_plant = C_surface_plant
+        for key, val in list(vars(C_surface_plant).items()):
+            setattr(C_surface_plant, key, column(val))
+        results.C_gathering_system = column(CapitalCostSurfacePipes.cost(params = params))
+        results.C_wells_production = column(C_well)
+        results.C_wells_injection = column(C_well)
+        results.C_wellfield = column(C_wellfield)
+        results.C_exploration = column(C_exploration)
+        results.C_stimulation = column(CapitalCostWellStimulation.cost())
+
+        C_surface_plant_plant = C_surface_plant.C_plant
+        results.C_greenfield = C_surface_plant_plant + results.C_gathering_system + results.C_wells_production + results.C_wells_injection \
+                                + results.C_wellfield + results.C_exploration + results.C_stimulation
+        results.C_brownfield = C_surface_plant_plant + results.C_gathering_system + results.C_wells_production
+
+        capacity_W = energy['W_net_total']
+        results.LCOE_greenfield = LCOESimple.computeLCOE(results.C_greenfield, capacity_W, params)
+        results.LCOE_brownfield = LCOESimple.computeLCOE(results.C_brownfield, capacity_W, params)
+        results.specific_capital_cost_greenfield = LCOESimple.computeSpecificCapitalCost(results.C_greenfield, capacity_W)
+        results.specific_capital_cost_brownfield = LCOESimple.computeSpecificCapitalCost(results.C_brownfield, capacity_W)
+        return results
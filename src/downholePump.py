@@ -16,9 +16,10 @@
 import numpy as np
 
 from utils.fluidState import FluidState
-from utils.solver import Solver
+from utils.rootEstimator import RootEstimator
 from models.simulationParameters import SimulationParameters
 from utils.frictionFactor import frictionFactor
+from src.porousReservoirBase import PorousReservoirBase
 
 class DownHolePumpOutput(object):
     """DownHolePumpOutput."""
@@ -36,7 +37,7 @@ class DownHolePump(object):
 
     def computeSurfacePipeFrictionFactor(self):
         self.ff_m_dot = self.params.m_dot_IP
-        initial_P = 1e6 +  self.params.P_system_min()
+        initial_P = 1e6 +  PorousReservoirBase.getPSystemMin(self.params)
         initial_T = 60.
         initial_h = FluidState.getStateFromPT(initial_P, initial_T, self.params.working_fluid).h_Jkg
         self.friction_factor = frictionFactor(self.params.well_radius, initial_P, initial_h, \
@@ -55,7 +56,7 @@ class DownHolePump(object):
         dP_pump = 0
         dP_surface = np.nan
         dP_loops = 1
-        dP_Solver = Solver()
+        dP_Solver = RootEstimator()
 
         while np.isnan(dP_surface) or abs(dP_surface) > 100:
             try:
@@ -19,7 +19,8 @@ from src.coolingCondensingTower import CoolingCondensingTower
 from src.powerPlantOutput import PowerPlantEnergyOutput
 
 from utils.fluidState import FluidState
-from utils.solver import Solver
+from utils.rootEstimator import RootEstimator
+from utils.broydenEstimator import BroydenEstimator
 
 from utils.frictionFactor import frictionFactor
 
@@ -37,6 +38,12 @@ class FluidSystemCO2(object):
         self.injection_well = None
         self.reservoir = None
         self.production_well = None
+        # optional initial pump pressure difference, e.g. of a neighboring solution
+        self.dP_pump_initial = None
+        # Newton steps on d(dP_downhole)/d(dP_pump), starting from the slope of the last solve
+        self.dP_newton = False
+        self.dP_jacobian = -1.
+        self.dP_pump_previous = None
 
     def solve(self):
 
@@ -45,13 +52,15 @@ class FluidSystemCO2(object):
 
         # Find condensation pressure
         T_condensation = self.params.T_ambient_C + self.params.dT_approach
-        P_condensation = FluidState.getStateFromTQ(T_condensation, 0, self.params.working_fluid).P_Pa + 50e3
-        dP_pump = 0
+        P_condensation = FluidState.getStateFromTQ(T_condensation, 0, self.params.working_fluid, interpolate = True).P_Pa + 50e3
+        dP_pump = self.dP_pump_initial if self.dP_pump_initial != None else 0
+        if self.dP_newton and self.dP_pump_initial == None and self.dP_pump_previous != None:
+            dP_pump = self.dP_pump_previous
 
         dP_downhole_threshold = 1e3
         dP_downhole = np.nan
         dP_loops = 1
-        dP_solver = Solver()
+        dP_solver = BroydenEstimator(self.dP_jacobian) if self.dP_newton else RootEstimator()
         while np.isnan(dP_downhole) or np.abs(dP_downhole) >= dP_downhole_threshold:
 
             # Find Injection Conditions
@@ -103,6 +112,11 @@ class FluidSystemCO2(object):
                 print('GenGeo::Warning::FluidSystemCO2:dP_loops is large: %s'%dP_loops)
             dP_loops += 1
 
+        results.dP_loops = dP_loops - 1
+        if self.dP_newton:
+            self.dP_jacobian = dP_solver.jacobian
+            self.dP_pump_previous = dP_pump
+
         if results.reservoir.state.P_Pa >= self.params.P_reservoir_max():
             raise Exception('GenGeo::FluidSystemCO2:ExceedsMaxReservoirPressure - '
                         'Exceeds Max Reservoir Pressure of %.3f MPa!'%(self.params.P_reservoir_max()/1e6))
@@ -131,8 +145,8 @@ class FluidSystemCO2(object):
             raise Exception('GenGeo::FluidSystemCO2:TurbinePowerNegative - Turbine Power is Negative')
 
         # heat rejection
-        h_satVapor = FluidState.getStateFromPQ(P_condensation, 1,  self.params.working_fluid).h_Jkg
-        h_condensed = FluidState.getStateFromPQ(P_condensation, 0,  self.params.working_fluid).h_Jkg
+        h_satVapor = FluidState.getStateFromPQ(P_condensation, 1,  self.params.working_fluid, interpolate = True).h_Jkg
+        h_condensed = FluidState.getStateFromPQ(P_condensation, 0,  self.params.working_fluid, interpolate = True).h_Jkg
         if h_turbine_out > h_satVapor:
             # desuperheating needed
             results.pp.q_cooler = h_satVapor - h_turbine_out
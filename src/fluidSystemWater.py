@@ -16,10 +16,12 @@
 import numpy as np
 
 from utils.fluidState import FluidState
-from utils.solver import Solver
+from utils.rootEstimator import RootEstimator
 
 from utils.frictionFactor import frictionFactor
 
+from src.porousReservoirBase import PorousReservoirBase
+
 class FluidSystemWaterOutput(object):
     """FluidSystemWaterOutput."""
     pass
@@ -45,7 +47,7 @@ class FluidSystemWater(object):
         injection_state = FluidState.getStateFromPT(initial_state.P_Pa, initial_state.T_C, initial_state.fluid)
         # Find necessary injection pressure
         dP_downhole = np.nan
-        dP_solver = Solver()
+        dP_solver = RootEstimator()
         dP_loops = 1
         stop =  False
 
@@ -69,9 +71,9 @@ class FluidSystemWater(object):
             dP_loops += 1
 
             # Set Limits
-            if injection_state.P_Pa < self.params.P_system_min():
+            if injection_state.P_Pa < PorousReservoirBase.getPSystemMin(self.params):
                 # can't be below this temp or fluid will flash
-                injection_state.P_Pa = self.params.P_system_min()
+                injection_state.P_Pa = PorousReservoirBase.getPSystemMin(self.params)
                 # switch stop to run injection well and reservoir once more
                 stop = True
 
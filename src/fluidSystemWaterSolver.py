@@ -18,7 +18,9 @@ import numpy as np
 from scipy.optimize import root, minimize, newton, brentq
 
 from utils.fluidState import FluidState
-from utils.solver import Solver
+from utils.rootEstimator import RootEstimator
+
+from src.porousReservoirBase import PorousReservoirBase
 
 
 class FluidSystemWaterSolver(object):
@@ -26,19 +28,20 @@ class FluidSystemWaterSolver(object):
 
     def __init__(self, system):
         self.fluid_system = system
+        # optional initial injection temperature, e.g. of a neighboring solution
+        self.T_injection_initial = None
 
     def solve(self):
 
-        self.fluid_system.params.initial_P = 1e6 + self.fluid_system.params.P_system_min()
-        self.fluid_system.params.initial_T = 60.
-        initial_T = self.fluid_system.params.initial_T
+        self.initial_P = 1e6 + PorousReservoirBase.getPSystemMin(self.fluid_system.params)
+        initial_T = self.T_injection_initial if self.T_injection_initial != None else 60.
 
         dT_inj = np.nan
         dT_loops = 1
-        solv = Solver()
+        solv = RootEstimator()
         while np.isnan(dT_inj) or abs(dT_inj) >= 0.5:
 
-            initial_state = FluidState.getStateFromPT(self.fluid_system.params.initial_P, initial_T, self.fluid_system.params.working_fluid)
+            initial_state = FluidState.getStateFromPT(self.initial_P, initial_T, self.fluid_system.params.working_fluid)
             system_state = self.fluid_system.solve(initial_state)
 
             dT_inj = initial_T - system_state.pp.state.T_C
@@ -85,7 +88,7 @@ class FluidSystemWaterSolver(object):
 
     def solveMinimize(self):
 
-        self.initial_P = 1e6 +  self.fluid_system.params.P_system_min()
+        self.initial_P = 1e6 +  PorousReservoirBase.getPSystemMin(self.fluid_system.params)
         initial_T = 60.
 
         try:
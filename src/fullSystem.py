@@ -14,6 +14,49 @@
 
 ############################
 
+from src.capitalCostSystemVectorized import CapitalCostSystemVectorized
+
+# params which only enter the capital cost model and the LCOE
+economic_params = ['F_OM', 'discount_rate', 'lifetime', 'capacity_factor', 'cost_year', 'success_rate', 'monitoring_well_radius']
+
+def getEconomicParams(params, **kwargs):
+    for key in kwargs:
+        if key not in economic_params:
+            raise Exception('GenGeo::FullSystem:NonEconomicParameter - %s changes the fluid system, use solve instead!'%key)
+    return params.replace(**kwargs)
+
 class FullSystemOutput(object):
     """FullSystemOutput."""
     pass
+
+class FullSystemEconomics(object):
+    """FullSystemEconomics re-evaluates the economics of solved outputs of a
+    full system without solving the fluid system again. The outputs keep the
+    frozen params they were solved with and the full systems set
+    vectorized_columns and implement solveVectorizedCosts."""
+
+    def solveEconomics(self, output, **kwargs):
+        """Recomputes the capital cost model and LCOE of a solved output for
+        changed economic params (e.g. discount_rate, cost_year) without solving
+        the fluid system again."""
+        params = getEconomicParams(output.params, **kwargs)
+        capital_cost_model = self.capital_cost_model.copyWithParams(params)
+        capital_cost_model.energy_results = output.energy_results
+        capital_cost_model.fluid_system = output.fluid_system_solver
+
+        results = FullSystemOutput()
+        results.params = params
+        results.fluid_system_solver = output.fluid_system_solver
+        results.energy_results = output.energy_results
+        results.capital_cost_model = capital_cost_model.solve()
+        return results
+
+    def solveEconomicScenarios(self, output, **kwargs):
+        """Costs of a solved output for arrays of economic scenarios, e.g.
+        discount_rate = np.linspace(0.02, 0.1, 9). Returns a
+        CapitalCostSystemVectorizedOutput."""
+        # only economic params may be varied
+        getEconomicParams(output.params, **kwargs)
+        energy = CapitalCostSystemVectorized.getEnergyColumns([output], self.vectorized_columns)
+        energy = {key: val[0] for key, val in energy.items()}
+        return self.solveVectorizedCosts(output.params, energy, **kwargs)
@@ -15,13 +15,14 @@
 ############################
 
 from src.energyConversion import EnergyConversionCPG
-from src.fullSystem import FullSystemOutput
+from src.fullSystem import FullSystemOutput, FullSystemEconomics
 
 from src.semiAnalyticalWell import SemiAnalyticalWell
 from src.porousReservoir import PorousReservoir
 
 from src.fluidSystemCO2 import FluidSystemCO2
-from src.capitalCostSystem import CapitalCostSystem
+from src.capitalCostSystem import CapitalCostSystem, CapitalCostComponent
+from src.capitalCostSystemVectorized import CapitalCostSystemVectorized
 
 from src.lCOESimple import LCOESimple
 from src.capitalCostSurfacePipes import CapitalCostSurfacePipes
@@ -31,23 +32,31 @@ from src.capitalCostExploration import CapitalCostExploration
 from src.capitalCostWellStimulation import CapitalCostWellStimulation
 from src.capitalCostSurfacePlantCPG import CapitalCostSurfacePlantCPG
 
-from models.simulationParameters import SimulationParameters
+from models.simulationParameters import SimulationParameters, FrozenSimulationParameters
 
 
 
 
-class FullSystemCPG(object):
+class FullSystemCPG(FullSystemEconomics):
     """FullSystemCPG."""
 
-    def __init__(self, params, fluid_system_solver, capital_cost_model):
+    vectorized_columns = CapitalCostSystemVectorized.cpg_columns
+
+    def __init__(self, params, fluid_system_solver, capital_cost_model, well_geometry = None):
         self.params = params
         self.fluid_system_solver = fluid_system_solver
         self.capital_cost_model = capital_cost_model
+        # optional function (fluid_system_solver, params) updating the wells to the current params
+        self.well_geometry = well_geometry
 
     def solve(self):
 
         results = FullSystemOutput()
+        # the params of the solve, e.g. for a later solveEconomics
+        results.params = self.params.freeze()
 
+        if self.well_geometry != None:
+            self.well_geometry(self.fluid_system_solver, self.params)
         results.fluid_system_solver = self.fluid_system_solver.solve()
         results.energy_results = EnergyConversionCPG.compute(self.params, results.fluid_system_solver)
         self.capital_cost_model.energy_results = results.energy_results
@@ -56,33 +65,57 @@ class FullSystemCPG(object):
 
         return results
 
+    def getWarmStart(self, output):
+        # converged inner solution of a solved output
+        return {'dP_pump': output.fluid_system_solver.pp.dP_pump}
+
+    def setWarmStart(self, warm_start):
+        # initial inner solution of the next solves, None for the default
+        self.fluid_system_solver.dP_pump_initial = warm_start['dP_pump'] if warm_start != None else None
+
+    def solveVectorizedCosts(self, params, energy, **kwargs):
+        return CapitalCostSystemVectorized(params).solveCPG(energy, **kwargs)
+
     #static method below instantiates a default CPG system
     @staticmethod
     def getDefaultCPGSystem(params = None, **kwargs):
         if params == None:
             params = SimulationParameters(**kwargs)
+        elif isinstance(params, FrozenSimulationParameters):
+            # the solvers change the mass flow of the params
+            params = params.thaw()
 
         fluid_system = FluidSystemCO2(params = params)
         injWell_m_dot_multiplier = params.wellFieldType.getInjWellMdotMultiplier()
         fluid_system.injection_well = SemiAnalyticalWell(params = params,
-                                            dz_total = -params.depth,
-                                            T_e_initial = params.T_ambient_C,
                                             m_dot_multiplier = injWell_m_dot_multiplier)
         fluid_system.reservoir = PorousReservoir(params = params)
         prodWell_m_dot_multiplier = params.wellFieldType.getProdWellMdotMultiplier()
         fluid_system.production_well = SemiAnalyticalWell(params = params,
-                                            dz_total = params.depth,
-                                            T_e_initial = params.T_ambient_C + params.dT_dz * params.depth,
                                             m_dot_multiplier = prodWell_m_dot_multiplier)
+        FullSystemCPG.setDefaultWellGeometry(fluid_system, params)
+
+        capital_cost_system = FullSystemCPG.getDefaultCapitalCostSystem(params)
 
+        return FullSystemCPG(params, fluid_system, capital_cost_system, FullSystemCPG.setDefaultWellGeometry)
+
+    @staticmethod
+    def setDefaultWellGeometry(fluid_system, params):
+        # the wells follow the current depth of the params
+        fluid_system.injection_well.dz_total = -params.depth
+        fluid_system.injection_well.T_e_initial = params.T_ambient_C
+        fluid_system.production_well.dz_total = params.depth
+        fluid_system.production_well.T_e_initial = params.T_ambient_C + params.dT_dz * params.depth
+
+    @staticmethod
+    def getDefaultCapitalCostSystem(params):
         capital_cost_system = CapitalCostSystem()
         capital_cost_system.CapitalCost_SurfacePlant = CapitalCostSurfacePlantCPG(params = params)
-        capital_cost_system.CapitalCost_SurfacePipe = CapitalCostSurfacePipes.cost(params = params)
-        capital_cost_system.CapitalCost_Production_Well = CapitalCostWell.cO2Baseline(params = params)
-        capital_cost_system.CapitalCost_Injection_Well = CapitalCostWell.cO2Baseline(params = params)
-        capital_cost_system.CapitalCost_Wellfield = CapitalCostWellField.cO2MonitoringBaseline(params = params)
-        capital_cost_system.CapitalCost_Exploration = CapitalCostExploration.cO2Baseline(params = params)
+        capital_cost_system.CapitalCost_SurfacePipe = CapitalCostComponent(CapitalCostSurfacePipes.cost, params, ['wellFieldType', 'N_5spot', 'cost_year'])
+        capital_cost_system.CapitalCost_Production_Well = CapitalCostComponent(CapitalCostWell.cO2Baseline, params, ['depth', 'well_radius', 'success_rate', 'cost_year'])
+        capital_cost_system.CapitalCost_Injection_Well = CapitalCostComponent(CapitalCostWell.cO2Baseline, params, ['depth', 'well_radius', 'success_rate', 'cost_year'])
+        capital_cost_system.CapitalCost_Wellfield = CapitalCostComponent(CapitalCostWellField.cO2MonitoringBaseline, params, ['N_5spot', 'cost_year', 'depth', 'monitoring_well_radius'])
+        capital_cost_system.CapitalCost_Exploration = CapitalCostComponent(CapitalCostExploration.cO2Baseline, params, ['cost_year', 'depth', 'well_radius', 'success_rate', 'N_5spot'])
         capital_cost_system.CapitalCost_Stimulation = CapitalCostWellStimulation.cost()
         capital_cost_system.lcoe_model = LCOESimple(params = params)
-
-        return FullSystemCPG(params, fluid_system, capital_cost_system)
+        return capital_cost_system
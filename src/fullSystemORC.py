@@ -14,7 +14,7 @@
 
 ############################
 from src.energyConversion import EnergyConversionORC
-from src.fullSystem import FullSystemOutput
+from src.fullSystem import FullSystemOutput, FullSystemEconomics
 
 from src.semiAnalyticalWell import SemiAnalyticalWell
 from src.porousReservoir import PorousReservoir
@@ -23,7 +23,8 @@ from src.oRCCycleTboil import ORCCycleTboil
 
 from src.fluidSystemWater import FluidSystemWater
 from src.fluidSystemWaterSolver import FluidSystemWaterSolver
-from src.capitalCostSystem import CapitalCostSystem
+from src.capitalCostSystem import CapitalCostSystem, CapitalCostComponent
+from src.capitalCostSystemVectorized import CapitalCostSystemVectorized
 
 from src.lCOESimple import LCOESimple
 from src.capitalCostSurfacePipes import CapitalCostSurfacePipes
@@ -33,20 +34,28 @@ from src.capitalCostExploration import CapitalCostExploration
 from src.capitalCostWellStimulation import CapitalCostWellStimulation
 from src.capitalCostSurfacePlantORC import CapitalCostSurfacePlantORC
 
-from models.simulationParameters import SimulationParameters
+from models.simulationParameters import SimulationParameters, FrozenSimulationParameters
 
-class FullSystemORC(object):
+class FullSystemORC(FullSystemEconomics):
     """FullSystemORC."""
 
-    def __init__(self, params, fluid_system_solver, capital_cost_model):
+    vectorized_columns = CapitalCostSystemVectorized.orc_columns
+
+    def __init__(self, params, fluid_system_solver, capital_cost_model, well_geometry = None):
         self.params = params
         self.fluid_system_solver = fluid_system_solver
         self.capital_cost_model = capital_cost_model
+        # optional function (fluid_system_solver, params) updating the wells to the current params
+        self.well_geometry = well_geometry
 
     def solve(self):
 
         results = FullSystemOutput()
+        # the params of the solve, e.g. for a later solveEconomics
+        results.params = self.params.freeze()
 
+        if self.well_geometry != None:
+            self.well_geometry(self.fluid_system_solver, self.params)
         results.fluid_system_solver = self.fluid_system_solver.solve()
         results.energy_results = EnergyConversionORC.compute(self.params, results.fluid_system_solver)
         self.capital_cost_model.energy_results = results.energy_results
@@ -55,41 +64,65 @@ class FullSystemORC(object):
 
         return results
 
+    def getWarmStart(self, output):
+        # converged inner solution of a solved output
+        return {'T_injection': output.fluid_system_solver.pp.state.T_C}
+
+    def setWarmStart(self, warm_start):
+        # initial inner solution of the next solves, None for the default
+        self.fluid_system_solver.T_injection_initial = warm_start['T_injection'] if warm_start != None else None
+
+    def solveVectorizedCosts(self, params, energy, **kwargs):
+        return CapitalCostSystemVectorized(params).solveORC(energy, **kwargs)
+
     def getDefaultWaterSystem(params = None, **kwargs):
         if params == None:
             params = SimulationParameters(**kwargs)
+        elif isinstance(params, FrozenSimulationParameters):
+            # the solvers change the mass flow of the params
+            params = params.thaw()
 
         fluid_system = FluidSystemWater(params = params)
         injWell_m_dot_multiplier = params.wellFieldType.getInjWellMdotMultiplier()
         fluid_system.injection_well = SemiAnalyticalWell(params = params,
-                                            dz_total = -params.depth,
-                                            T_e_initial = params.T_ambient_C,
                                             m_dot_multiplier = injWell_m_dot_multiplier)
         fluid_system.reservoir = PorousReservoir(params = params)
         prodWell_m_dot_multiplier = params.wellFieldType.getProdWellMdotMultiplier()
         fluid_system.production_well1 = SemiAnalyticalWell(params = params,
-                                            dz_total = params.depth - params.pump_depth,
-                                            T_e_initial = params.T_ambient_C + params.dT_dz * params.depth,
                                             m_dot_multiplier = prodWell_m_dot_multiplier)
         prod_well2 = SemiAnalyticalWell(params = params,
-                                        dz_total = params.pump_depth,
-                                        T_e_initial = params.T_ambient_C + params.dT_dz * params.pump_depth,
                                         m_dot_multiplier = prodWell_m_dot_multiplier)
         fluid_system.pump = DownHolePump(well = prod_well2,
                                         params = params)
         fluid_system.pp = ORCCycleTboil(params = params)
 
+        capital_cost_system = FullSystemORC.getDefaultCapitalCostSystem(params)
+
+        solver = FluidSystemWaterSolver(fluid_system)
+        FullSystemORC.setDefaultWellGeometry(solver, params)
+
+        return FullSystemORC(params, solver, capital_cost_system, FullSystemORC.setDefaultWellGeometry)
+
+    @staticmethod
+    def setDefaultWellGeometry(solver, params):
+        # the wells follow the current depth and pump depth of the params
+        fluid_system = solver.fluid_system
+        fluid_system.injection_well.dz_total = -params.depth
+        fluid_system.injection_well.T_e_initial = params.T_ambient_C
+        fluid_system.production_well1.dz_total = params.depth - params.pump_depth
+        fluid_system.production_well1.T_e_initial = params.T_ambient_C + params.dT_dz * params.depth
+        fluid_system.pump.well.dz_total = params.pump_depth
+        fluid_system.pump.well.T_e_initial = params.T_ambient_C + params.dT_dz * params.pump_depth
+
+    @staticmethod
+    def getDefaultCapitalCostSystem(params):
         capital_cost_system = CapitalCostSystem()
         capital_cost_system.CapitalCost_SurfacePlant = CapitalCostSurfacePlantORC(params = params)
-        capital_cost_system.CapitalCost_SurfacePipe = CapitalCostSurfacePipes.cost(params = params)
-        capital_cost_system.CapitalCost_Production_Well = CapitalCostWell.waterBaseline(params = params)
-        capital_cost_system.CapitalCost_Injection_Well = CapitalCostWell.waterBaseline(params = params)
-        capital_cost_system.CapitalCost_Wellfield = CapitalCostWellField.water(params = params)
-        capital_cost_system.CapitalCost_Exploration = CapitalCostExploration.waterBaseline(params = params)
+        capital_cost_system.CapitalCost_SurfacePipe = CapitalCostComponent(CapitalCostSurfacePipes.cost, params, ['wellFieldType', 'N_5spot', 'cost_year'])
+        capital_cost_system.CapitalCost_Production_Well = CapitalCostComponent(CapitalCostWell.waterBaseline, params, ['depth', 'well_radius', 'success_rate', 'cost_year'])
+        capital_cost_system.CapitalCost_Injection_Well = CapitalCostComponent(CapitalCostWell.waterBaseline, params, ['depth', 'well_radius', 'success_rate', 'cost_year'])
+        capital_cost_system.CapitalCost_Wellfield = CapitalCostComponent(CapitalCostWellField.water, params, ['cost_year'])
+        capital_cost_system.CapitalCost_Exploration = CapitalCostComponent(CapitalCostExploration.waterBaseline, params, ['cost_year', 'depth', 'well_radius', 'success_rate'])
         capital_cost_system.CapitalCost_Stimulation = CapitalCostWellStimulation.cost()
         capital_cost_system.lcoe_model = LCOESimple(params = params)
-
-        solver = FluidSystemWaterSolver(fluid_system)
-
-        return FullSystemORC(params, solver, capital_cost_system)
-
+        return capital_cost_system
@@ -23,6 +23,15 @@ class FullSystemOptMdotBase(object):
 
     def __init__(self, system):
         self.full_system = system
+        self.m_dot_initial = 10.
+        self.m_dot_bracket = None
+
+    def setInitialGuess(self, m_dot_IP, bracket = None):
+        # initial guess and optional bracket (m_dot_low, m_dot_high) of the
+        # optimum flow rate, e.g. from the optimum of a neighboring design point,
+        # the bracket is used by FullSystemSolverBrent and FullSystemSolverParallel
+        self.m_dot_initial = m_dot_IP
+        self.m_dot_bracket = bracket
 
     def getTargetVar(self, system):
         raise Exception('GenGeo::no target variable provided to find Minimum '
@@ -0,0 +1,160 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import numpy as np
+
+from scipy.optimize import minimize_scalar
+
+from src.fullSystemSolver import FullSystemSolver
+
+class FullSystemSolverBrent(FullSystemSolver):
+    """FullSystemSolverBrent finds the optimum flow rate by bracketing the
+    optimum of the target variable (LCOE or W_net) and refining it with Brent's
+    method. Flow rates at which the system exceeds the maximum production pump
+    pressure or falls below the saturation pressure are upper bounds of the
+    search. The output of the best evaluation is returned with optMdot and the
+    number of full system evaluations (evaluations)."""
+
+    golden = 1.618034
+
+    def __init__(self, system, m_dot_initial = 10., m_dot_min = 0.1, m_dot_limit = 1e4, xtol = 1e-4, max_iterations = 50):
+        super().__init__(system)
+        self.setInitialGuess(m_dot_initial)
+        self.m_dot_min = m_dot_min
+        # the optimum is searched below m_dot_limit
+        self.m_dot_limit = m_dot_limit
+        # relative tolerance of the optimum flow rate
+        self.xtol = xtol
+        # maximum number of steps of the bracket expansion
+        self.max_iterations = max_iterations
+
+    def evaluate(self, m_dot_IP):
+        # objective to minimize, infeasible flow rates are inf
+        m_dot_IP = float(m_dot_IP)
+        if m_dot_IP in self.evaluations:
+            return self.evaluations[m_dot_IP][0]
+        if m_dot_IP >= self.m_dot_max or m_dot_IP <= 0:
+            return np.inf
+
+        print('Trying a mass flowrate of %.4f' %m_dot_IP)
+        try:
+            self.full_system.params.m_dot_IP = m_dot_IP
+            output = self.full_system.solve()
+            var_out = self.getTargetVar(output)
+        except Exception as ex:
+            if str(ex).find(':ExceedsMaxProductionPumpPressure') > -1 \
+            or str(ex).find(':BelowSaturationPressure') > -1:
+                print(str(ex))
+                self.m_dot_max = min(self.m_dot_max, m_dot_IP)
+                output = None
+                var_out = np.nan
+            else:
+                raise ex
+
+        value = -1 * self.getDirection().value * var_out
+        if np.isnan(value):
+            value = np.inf
+        self.evaluations[m_dot_IP] = (value, output)
+        return value
+
+    def bracket(self):
+        # find m_a < m_b < m_c with f(m_b) below f(m_a) and f(m_c)
+        m_b = self.m_dot_initial
+        d_m_dot = m_b
+        if self.m_dot_bracket != None:
+            m_a, m_c = self.m_dot_bracket
+            if self.evaluate(m_b) < min(self.evaluate(m_a), self.evaluate(m_c)):
+                return m_a, m_b, m_c
+            # expand from the best of the three flow rates
+            m_b = min([m_a, m_b, m_c], key = self.evaluate)
+            d_m_dot = (m_c - m_a) / 2.
+        f_b = self.evaluate(m_b)
+        while np.isinf(f_b) and m_b > self.m_dot_min:
+            m_b = m_b / 2.
+            d_m_dot = m_b
+            f_b = self.evaluate(m_b)
+        m_c = m_b + d_m_dot
+        f_c = self.evaluate(m_c)
+
+        if f_c < f_b:
+            # optimum above m_b, expand upwards
+            m_a, f_a = m_b, f_b
+            m_b, f_b = m_c, f_c
+            m_c = m_b + self.golden * (m_b - m_a)
+            f_c = self.evaluate(m_c)
+            iterations = 0
+            while f_c < f_b:
+                if m_c >= self.m_dot_limit or iterations >= self.max_iterations:
+                    raise Exception('GenGeo::FullSystemSolverBrent:NoBracket - '
+                                    'No optimum below a mass flow rate of %.1f kg/s found!'%m_c)
+                m_a, f_a = m_b, f_b
+                m_b, f_b = m_c, f_c
+                m_c = min(m_b + self.golden * (m_b - m_a), self.m_dot_limit)
+                f_c = self.evaluate(m_c)
+                iterations += 1
+            if np.isinf(f_c):
+                m_c = min(m_c, self.m_dot_max)
+        else:
+            # optimum below m_c, expand downwards
+            m_a = max(m_b - d_m_dot, m_b / 2.)
+            f_a = self.evaluate(m_a)
+            while f_a < f_b and m_a > self.m_dot_min:
+                m_c, f_c = m_b, f_b
+                m_b, f_b = m_a, f_a
+                m_a = m_b / 2.
+                f_a = self.evaluate(m_a)
+        return m_a, m_b, m_c
+
+    def getFeasibleBracket(self, m_a, m_b, m_c):
+        # infeasible ends are moved towards m_b until they are feasible, an optimum
+        # at the bound of the feasible flow rates is refined by bisection
+        for i in range(self.max_iterations):
+            f_a, f_b, f_c = self.evaluate(m_a), self.evaluate(m_b), self.evaluate(m_c)
+            if np.isinf(f_b) or (np.isfinite(f_a) and np.isfinite(f_c)) or m_c - m_a <= self.xtol * m_b:
+                return m_a, m_b, m_c
+            if np.isinf(f_c):
+                m_new = (m_b + m_c) / 2.
+                if self.evaluate(m_new) < f_b:
+                    m_a, m_b = m_b, m_new
+                else:
+                    m_c = m_new
+            else:
+                m_new = (m_a + m_b) / 2.
+                if self.evaluate(m_new) < f_b:
+                    m_c, m_b = m_b, m_new
+                else:
+                    m_a = m_new
+        raise Exception('GenGeo::FullSystemSolverBrent:NoFeasibleBracket - '
+                        'No feasible bracket around %.4f kg/s found!'%m_b)
+
+    def solve(self):
+        self.evaluations = {}
+        self.m_dot_max = np.inf
+
+        m_a, m_b, m_c = self.getFeasibleBracket(*self.bracket())
+        # Brent's method is only started from finite values
+        f_a, f_b, f_c = self.evaluate(m_a), self.evaluate(m_b), self.evaluate(m_c)
+        if np.all(np.isfinite([f_a, f_b, f_c])) and f_b < min(f_a, f_c):
+            minimize_scalar(self.evaluate, bracket = (m_a, m_b, m_c), method = 'brent', options = {'xtol': self.xtol})
+
+        m_dot_IP, (value, results) = min(self.evaluations.items(), key = lambda item: item[1][0])
+        if np.isinf(value):
+            raise Exception('GenGeo::FullSystemSolverBrent:NoValidMassFlow - No valid mass flow rate found!')
+
+        # the best evaluation is returned without solving again
+        self.full_system.params.m_dot_IP = m_dot_IP
+        results.optMdot = m_dot_IP
+        results.evaluations = len(self.evaluations)
+        return results
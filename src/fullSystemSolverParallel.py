@@ -0,0 +1,113 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import multiprocessing
+import numpy as np
+
+from src.fullSystemSolver import FullSystemSolver
+
+# copy of the full system of the current worker process
+worker_system = {}
+
+def initWorker(full_system):
+    worker_system['system'] = full_system
+
+def solveMdot(m_dot_IP):
+    full_system = worker_system['system']
+    try:
+        full_system.params.m_dot_IP = m_dot_IP
+        return m_dot_IP, full_system.solve(), None
+    except Exception as ex:
+        return m_dot_IP, None, ex
+
+class FullSystemSolverParallel(FullSystemSolver):
+    """FullSystemSolverParallel finds the optimum flow rate by evaluating a grid
+    of flow rates concurrently on a process pool and refining the grid around
+    the best flow rate until the grid spacing is below the relative tolerance.
+    Every worker holds its own copy of the full system and evaluations are
+    memoized per flow rate. Flow rates which exceed the max production pump
+    pressure or fall below the saturation pressure are invalid."""
+
+    def __init__(self, system, processes = None, points = None, m_dot_min = 5., m_dot_max = 320., xtol = 1e-4):
+        super().__init__(system)
+        self.processes = processes if processes != None else multiprocessing.cpu_count()
+        # flow rates evaluated per refinement, at least one per worker
+        self.points = points if points != None else max(self.processes, 8)
+        self.m_dot_min = m_dot_min
+        self.m_dot_max = m_dot_max
+        self.xtol = xtol
+
+    def getValue(self, m_dot_IP, output, error):
+        # objective to minimize, invalid flow rates are inf
+        if error != None:
+            if str(error).find(':ExceedsMaxProductionPumpPressure') > -1 \
+            or str(error).find(':BelowSaturationPressure') > -1:
+                return np.inf
+            # other errors are only accepted above an invalid flow rate (e.g. negative W_net)
+            if any(np.isinf(value) for m_dot, (value, _) in self.evaluations.items() if m_dot < m_dot_IP):
+                print(str(error))
+                return np.inf
+            raise error
+        value = -1 * self.getDirection().value * self.getTargetVar(output)
+        return np.inf if np.isnan(value) else value
+
+    def evaluate(self, m_dots, pool):
+        m_dots = [float(m_dot) for m_dot in m_dots if float(m_dot) not in self.evaluations]
+        print('Trying mass flowrates of %s' %', '.join(['%.4f'%m_dot for m_dot in m_dots]))
+        results = pool.map(solveMdot, m_dots) if pool != None else map(solveMdot, m_dots)
+        for m_dot_IP, output, error in sorted(results, key = lambda result: result[0]):
+            self.evaluations[m_dot_IP] = (self.getValue(m_dot_IP, output, error), output)
+
+    def getBest(self):
+        m_dots = np.array(sorted(self.evaluations.keys()))
+        values = np.array([self.evaluations[m_dot][0] for m_dot in m_dots])
+        return m_dots, values, np.argmin(values)
+
+    def search(self, pool):
+        m_dot_low, m_dot_high = self.m_dot_bracket if self.m_dot_bracket != None else (self.m_dot_min, self.m_dot_max)
+        self.evaluate(np.geomspace(m_dot_low, m_dot_high, self.points), pool)
+        m_dots, values, i = self.getBest()
+        if np.isinf(values[i]):
+            raise Exception('GenGeo::FullSystemSolverParallel:NoValidMassFlow - No valid mass flow rate found!')
+
+        # extend the grid while the optimum is on its upper edge
+        while i == len(m_dots) - 1:
+            ratio = m_dots[-1] / m_dots[-2]
+            self.evaluate(m_dots[-1] * ratio ** np.arange(1, self.points + 1), pool)
+            m_dots, values, i = self.getBest()
+
+        while True:
+            m_low = m_dots[i-1] if i > 0 else m_dots[0] / 2.
+            m_high = m_dots[i+1]
+            if m_high - m_low <= 2 * self.xtol * m_dots[i]:
+                return m_dots[i]
+            self.evaluate(np.linspace(m_low, m_high, self.points + 2)[1:-1], pool)
+            m_dots, values, i = self.getBest()
+
+    def solve(self):
+        self.evaluations = {}
+        if self.processes > 1:
+            with multiprocessing.Pool(self.processes, initializer = initWorker, initargs = (self.full_system,)) as pool:
+                m_dot_IP = self.search(pool)
+        else:
+            initWorker(self.full_system)
+            m_dot_IP = self.search(None)
+
+        # the best evaluation is returned without solving again
+        results = self.evaluations[m_dot_IP][1]
+        self.full_system.params.m_dot_IP = m_dot_IP
+        results.optMdot = m_dot_IP
+        results.evaluations = len(self.evaluations)
+        return results
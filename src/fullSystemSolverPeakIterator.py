@@ -39,7 +39,7 @@ class FullSystemSolverPeakIterator(FullSystemOptMdotBase):
         #best_m_dot = np.nan
 
         #Starting Massflow Guess (add 10)
-        m_dot_IP = 10
+        m_dot_IP = self.m_dot_initial
 
         peaks = 0
         d_m_dot = 10
@@ -50,13 +50,13 @@ def heatExchanger(T_1_in, P_1, m_dot_1, fluid_1, T_2_in, P_2, m_dot_2, fluid_2,
     # Check the phase on incoming fluid
     P_crit_1 = FluidState.getPcrit(fluid_1)
     if P_1 < P_crit_1:
-        T_sat_1 = FluidState.getStateFromPQ(P_1, 1, fluid_1).T_C
+        T_sat_1 = FluidState.getStateFromPQ(P_1, 1, fluid_1, interpolate = True).T_C
         if T_sat_1 == T_1_in or T_sat_1 == T_2_in:
             raise Exception('GenGeo::HeatExchanger:TwoPhaseFluid - Fluid 1 enters or leaves two-phase!')
 
     P_crit_2 = FluidState.getPcrit(fluid_2)
     if P_2 < P_crit_2:
-        T_sat_2 = FluidState.getStateFromPQ(P_2, 1, fluid_2).T_C
+        T_sat_2 = FluidState.getStateFromPQ(P_2, 1, fluid_2, interpolate = True).T_C
         if T_sat_2 == T_1_in or T_sat_2 == T_2_in:
             raise Exception('GenGeo::HeatExchanger:TwoPhaseFluid - Fluid 2 enters or leaves two-phase!')
 
@@ -88,35 +88,19 @@ def heatExchanger(T_1_in, P_1, m_dot_1, fluid_1, T_2_in, P_2, m_dot_2, fluid_2,
     results.Q_exchanged = Q_max_practical
     ddT_pinch = 1
 
-    length      = increments + 1
-    results.Q   = np.zeros(length)
-    h_1         = np.zeros(length)
-    results.T_1 = np.zeros(length)
-    h_2         = np.zeros(length)
-    results.T_2 = np.zeros(length)
-    dT          = np.zeros(length)
-    UA          = np.zeros(length)
-
     while ddT_pinch > 0.1:
 
         dQ = results.Q_exchanged / increments
 
-        results.Q[0] = 0.
-        h_1[0] = h_1_in
-        results.T_1[0] = T_1_in
-        h_2[0] = (Q_2_max - results.Q_exchanged) / m_dot_2 + h_2_max
-        results.T_2[0] = FluidState.getStateFromPh(P_2, h_2[0], fluid_2).T_C
-        dT[0] = direction * (results.T_1[0] - results.T_2[0])
-        UA[0] = dQ / dT[0]
-
-        for i in range (1, increments+1):
-            results.Q[i] = results.Q[i-1] + dQ
-            h_1[i] = h_1[i-1] + dQ / m_dot_1
-            h_2[i] = h_2[i-1] + dQ / m_dot_2
-            results.T_1[i] = FluidState.getStateFromPh(P_1, h_1[i], fluid_1).T_C
-            results.T_2[i] = FluidState.getStateFromPh(P_2, h_2[i], fluid_2).T_C
-            dT[i] = direction * (results.T_1[i] - results.T_2[i])
-            UA[i] = dQ / dT[i]
+        # march the enthalpies along the exchanger and flash both profiles at once
+        increment = np.full(increments, dQ)
+        results.Q = np.add.accumulate(np.concatenate(([0.], increment)))
+        h_1 = np.add.accumulate(np.concatenate(([h_1_in], increment / m_dot_1)))
+        h_2 = np.add.accumulate(np.concatenate(([(Q_2_max - results.Q_exchanged) / m_dot_2 + h_2_max], increment / m_dot_2)))
+        results.T_1 = np.concatenate(([T_1_in], FluidState.getStateFromPh(P_1, h_1[1:], fluid_1).T_C))
+        results.T_2 = FluidState.getStateFromPh(P_2, h_2, fluid_2).T_C
+        dT = direction * (results.T_1 - results.T_2)
+        UA = dQ / dT
 
         min_dT = min(dT)
         ddT_pinch = dT_pinch - min_dT
@@ -133,14 +117,14 @@ def heatExchanger(T_1_in, P_1, m_dot_1, fluid_1, T_2_in, P_2, m_dot_2, fluid_2,
 
     # Check the phase on leaving fluid
     if P_1 < P_crit_1:
-        T_sat_1 = FluidState.getStateFromPQ(P_1, 1, fluid_1).T_C
+        T_sat_1 = FluidState.getStateFromPQ(P_1, 1, fluid_1, interpolate = True).T_C
         if T_sat_1 > T_1_in and T_sat_1 < results.T_1_out:
             print('Caution: Fluid 1 is phase changing in heat exchanger')
         if T_sat_1 == results.T_1_out:
             raise Exception('GenGeo::HeatExchanger:TwoPhaseFluid - Fluid 1 leaves two-phase!')
 
     if P_2 < P_crit_2:
-        T_sat_2 = FluidState.getStateFromPQ(P_2, 1, fluid_2).T_C
+        T_sat_2 = FluidState.getStateFromPQ(P_2, 1, fluid_2, interpolate = True).T_C
         if T_sat_2 > T_2_in and T_sat_2 < results.T_2_out:
             print('Caution: Fluid 2 is phase changing in heat exchanger')
         if T_sat_2 == results.T_2_out:
@@ -15,6 +15,8 @@
 ############################
 import numpy as np
 
+from models.simulationParameters import SimulationParameters
+
 class LCOESimpleOutput(object):
     """LCOESimpleOutput."""
     pass
@@ -37,20 +39,41 @@ class LCOESimple(object):
             raise Exception('GenGeo::LCOESimple:Badcapacity_factor - Bad Capacity Factor!')
 
     def specificCapitalCost(self, capital_cost, capacity_W):
+        return LCOESimple.computeSpecificCapitalCost(capital_cost, capacity_W)
+
+    def lCOE(self, capital_cost, capacity_W):
+        return LCOESimple.computeLCOE(capital_cost, capacity_W, self.params)
+
+    @staticmethod
+    def computeSpecificCapitalCost(capital_cost, capacity_W):
+        if np.ndim(capital_cost) > 0 or np.ndim(capacity_W) > 0:
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                return np.where((capacity_W <= 0) | (capital_cost <= 0), np.nan, capital_cost / capacity_W)
         if capacity_W <= 0 or capital_cost <= 0:
             return np.nan
         return capital_cost / capacity_W
 
-    def lCOE(self, capital_cost, capacity_W):
+    @staticmethod
+    def capitalRecoveryFactor(params):
+        return params.discount_rate * (1 + params.discount_rate)**params.lifetime / ((1 + params.discount_rate)**params.lifetime - 1)
+
+    @staticmethod
+    def computeLCOE(capital_cost, capacity_W, params):
+        # capital cost, capacity and the financial params may be arrays of design points
+        financials = [params.discount_rate, params.lifetime, params.F_OM, params.capacity_factor]
+        if np.ndim(capital_cost) > 0 or np.ndim(capacity_W) > 0 or max(np.ndim(val) for val in financials) > 0:
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                CRF = LCOESimple.capitalRecoveryFactor(params)
+                LCOE = capital_cost * (CRF + params.F_OM) / (capacity_W * params.capacity_factor * 8760)
+            return np.where((capacity_W <= 0) | (capital_cost <= 0), np.nan, LCOE)
         if capacity_W <= 0 or capital_cost <= 0:
             return np.nan
-        CRF = self.params.discount_rate * (1 + self.params.discount_rate)**self.params.lifetime / ((1 + self.params.discount_rate)**self.params.lifetime - 1)
-        return capital_cost * (CRF + self.params.F_OM) / (capacity_W * self.params.capacity_factor * 8760)
+        CRF = LCOESimple.capitalRecoveryFactor(params)
+        return capital_cost * (CRF + params.F_OM) / (capacity_W * params.capacity_factor * 8760)
 
     def solve(self, capital_cost, energy_results):
         results = LCOESimpleOutput()
         capacity_W = energy_results.W_net_total
         results.LCOE = self.lCOE(capital_cost, capacity_W)
         results.specific_capital_cost = self.specificCapitalCost(capital_cost, capacity_W)
-        self.output = results
         return results
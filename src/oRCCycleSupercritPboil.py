@@ -50,7 +50,7 @@ class ORCCycleSupercritPboil(object):
         # The line of minimum entropy to keep the fluid vapor in turbine is
         # entropy at saturated vapor at 125C. So inlet temp must provide this
         # minimum entropy.
-        s_min = FluidState.getStateFromTQ(125., 1, self.params.orc_fluid).s_JK
+        s_min = FluidState.getStateFromTQ(125., 1, self.params.orc_fluid, interpolate = True).s_JK
         T_min = FluidState.getStateFromPS(P_boil_Pa, s_min, self.params.orc_fluid).T_C
         if (T_in_C - self.params.dT_pinch) < T_min:
             raise Exception('GenGeo::ORCCycleSupercritPboil:lowInletTemp - Inlet Temp below %.1f C for Supercritical Fluid'%(T_min+self.params.dT_pinch))
@@ -62,11 +62,11 @@ class ORCCycleSupercritPboil(object):
 
         #State 1 (Condenser -> Pump)
         #saturated liquid
-        state[0] = FluidState.getStateFromTQ(T_condense_C, 0, self.params.orc_fluid)
+        state[0] = FluidState.getStateFromTQ(T_condense_C, 0, self.params.orc_fluid, interpolate = True)
 
         # State 7 (Desuperheater -> Condenser)
         # saturated vapor
-        state[6] = FluidState.getStateFromTQ(state[0].T_C, 1, self.params.orc_fluid)
+        state[6] = FluidState.getStateFromTQ(state[0].T_C, 1, self.params.orc_fluid, interpolate = True)
 
         # State 2 (Pump -> Recuperator)
         h_2s = FluidState.getStateFromPS(P_boil_Pa, state[0].s_JK, self.params.orc_fluid).h_Jkg
@@ -74,7 +74,7 @@ class ORCCycleSupercritPboil(object):
         state[1] = FluidState.getStateFromPh(P_boil_Pa, h2, self.params.orc_fluid)
 
         # water (assume pressure 100 kPa above saturation)
-        P_water = FluidState.getStateFromTQ(T_in_C, 0, 'Water').P_Pa + 100e3
+        P_water = FluidState.getStateFromTQ(T_in_C, 0, 'Water', interpolate = True).P_Pa + 100e3
 
         # Guess orc_in fluid is state[1].T_C
         state[2] = FluidState.getStateFromPT(state[1].P_Pa, state[1].T_C, self.params.orc_fluid)
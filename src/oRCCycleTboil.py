@@ -78,20 +78,20 @@ class ORCCycleTboil(object):
 
         #State 1 (Condenser -> Pump)
         #saturated liquid
-        state[0] = FluidState.getStateFromTQ(T_condense_C, 0, self.params.orc_fluid)
+        state[0] = FluidState.getStateFromTQ(T_condense_C, 0, self.params.orc_fluid, interpolate = True)
 
         #State 6 (Desuperheater -> Condenser)
         #saturated vapor
-        state[5] = FluidState.getStateFromTQ(state[0].T_C, 1, self.params.orc_fluid)
+        state[5] = FluidState.getStateFromTQ(state[0].T_C, 1, self.params.orc_fluid, interpolate = True)
         # state[5].P_Pa = state[0].P_Pa
 
         #State 3 (Preheater -> Boiler)
         #saturated liquid
-        state[2] = FluidState.getStateFromTQ(T_boil_C, 0, self.params.orc_fluid)
+        state[2] = FluidState.getStateFromTQ(T_boil_C, 0, self.params.orc_fluid, interpolate = True)
 
         #State 4 (Boiler -> Turbine)
         #saturated vapor
-        state[3] = FluidState.getStateFromTQ(state[2].T_C, 1, self.params.orc_fluid)
+        state[3] = FluidState.getStateFromTQ(state[2].T_C, 1, self.params.orc_fluid, interpolate = True)
         # state[3].P_Pa = state[2].P_Pa
 
         #State 5 (Turbine -> Desuperheater)
@@ -124,7 +124,7 @@ class ORCCycleTboil(object):
         w_condenser_orc = q_condenser_orc * parasiticPowerFraction('condensing')
 
         #water (assume pressure 100 kPa above saturation)
-        P_sat = FluidState.getStateFromTQ(T_in_C, 0, 'Water').P_Pa
+        P_sat = FluidState.getStateFromTQ(T_in_C, 0, 'Water', interpolate = True).P_Pa
         cp = FluidState.getStateFromPT(P_sat + 100e3, T_in_C, 'Water').cp_JK
         #Water state 11, inlet, 12, mid, 13 exit
         T_C_11 = T_in_C
@@ -0,0 +1,289 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import json
+import time
+import hashlib
+import itertools
+import multiprocessing
+import numpy as np
+
+from src.fullSystemSolver import FullSystemSolver
+
+from models.simulationParameters import SimulationParameters
+
+# system of the current worker process, built once per worker
+worker_state = {}
+
+# warm started optimizers search the optimum within this factor of the neighboring optimum
+warm_start_bracket = 1.1
+# warm started sweeps solve runs of this many consecutive points in one worker,
+# so the neighbor of every point does not depend on the number of processes
+warm_start_run = 10
+
+def setPointParams(params, point):
+    for key, val in point.items():
+        if not hasattr(params, key):
+            raise Exception('GenGeo::ParameterSweep:UnknownParameter - Unknown parameter %s!'%key)
+        setattr(params, key, val)
+
+def getOptMdotRow(point, output, error):
+    # row of exampleCPGSystemStudy.py: LCOE in $/MWh, power in MW
+    if error != None:
+        return list(point.values()) + [0., 0., 0., 0., error]
+    lcoe_b = output.capital_cost_model.LCOE_brownfield.LCOE * 1e6
+    lcoe_g = output.capital_cost_model.LCOE_greenfield.LCOE * 1e6
+    power = output.energy_results.W_net / 1e6
+    return list(point.values()) + [output.optMdot, lcoe_b, lcoe_g, power, '']
+
+def getParamsKey(params, *names):
+    # stable hash of the params and e.g. the names of the solver
+    return hashlib.sha1(json.dumps([params.key()] + list(names), default = str).encode()).hexdigest()
+
+def getName(function):
+    return getattr(function, '__qualname__', str(function))
+
+class SweepJournal(object):
+    """SweepJournal records the finished points of a sweep in a JSON lines file,
+    keyed by the hash of the params of the point. Every row is flushed to disk
+    when it is finished, so a restarted sweep skips the points in the journal."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        finished = {}
+        if not os.path.exists(self.path):
+            return finished
+        with open(self.path) as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # incomplete last line of an interrupted sweep
+                    continue
+                finished[entry['key']] = entry['row']
+        return finished
+
+    def append(self, key, point, row):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        entry = json.dumps({'key': key, 'point': point, 'row': row}, default = toJSON) + '\n'
+        with open(self.path, 'ab+') as journal_file:
+            # start a new line after an incomplete line of an interrupted sweep
+            if journal_file.tell() > 0:
+                journal_file.seek(-1, os.SEEK_END)
+                if journal_file.read(1) != b'\n':
+                    entry = '\n' + entry
+            journal_file.write(entry.encode())
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+def toJSON(val):
+    # numpy scalars
+    if hasattr(val, 'item'):
+        return val.item()
+    return str(val)
+
+def getRowValues(row):
+    # rows are lists or dicts of column values
+    return list(row.values()) if isinstance(row, dict) else row
+
+def writeCSV(path, rows):
+    # write to a temporary file and replace the old file, so the csv is always complete
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as output_file:
+        for row in rows:
+            output_file.write(','.join([str(i) for i in getRowValues(row)]) + '\n')
+        output_file.flush()
+        os.fsync(output_file.fileno())
+    os.replace(tmp_path, path)
+
+def getPointDistance(point, other):
+    # sum of the relative differences of the values of two points
+    distance = 0.
+    for key, val in point.items():
+        if val == other[key]:
+            continue
+        try:
+            distance += abs(val - other[key]) / max(abs(val), abs(other[key]))
+        except TypeError:
+            return np.inf
+    return distance
+
+def setWarmStart(point):
+    # start from the solution of the previous point of the run
+    neighbor = worker_state['previous']
+    if neighbor == None or np.isinf(getPointDistance(point, neighbor[0])):
+        neighbor = (None, None, None)
+    _, m_dot_IP, warm_start = neighbor
+    if hasattr(worker_state['system'], 'setWarmStart'):
+        worker_state['system'].setWarmStart(warm_start)
+    if hasattr(worker_state['solver'], 'setInitialGuess'):
+        if m_dot_IP != None:
+            worker_state['solver'].setInitialGuess(m_dot_IP, (m_dot_IP / warm_start_bracket, m_dot_IP * warm_start_bracket))
+        else:
+            worker_state['solver'].setInitialGuess(worker_state['m_dot_initial'])
+
+def getStoredKeys(result_store):
+    # journal keys of the rows in a result store, flushed or not
+    keys = set(row.get('journal_key') for row in result_store.batch)
+    if os.path.exists(result_store.getSchemaPath(result_store.path)):
+        stored = result_store.read(result_store.path, columns = ['journal_key'])
+        keys.update(key.decode() for key in stored.get('journal_key', []))
+    return keys
+
+def initWorker(system_factory, params, solver, set_params, get_row, warm_start = False):
+    worker_state['params'] = params
+    worker_state['system'] = system_factory(params)
+    worker_state['solver'] = solver(worker_state['system']) if solver != None else worker_state['system']
+    worker_state['set_params'] = set_params
+    worker_state['get_row'] = get_row
+    worker_state['warm_start'] = warm_start
+    worker_state['previous'] = None
+    worker_state['m_dot_initial'] = getattr(worker_state['solver'], 'm_dot_initial', None)
+
+def solvePoint(task):
+    index, point = task
+    try:
+        worker_state['set_params'](worker_state['params'], point)
+        if worker_state['warm_start']:
+            setWarmStart(point)
+        output = worker_state['solver'].solve()
+        if worker_state['warm_start'] and hasattr(worker_state['system'], 'getWarmStart'):
+            worker_state['previous'] = (point, getattr(output, 'optMdot', None), worker_state['system'].getWarmStart(output))
+        error = None
+    except Exception as ex:
+        output = None
+        error = str(ex).replace("\n", "").replace(",", " - ")
+    return index, worker_state['get_row'](point, output, error)
+
+def solveRun(run):
+    # the first point of a run starts cold, all others from their predecessor
+    worker_state['previous'] = None
+    return [solvePoint(task) for task in run]
+
+def getRuns(tasks):
+    # consecutive points of the same run of warm_start_run points
+    return [list(run) for _, run in itertools.groupby(tasks, key = lambda task: task[0] // warm_start_run)]
+
+class ParameterSweep(object):
+    """ParameterSweep solves a full system (e.g. FullSystemCPG.getDefaultCPGSystem)
+    for many parameter points on a process pool. Every worker builds one system
+    which is reused for all its points. Rows are written to the output file as
+    they are finished, failed points are written with their error message."""
+
+    # seconds between rewrites of the csv of a running sweep
+    csv_interval = 60.
+
+    def __init__(self, system_factory, params = None, processes = None, solver = FullSystemSolver,
+                    set_params = setPointParams, get_row = getOptMdotRow, warm_start = False, **kwargs):
+        self.system_factory = system_factory
+        self.params = params
+        if self.params == None:
+            self.params = SimulationParameters(**kwargs)
+        self.processes = processes if processes != None else multiprocessing.cpu_count()
+        self.solver = solver
+        self.set_params = set_params
+        self.get_row = get_row
+        # start every point from the solution of the previous point of its run of warm_start_run points,
+        # solvers with a bracket (e.g. FullSystemSolverBrent) refine the neighboring optimum
+        self.warm_start = warm_start
+
+    @staticmethod
+    def getGrid(**axes):
+        # points of the grid in the order of nested loops over the axes
+        keys = list(axes.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*axes.values())]
+
+    def getKey(self, point):
+        params = self.params.thaw()
+        names = [getName(self.system_factory), getName(self.solver), getName(self.get_row)]
+        if self.warm_start:
+            # warm started results differ from cold ones within the solver tolerances
+            names.append('warm_start_run=%s'%warm_start_run)
+        try:
+            self.set_params(params, point)
+        except Exception:
+            # the point fails in the worker as well, it is keyed by its values
+            names.append(json.dumps(point, sort_keys = True, default = toJSON))
+        return getParamsKey(params, *names)
+
+    def run(self, points, output_file = None, ordered = True, journal = None, output_path = None, result_store = None):
+        """Solves all points and returns their rows in the order of the points.
+        With a journal, points which are already in the journal are not solved
+        again. output_file receives the rows of the solved points as they are
+        finished, output_path is rewritten atomically with the rows of all
+        finished points every csv_interval seconds and at the end. The solved
+        rows are appended to result_store (requires dict rows, e.g. get_row =
+        getResultRow) and flushed in its batches. With a journal, the rows are stored with their journal_key and
+        rows of the journal which are missing in the store (e.g. in an unflushed
+        batch of an interrupted sweep) are appended again."""
+        rows = [None] * len(points)
+        keys = [None] * len(points)
+        tasks = list(enumerate(points))
+        if journal != None:
+            finished = journal.load()
+            keys = [self.getKey(point) for point in points]
+            for i, key in enumerate(keys):
+                if key in finished:
+                    rows[i] = finished[key]
+            tasks = [(i, point) for i, point in tasks if rows[i] is None]
+            if result_store != None:
+                stored = getStoredKeys(result_store)
+                for i, key in enumerate(keys):
+                    if rows[i] is not None and key not in stored:
+                        result_store.append(dict(rows[i], journal_key = key))
+
+        initargs = (self.system_factory, self.params.thaw(), self.solver, self.set_params, self.get_row, self.warm_start)
+        # warm started workers solve whole runs of consecutive points
+        solve, tasks = (solveRun, getRuns(tasks)) if self.warm_start else (solvePoint, tasks)
+        if self.processes == 1 or len(tasks) <= 1:
+            initWorker(*initargs)
+            results = map(solve, tasks)
+            if self.warm_start:
+                results = itertools.chain.from_iterable(results)
+            self.collect(results, points, keys, rows, output_file, journal, output_path, result_store)
+        else:
+            processes = min(self.processes, len(tasks))
+            with multiprocessing.Pool(processes, initializer = initWorker, initargs = initargs) as pool:
+                results = pool.imap(solve, tasks) if ordered else pool.imap_unordered(solve, tasks)
+                if self.warm_start:
+                    results = itertools.chain.from_iterable(results)
+                self.collect(results, points, keys, rows, output_file, journal, output_path, result_store)
+
+        if output_path != None:
+            writeCSV(output_path, [row for row in rows if row is not None])
+        if result_store != None:
+            result_store.flush()
+        return rows
+
+    def collect(self, results, points, keys, rows, output_file, journal, output_path, result_store):
+        last_write = time.time()
+        for i, row in results:
+            rows[i] = row
+            if result_store != None:
+                result_store.append(row if journal == None else dict(row, journal_key = keys[i]))
+            if journal != None:
+                journal.append(keys[i], points[i], row)
+            if output_file != None:
+                output_file.write(','.join([str(val) for val in getRowValues(row)]) + '\n')
+                output_file.flush()
+            # the journal keeps the finished rows, the csv is only rewritten every csv_interval
+            if output_path != None and time.time() - last_write >= self.csv_interval:
+                writeCSV(output_path, [row for row in rows if row is not None])
+                last_write = time.time()
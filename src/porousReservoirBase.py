@@ -17,10 +17,13 @@
 from utils.fluidState import FluidState
 
 class PorousReservoirBase(object):
-    """PorousReservoirBase."""
+    """PorousReservoirBase. The reservoir conditions (T_reservoir, P_reservoir,
+    P_reservoir_max) are methods of the params, the minimum system pressure
+    depends on the fluid and is computed by getPSystemMin."""
 
     def __init__(self):
-        self.params.T_reservoir = lambda : abs(self.params.depth) * abs(self.params.dT_dz) + self.params.T_surface_rock
-        self.params.P_reservoir = lambda : abs(self.params.depth) * 1000. * self.params.g
-        self.params.P_reservoir_max = lambda : abs(self.params.depth) * 2500. * self.params.g
-        self.params.P_system_min = lambda : FluidState.getStateFromTQ(self.params.T_reservoir(), 0, self.params.working_fluid).P_Pa + 1e5
+        pass
+
+    @staticmethod
+    def getPSystemMin(params):
+        return FluidState.getStateFromTQ(params.T_reservoir(), 0, params.working_fluid, interpolate = True).P_Pa + 1e5
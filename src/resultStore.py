@@ -0,0 +1,158 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import json
+import numpy as np
+from enum import Enum
+
+from utils.fluidState import FluidState
+from models.simulationParameters import SimulationParameters
+
+# properties stored of the fluid states of an output
+state_props = ['P_Pa', 'T_C', 'h_Jkg']
+
+def flattenOutput(obj, prefix = '', values = None, max_depth = 3):
+    """Collects all scalar values of e.g. a FullSystemOutput by their attribute
+    path, such as 'capital_cost_model.LCOE_brownfield.LCOE'."""
+    if values is None:
+        values = {}
+    for key, val in vars(obj).items():
+        name = prefix + key
+        if isinstance(val, (bool, int, float, np.integer, np.floating)):
+            values[name] = float(val)
+        elif isinstance(val, FluidState):
+            for prop in state_props:
+                try:
+                    values['%s.%s'%(name, prop)] = float(getattr(val, prop))
+                except (ValueError, TypeError):
+                    values['%s.%s'%(name, prop)] = np.nan
+        elif hasattr(val, '__dict__') and max_depth > 0 and not isinstance(val, (Enum, SimulationParameters)):
+            flattenOutput(val, name + '.', values, max_depth - 1)
+    return values
+
+def getResultRow(point, output, error):
+    # row of a parameter sweep for a ResultStore
+    row = {'params.%s'%key: val for key, val in point.items()}
+    if output != None:
+        row.update(flattenOutput(output))
+    row['error'] = error if error != None else ''
+    return row
+
+def isNumber(val):
+    return isinstance(val, (bool, int, float, np.number))
+
+def encodeString(val, size):
+    # utf-8 of at most size bytes, a character cut at the end is dropped
+    return str(val).encode()[:size].decode(errors = 'ignore').encode()
+
+class ResultStore(object):
+    """ResultStore appends rows of sweep results (dicts of numbers and strings,
+    e.g. the error message) in batches to a folder with one binary file per
+    column and a schema.json. Columns which appear in later rows are added to
+    the schema, unless the columns (name, dtype) are declared up front, then
+    unknown columns raise. Missing values are nan (or empty strings).
+    read returns memory-mapped columns."""
+
+    string_dtype = 'S256'
+
+    def __init__(self, path, batch_size = 1000, columns = None):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch = []
+        self.fixed_columns = columns != None
+        self.columns = [tuple(column) for column in columns] if columns != None else []
+        self.rows = 0
+        if os.path.exists(self.getSchemaPath(path)):
+            schema = ResultStore.readSchema(path)
+            self.columns = [tuple(column) for column in schema['columns']]
+            self.rows = schema['rows']
+
+    @staticmethod
+    def getSchemaPath(path):
+        return os.path.join(path, 'schema.json')
+
+    @staticmethod
+    def getColumnPath(path, name):
+        return os.path.join(path, '%s.bin'%name)
+
+    @staticmethod
+    def readSchema(path):
+        with open(ResultStore.getSchemaPath(path)) as schema_file:
+            return json.load(schema_file)
+
+    def append(self, row):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.batch) == 0:
+            return
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+        known = [name for name, dtype in self.columns]
+        names = []
+        for row in self.batch:
+            names += [name for name in row if name not in known and name not in names]
+        if names and self.fixed_columns:
+            raise Exception('GenGeo::ResultStore:UnknownColumn - Columns %s are not in the schema!'%', '.join(names))
+        for name in names:
+            numeric = all(isNumber(row[name]) for row in self.batch if name in row)
+            dtype = 'f8' if numeric else self.string_dtype
+            # rows written before the column existed are empty
+            empty = np.full(self.rows, np.nan) if numeric else np.zeros(self.rows, dtype = dtype)
+            with open(ResultStore.getColumnPath(self.path, name), 'wb') as column_file:
+                column_file.write(empty.tobytes())
+            self.columns.append((name, dtype))
+
+        numeric = [name for name, dtype in self.columns if dtype != self.string_dtype]
+        for row in self.batch:
+            for name in numeric:
+                if name in row and not isNumber(row[name]):
+                    raise Exception('GenGeo::ResultStore:ColumnType - Column %s is numeric, got %s!'%(name, row[name]))
+        table = np.array([[row.get(name, np.nan) for name in numeric] for row in self.batch], dtype = float).reshape(len(self.batch), len(numeric))
+        for name, dtype in self.columns:
+            if dtype == self.string_dtype:
+                values = np.array([encodeString(row.get(name, ''), np.dtype(dtype).itemsize) for row in self.batch], dtype = dtype)
+            else:
+                values = np.ascontiguousarray(table[:, numeric.index(name)])
+            with open(ResultStore.getColumnPath(self.path, name), 'r+b' if self.rows > 0 or name in names else 'wb') as column_file:
+                # data beyond the rows of the schema is left from an interrupted flush
+                column_file.seek(self.rows * values.itemsize)
+                column_file.write(values.tobytes())
+                column_file.truncate()
+        self.rows += len(self.batch)
+        self.batch = []
+
+        # the schema is updated last, so the rows of the schema are always complete
+        tmp_path = ResultStore.getSchemaPath(self.path) + '.tmp'
+        with open(tmp_path, 'w') as schema_file:
+            json.dump({'columns': self.columns, 'rows': self.rows}, schema_file)
+        os.replace(tmp_path, ResultStore.getSchemaPath(self.path))
+
+    @staticmethod
+    def read(path, columns = None):
+        schema = ResultStore.readSchema(path)
+        results = {}
+        for name, dtype in schema['columns']:
+            if columns != None and name not in columns:
+                continue
+            if schema['rows'] == 0:
+                results[name] = np.zeros(0, dtype = dtype)
+            else:
+                results[name] = np.memmap(ResultStore.getColumnPath(path, name), dtype = dtype, mode = 'r', shape = (schema['rows'],))
+        return results
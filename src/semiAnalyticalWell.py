@@ -13,6 +13,7 @@
 #
 
 ############################
+import bisect
 import math
 import numpy as np
 
@@ -25,7 +26,12 @@ from models.simulationParameters import SimulationParameters
 
 class SemiAnalyticalWell(object):
     """SemiAnalyticalWell to compute heat transport with fluid flow in a well
-        and analytical conduction in the surrounding rock."""
+        and analytical conduction in the surrounding rock.
+        A well keeps its last solution while the params and geometry are
+        unchanged and returns it again for initial states within
+        well_reuse_tolerance_P/T, e.g. the injection well in all passes of the
+        CO2 dP_pump loop while the pump throttles and all wells of repeated
+        solves of a system. reuse_hits counts the reused solutions."""
 
     def __init__(self, params = None, T_e_initial = 15., dz_total = 0., dr_total = 0., m_dot_multiplier = 1, **kwargs):
         self.params = params
@@ -42,92 +48,211 @@ class SemiAnalyticalWell(object):
         # m_dot_multiplier is the multiplier applied to the mass flowrate within the wells
         # default is 1
         self.m_dot_multiplier = m_dot_multiplier
+        self.reuse_hits = 0
+        self.invalidate()
+
+    # parameters the well solution depends on
+    signature_params = ['working_fluid', 'm_dot_IP', 'time_years', 'well_radius', 'dT_dz', 'g',
+                        'rho_rock', 'c_rock', 'k_rock', 'useWellboreHeatLoss', 'well_segments',
+                        'well_segments_adaptive', 'well_tolerance_P', 'well_tolerance_T', 'epsilon',
+                        'well_reuse_tolerance_P', 'well_reuse_tolerance_T', 'well_profiles']
+
+    def getSignature(self):
+        return (self.dz_total, self.dr_total, self.T_e_initial, self.m_dot_multiplier,
+                tuple(getattr(self.params, name) for name in SemiAnalyticalWell.signature_params))
+
+    def invalidate(self):
+        # drops everything which is reused between solves
+        self.signature = None
+        self.beta = None
+        self.last_initial = None
+        self.last_results = None
+        self.fractions = None
+
+    def checkSignature(self):
+        signature = self.getSignature()
+        if signature != self.signature:
+            self.invalidate()
+            self.signature = signature
+
+    def getBeta(self):
+        if self.beta == None:
+            self.beta = self.computeBeta()
+        return self.beta
+
+    def computeBeta(self):
+        # dimensionless transient heat conduction into the rock
+        time_seconds = self.params.time_years * ConversionConstants.secPerYear
+        alpha_rock = self.params.k_rock/self.params.rho_rock/self.params.c_rock  #D rock
+        t_d = alpha_rock*time_seconds/(self.params.well_radius**2)  #dim
+        if t_d < 2.8:
+            beta = ((np.pi*t_d)**-0.5 + 0.5 - 0.25*(t_d/np.pi)**0.5 + 0.125*t_d)
+        else:
+            beta = (2/(np.log(4*t_d)-2*0.58) - 2*0.58/(np.log(4*t_d)-2*0.58)**2)
+        return beta
 
     def solve(self, initial_state):
 
-        m_dot = self.params.m_dot_IP * self.m_dot_multiplier
+        self.checkSignature()
 
-        # results
-        results = SemiAnalyticalWellResults(self.params.well_segments, self.params.working_fluid)
+        m_dot = self.params.m_dot_IP * self.m_dot_multiplier
 
         P_f_initial = initial_state.P_Pa
         T_f_initial = initial_state.T_C
-        time_seconds = self.params.time_years * ConversionConstants.secPerYear
+
+        # the previous solution is reused if the initial state is unchanged within the tolerances
+        if self.last_results != None:
+            P_last, T_last = self.last_initial
+            if abs(P_f_initial - P_last) <= self.params.well_reuse_tolerance_P and \
+                    abs(T_f_initial - T_last) <= self.params.well_reuse_tolerance_T:
+                self.reuse_hits += 1
+                return self.last_results
 
         # set geometry
-        dz = self.dz_total/self.params.well_segments             # m
-        dr = self.dr_total/self.params.well_segments             # m
-        dL = (dz**2 + dr**2)**0.5                       # m
         A_c = np.pi * self.params.well_radius**2        # m**2
-        P_c = np.pi * 2 * self.params.well_radius       # m
 
         # set states
-        results.T_C_f[0] = T_f_initial             # C
-        results.T_C_e[0] = self.T_e_initial        # C
-        results.P_Pa[0] = P_f_initial              # Pa
-        results.h_Jkg[0] = FluidState.getStateFromPT(results.P_Pa[0], results.T_C_f[0], self.params.working_fluid).h_Jkg
-        results.rho_kgm3[0] = FluidState.getStateFromPT(results.P_Pa[0], results.T_C_f[0], self.params.working_fluid).rho_kgm3
-        results.v_ms[0] = m_dot / A_c / results.rho_kgm3[0]  #m/s
+        state_initial = FluidState.getStateFromPT(P_f_initial, T_f_initial, self.params.working_fluid)
+        node = {'z_m': 0.,
+                'T_C_e': self.T_e_initial,
+                'q': 0.,
+                'v_ms': 0.,
+                'delta_P_loss': 0.,
+                'T_C_f': T_f_initial,
+                'P_Pa': P_f_initial,
+                'h_Jkg': state_initial.h_Jkg,
+                'rho_kgm3': state_initial.rho_kgm3,
+                'cp_JK': 0.}
+        node['v_ms'] = m_dot / A_c / node['rho_kgm3']  #m/s
 
         # Calculate the Friction Factor
         # Use Colebrook-white equation for wellbore friction loss.
         # Calculate for first element and assume constant in remainder
-        ff = frictionFactor(self.params.well_radius, results.P_Pa[0], results.h_Jkg[0], \
+        ff = frictionFactor(self.params.well_radius, node['P_Pa'], node['h_Jkg'], \
                             m_dot, self.params.working_fluid, self.params.epsilon)
 
-        alpha_rock = self.params.k_rock/self.params.rho_rock/self.params.c_rock  #D rock
-        t_d = alpha_rock*time_seconds/(self.params.well_radius**2)  #dim
-        if t_d < 2.8:
-            beta = ((np.pi*t_d)**-0.5 + 0.5 - 0.25*(t_d/np.pi)**0.5 + 0.125*t_d)
+        beta = self.getBeta()
+
+        # full profiles are collected as nodes, outlet-only results accumulate them
+        if self.params.well_profiles:
+            nodes = [node]
+            addNode = nodes.append
         else:
-            beta = (2/(np.log(4*t_d)-2*0.58) - 2*0.58/(np.log(4*t_d)-2*0.58)**2)
+            results = SemiAnalyticalWellResults(0, self.params.working_fluid, profiles = False)
+            addNode = results.addNode
 
-        # loop over all well segments
-        for i in range(1, self.params.well_segments+1):
-            results.z_m[i] = results.z_m[i-1] + dz
-
-            # far-field rock temp
-            results.T_C_e[i] = results.T_C_e[0] - results.z_m[i] * self.params.dT_dz
-            # fluid velocity
-            results.v_ms[i] = m_dot / A_c / results.rho_kgm3[i-1]  #m/s
-
-            # Calculate Pressure
-            results.delta_P_loss[i] = ff * dL / ( 2 * self.params.well_radius) * \
-                                            results.rho_kgm3[i-1] * \
-                                            results.v_ms[i]**2. / 2.  #Pa
-            results.rho_kgm3[i] = FluidState.getStateFromPh(results.P_Pa[i-1], results.h_Jkg[i-1], self.params.working_fluid).rho_kgm3
-            results.P_Pa[i]     = results.P_Pa[i-1] - results.rho_kgm3[i] * \
-                                        self.params.g * dz - results.delta_P_loss[i]
-
-            # Throw exception if below saturation pressure of water at previous temperature
-            if self.params.working_fluid.lower() == 'water':
-                P_sat = FluidState.getStateFromTQ(results.T_C_f[i-1], 0, self.params.working_fluid).P_Pa
-                if results.P_Pa[i] < P_sat:
-                    raise Exception('GenGeo::SemiAnalyticalWell:BelowSaturationPressure - '
-                    'Below saturation pressure of water at %s m !' %(results.z_m[i]))
-
-            h_noHX = results.h_Jkg[i-1] - self.params.g * dz
-            T_noHX = FluidState.getStateFromPh(results.P_Pa[i], h_noHX, self.params.working_fluid).T_C
-            results.cp_JK[i] = FluidState.getStateFromPh(results.P_Pa[i], h_noHX, self.params.working_fluid).cp_JK
-
-            #Find Fluid Temp
-            if not self.params.useWellboreHeatLoss:
-                results.T_C_f[i] = T_noHX
-                results.h_Jkg[i] = h_noHX
-                results.q[i] = 0.
-            else:
-                # See Zhang, Pan, Pruess, Finsterle (2011). A time-convolution
-                # approach for modeling heat exchange between a wellbore and
-                # surrounding formation. Geothermics 40, 261-266.
-                x = dL * P_c * self.params.k_rock * beta / self.params.well_radius
-                y = m_dot * results.cp_JK[i]
-                if math.isinf(x):
-                    results.T_C_f[i] = results.T_C_e[i]
-                else:
-                    results.T_C_f[i] = (y * T_noHX + x *results. T_C_e[i]) / (x + y)
-                results.q[i] = y * (T_noHX - results.T_C_f[i])
-                results.h_Jkg[i] = FluidState.getStateFromPT(results.P_Pa[i], results.T_C_f[i], self.params.working_fluid).h_Jkg
+        if self.params.well_segments_adaptive:
+            self.marchAdaptive(node, m_dot, ff, beta, addNode)
+        else:
+            dz = self.dz_total/self.params.well_segments             # m
+            dr = self.dr_total/self.params.well_segments             # m
+            # loop over all well segments
+            for i in range(1, self.params.well_segments+1):
+                node = self.solveSegment(node, dz, dr, m_dot, ff, beta)
+                addNode(node)
+
+        if self.params.well_profiles:
+            results = SemiAnalyticalWellResults(len(nodes) - 1, self.params.working_fluid)
+            for i, node in enumerate(nodes):
+                for key, value in node.items():
+                    getattr(results, key)[i] = value
         # make sure state object is set
         results.createFinalState()
 
+        self.last_initial = (P_f_initial, T_f_initial)
+        self.last_results = results
         return results
+
+    def solveSegment(self, node, dz, dr, m_dot, ff, beta):
+        """Marches one segment with elevation change dz and deviation dr from
+        the values of the previous node and returns the values of the next node."""
+        dL = (dz**2 + dr**2)**0.5                       # m
+        A_c = np.pi * self.params.well_radius**2        # m**2
+        P_c = np.pi * 2 * self.params.well_radius       # m
+
+        next_node = {}
+        next_node['z_m'] = node['z_m'] + dz
+
+        # far-field rock temp
+        next_node['T_C_e'] = self.T_e_initial - next_node['z_m'] * self.params.dT_dz
+        # fluid velocity
+        next_node['v_ms'] = m_dot / A_c / node['rho_kgm3']  #m/s
+
+        # Calculate Pressure
+        next_node['delta_P_loss'] = ff * dL / ( 2 * self.params.well_radius) * \
+                                        node['rho_kgm3'] * \
+                                        next_node['v_ms']**2. / 2.  #Pa
+        next_node['rho_kgm3'] = FluidState.getStateFromPh(node['P_Pa'], node['h_Jkg'], self.params.working_fluid).rho_kgm3
+        next_node['P_Pa']     = node['P_Pa'] - next_node['rho_kgm3'] * \
+                                    self.params.g * dz - next_node['delta_P_loss']
+
+        # Throw exception if below saturation pressure of water at previous temperature
+        if self.params.working_fluid.lower() == 'water':
+            P_sat = FluidState.getStateFromTQ(node['T_C_f'], 0, self.params.working_fluid, interpolate = True).P_Pa
+            if next_node['P_Pa'] < P_sat:
+                raise Exception('GenGeo::SemiAnalyticalWell:BelowSaturationPressure - '
+                'Below saturation pressure of water at %s m !' %(next_node['z_m']))
+
+        h_noHX = node['h_Jkg'] - self.params.g * dz
+        state_noHX = FluidState.getStateFromPh(next_node['P_Pa'], h_noHX, self.params.working_fluid)
+        T_noHX = state_noHX.T_C
+        next_node['cp_JK'] = state_noHX.cp_JK
+
+        #Find Fluid Temp
+        if not self.params.useWellboreHeatLoss:
+            next_node['T_C_f'] = T_noHX
+            next_node['h_Jkg'] = h_noHX
+            next_node['q'] = 0.
+        else:
+            # See Zhang, Pan, Pruess, Finsterle (2011). A time-convolution
+            # approach for modeling heat exchange between a wellbore and
+            # surrounding formation. Geothermics 40, 261-266.
+            x = dL * P_c * self.params.k_rock * beta / self.params.well_radius
+            y = m_dot * next_node['cp_JK']
+            if math.isinf(x):
+                next_node['T_C_f'] = next_node['T_C_e']
+            else:
+                next_node['T_C_f'] = (y * T_noHX + x * next_node['T_C_e']) / (x + y)
+            next_node['q'] = y * (T_noHX - next_node['T_C_f'])
+            next_node['h_Jkg'] = FluidState.getStateFromPT(next_node['P_Pa'], next_node['T_C_f'], self.params.working_fluid).h_Jkg
+        return next_node
+
+    def marchAdaptive(self, node, m_dot, ff, beta, addNode):
+        """Marches the well with adaptive segment lengths controlled by step
+        doubling. A segment is accepted if the difference between one full and
+        two half segments in P and T is within the tolerances scaled by the
+        segment's share of the well length, so that the summed local error
+        estimates stay within the outlet tolerances. The accepted nodes are
+        passed to addNode."""
+        # the segment lengths of the previous solve are the predictor,
+        # otherwise the fixed segment length is the first guess
+        previous = self.fractions
+        self.fractions = ([], [])
+        fraction = 1. / self.params.well_segments
+        fraction_min = 1e-3 / self.params.well_segments
+        position = 0.
+        predict = True
+        while position < 1. - 1e-12:
+            if predict and previous != None:
+                fraction = previous[1][max(bisect.bisect_right(previous[0], position) - 1, 0)]
+            fraction = min(fraction, 1. - position)
+            dz = self.dz_total * fraction
+            dr = self.dr_total * fraction
+            full = self.solveSegment(node, dz, dr, m_dot, ff, beta)
+            half = self.solveSegment(node, dz / 2., dr / 2., m_dot, ff, beta)
+            second_half = self.solveSegment(half, dz / 2., dr / 2., m_dot, ff, beta)
+            # error of the local step relative to its share of the tolerance
+            error = max(abs(second_half['P_Pa'] - full['P_Pa']) / (self.params.well_tolerance_P * fraction),
+                        abs(second_half['T_C_f'] - full['T_C_f']) / (self.params.well_tolerance_T * fraction))
+            if error <= 1. or fraction <= fraction_min:
+                addNode(half)
+                addNode(second_half)
+                node = second_half
+                self.fractions[0].append(position)
+                self.fractions[1].append(fraction)
+                position += fraction
+                predict = True
+            else:
+                predict = False
+            # local error of the first order march scales with the square of the length
+            fraction = max(fraction * min(4., max(0.2, 0.9 / max(error, 1e-10)**0.5)), fraction_min)
@@ -18,28 +18,61 @@ import numpy as np
 from utils.fluidState import FluidState
 
 class SemiAnalyticalWellResults(object):
-    """docstring for SemiAnalyticalWellResults."""
-    def __init__(self, N_dx, fluid):
+    """SemiAnalyticalWellResults holds the well profiles along the N_dx+1 nodes.
+    Outlet-only results (profiles = False) keep the outlet state, the number
+    of segments and the aggregate heat and friction pressure loss."""
+    def __init__(self, N_dx, fluid, profiles = True):
         self.fluid = fluid
+        self.segments = N_dx
+        self.profiles = profiles
+        if not profiles:
+            self.q_total = 0.
+            self.delta_P_loss_total = 0.
+            self.P_Pa_outlet = np.nan
+            self.T_C_f_outlet = np.nan
+            return
         # # create zero arrays of the size of N_dz+1 to iterate through all n+1 well segments.
-        self.z_m            = np.zeros(N_dx+1)
-        self.T_C_e          = np.zeros(N_dx+1)
-        self.q              = np.zeros(N_dx+1)
-        self.v_ms           = np.zeros(N_dx+1)
-        self.delta_P_loss   = np.zeros(N_dx+1)
-        self.T_C_f          = np.zeros(N_dx+1)
-        self.P_Pa           = np.zeros(N_dx+1)
-        self.h_Jkg          = np.zeros(N_dx+1)
-        self.rho_kgm3       = np.zeros(N_dx+1)
-        self.cp_JK          = np.zeros(N_dx+1)
+        shape = N_dx+1
+        self.z_m            = np.zeros(shape)
+        self.T_C_e          = np.zeros(shape)
+        self.q              = np.zeros(shape)
+        self.v_ms           = np.zeros(shape)
+        self.delta_P_loss   = np.zeros(shape)
+        self.T_C_f          = np.zeros(shape)
+        self.P_Pa           = np.zeros(shape)
+        self.h_Jkg          = np.zeros(shape)
+        self.rho_kgm3       = np.zeros(shape)
+        self.cp_JK          = np.zeros(shape)
+
+    def addNode(self, node):
+        # outlet-only results accumulate the nodes as they are marched
+        self.segments += 1
+        self.q_total += node['q']
+        self.delta_P_loss_total += node['delta_P_loss']
+        self.P_Pa_outlet = node['P_Pa']
+        self.T_C_f_outlet = node['T_C_f']
 
     def createFinalState(self):
+        if not self.profiles:
+            self.state = FluidState.getStateFromPT(self.P_Pa_outlet, self.T_C_f_outlet, self.fluid)
+            return
         self.state = FluidState.getStateFromPT(self.P_Pa[-1], self.T_C_f[-1], self.fluid)
 
     # # TODO: get units and change name. do we need this?
     def getHeat(self):
+        if not self.profiles:
+            return -1. * self.q_total
         return -1. * np.sum(self.q)
 
+    def getPressureLoss(self):
+        # frictional pressure loss along the well
+        if not self.profiles:
+            return self.delta_P_loss_total
+        return np.sum(self.delta_P_loss)
+
     # # TODO: get units and change name. do we need this?
     def getPressureAlongWell(self):
+        if not self.profiles:
+            raise Exception('GenGeo::SemiAnalyticalWellResults:NoProfiles - '
+                'Well profiles are only kept with params.well_profiles!')
         return self.P_Pa / 1.e6
@@ -23,15 +23,44 @@ from tests.oRCCycleSupercritPboilTest import *
 from tests.heatExchangerTest import *
 from tests.fluidSystemWaterTest import *
 from tests.fluidSystemCO2Test import *
+from tests.rootEstimatorTest import *
+from tests.fullSystemSolverTest import *
+from tests.broydenEstimatorTest import *
+from tests.coolPropInterfaceTest import *
+from tests.simulationParametersTest import *
+from tests.readXlsxDataTest import *
+from tests.capitalCostSystemVectorizedTest import *
+from tests.parameterSweepTest import *
+from tests.resultStoreTest import *
+from tests.cachedFullSystemTest import *
 
 def testSuite(full=False):
     suite = unittest.TestSuite()
+    # coolprop interface
+    suite.addTest(CoolPropInterfaceTest('testPropertyCache'))
+    suite.addTest(CoolPropInterfaceTest('testCoolPropCached'))
+    suite.addTest(CoolPropInterfaceTest('testSingleFlash'))
+    suite.addTest(CoolPropInterfaceTest('testArrayInputs'))
+    suite.addTest(CoolPropInterfaceTest('testNearCriticalBand'))
+    suite.addTest(CoolPropInterfaceTest('testFluidConstants'))
+    suite.addTest(CoolPropInterfaceTest('testTabulatedBackend'))
+    # simulation parameters
+    suite.addTest(SimulationParametersTest('testFrozenSimulationParameters'))
+    suite.addTest(SimulationParametersTest('testFrozenSystem'))
+    # cost indices
+    suite.addTest(ReadXlsxDataTest('testPPIIndexStore'))
+    # vectorized capital cost
+    suite.addTest(CapitalCostSystemVectorizedTest('testCapitalCostSystemCPG'))
+    suite.addTest(CapitalCostSystemVectorizedTest('testCapitalCostSystemORC'))
     # semi-analytical well
     suite.addTest(SemiAnalyticalWellTest('testProductionWell'))
     suite.addTest(SemiAnalyticalWellTest('testInjectionWellWater'))
     suite.addTest(SemiAnalyticalWellTest('testInjectionWellCO2'))
     suite.addTest(SemiAnalyticalWellTest('testInjectionWellCO2HighQ'))
     suite.addTest(SemiAnalyticalWellTest('testInjectionWellCO2SmallWellR'))
+    suite.addTest(SemiAnalyticalWellTest('testAdaptiveSegments'))
+    suite.addTest(SemiAnalyticalWellTest('testReuse'))
+    suite.addTest(SemiAnalyticalWellTest('testOutletOnly'))
     # reservoir
     suite.addTest(ReservoirDepletionTest('testDepletionCurve'))
     suite.addTest(ReservoirDepletionTest('testNoTransient'))
@@ -49,15 +78,38 @@ def testSuite(full=False):
     # fluidsystem Water
     suite.addTest(FluidSystemWaterTest('testFluidSystemWaterSolverMdot1'))
     suite.addTest(FluidSystemWaterTest('testFluidSystemWaterSolverMdot40'))
+    # root estimator
+    suite.addTest(RootEstimatorTest('testRootEstimatorSecant'))
+    suite.addTest(RootEstimatorTest('testRootEstimatorSolver'))
+    suite.addTest(BroydenEstimatorTest('testBroydenEstimator'))
+    suite.addTest(BroydenEstimatorTest('testBroydenEstimatorFallback'))
+    # optimum mass flow solvers
+    suite.addTest(FullSystemSolverTest('testSolverWarmStart'))
+    suite.addTest(FullSystemSolverTest('testBrentWarmStart'))
+    suite.addTest(FullSystemSolverTest('testBrentMonotone'))
     # fluidsystem CO2
     suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Mdot10'))
     suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Mdot80'))
     suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Mdot200'))
     suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Mdot100'))
+    suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Economics'))
+    suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Reuse'))
+    suite.addTest(FluidSystemCO2Test('testFluidSystemCO2Newton'))
+    # parameter sweep
+    suite.addTest(ParameterSweepTest('testParameterSweep'))
+    suite.addTest(ParameterSweepTest('testSweepJournal'))
+    suite.addTest(ParameterSweepTest('testSweepWarmStart'))
+    suite.addTest(ResultStoreTest('testResultStore'))
+    suite.addTest(ResultStoreTest('testResultStoreFirstPointFails'))
+    # persistent cache
+    suite.addTest(CachedFullSystemTest('testCachedFullSystem'))
+    suite.addTest(CachedFullSystemTest('testCacheEviction'))
     # heavy tests only if full test is run
     if full:
         suite.addTest(FluidSystemWaterTest('testFluidSystemWaterSolverOptMdot'))
         suite.addTest(FluidSystemCO2Test('testFluidSystemCO2SolverOptMdot'))
+        suite.addTest(FluidSystemCO2Test('testFluidSystemCO2SolverBrentOptMdot'))
+        suite.addTest(FluidSystemCO2Test('testFluidSystemCO2SolverParallelOptMdot'))
     return suite
 
 if __name__ == '__main__':
@@ -0,0 +1,41 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import unittest
+
+from utils.broydenEstimator import BroydenEstimator
+
+
+class BroydenEstimatorTest(unittest.TestCase):
+
+    def testBroydenEstimator(self):
+        func = lambda x: 3e6 - 1.2 * x - 2e-8 * x**2
+        estimator = BroydenEstimator(jacobian = -1.)
+        x = 0.
+        for loops in range(1, 10):
+            y = func(x)
+            if abs(y) < 1e3:
+                break
+            x = estimator.addDataAndEstimate(x, y)
+        self.assertTrue(abs(func(x)) < 1e3)
+        self.assertTrue(loops <= 5)
+        self.assertTrue(estimator.jacobian < -1.2)
+
+    def testBroydenEstimatorFallback(self):
+        # a slope with the wrong sign is not used
+        estimator = BroydenEstimator(jacobian = -1.)
+        estimator.addDataAndEstimate(0., 1e6)
+        estimator.addDataAndEstimate(1e6, 2e6)
+        self.assertEqual(estimator.jacobian, -1.)
@@ -0,0 +1,87 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import tempfile
+import unittest
+
+from src.fullSystemCPG import FullSystemCPG
+from src.cachedFullSystem import CachedFullSystem
+
+from models.simulationParameters import SimulationParameters
+
+from tests.testAssertion import testAssert
+
+
+class FailingSystem(object):
+
+    def __init__(self, params):
+        self.params = params
+
+    def solve(self):
+        if self.params.m_dot_IP < 0:
+            raise ValueError('CoolProp failed')
+        raise Exception('GenGeo::FailingSystem:Failed - m_dot %s'%self.params.m_dot_IP)
+
+
+class CachedFullSystemTest(unittest.TestCase):
+
+    def testCachedFullSystem(self):
+        path = os.path.join(tempfile.mkdtemp(), 'cache.sqlite')
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        full_system = CachedFullSystem(FullSystemCPG.getDefaultCPGSystem(params), path = path)
+        output = full_system.solve()
+        self.assertTrue(*testAssert(output.energy_results.W_net, 4.9940e+05, 'test_W_net'))
+        full_system.close()
+
+        # a new process finds the evaluation in the file
+        full_system = CachedFullSystem(FullSystemCPG.getDefaultCPGSystem(params), path = path)
+        output_cached = full_system.solve()
+        self.assertEqual(output_cached.energy_results.W_net, output.energy_results.W_net)
+        self.assertEqual(output_cached.capital_cost_model.LCOE_brownfield.LCOE, output.capital_cost_model.LCOE_brownfield.LCOE)
+        self.assertEqual(full_system.info()['hits'], 1)
+        # other params or code versions are not taken from the cache
+        params.m_dot_IP = 10
+        self.assertTrue(*testAssert(full_system.solve().energy_results.W_net, 9.7662e4, 'test_W_net_other'))
+        self.assertEqual(full_system.info()['misses'], 1)
+        full_system.close()
+        full_system = CachedFullSystem(FullSystemCPG.getDefaultCPGSystem(params), path = path, salt = 'other')
+        full_system.solve()
+        self.assertEqual(full_system.info()['hits'], 0)
+        full_system.close()
+
+    def testCacheEviction(self):
+        path = os.path.join(tempfile.mkdtemp(), 'cache.sqlite')
+        params = SimulationParameters()
+        full_system = CachedFullSystem(FailingSystem(params), path = path, max_entries = 2)
+        for m_dot in [1., 2., 3., 1.]:
+            params.m_dot_IP = m_dot
+            self.assertRaises(Exception, full_system.solve)
+        # failed solves are cached, the first entry of m_dot 1 was evicted
+        info = full_system.info()
+        self.assertEqual(info['entries'], 2)
+        self.assertEqual(info['misses'], 4)
+        params.m_dot_IP = 3.
+        with self.assertRaises(Exception) as context:
+            full_system.solve()
+        self.assertTrue(str(context.exception).find('m_dot 3.0') > -1)
+        self.assertEqual(full_system.info()['hits'], 1)
+        # other errors are raised but not cached
+        params.m_dot_IP = -1.
+        self.assertRaises(ValueError, full_system.solve)
+        self.assertRaises(ValueError, full_system.solve)
+        self.assertEqual(full_system.info()['hits'], 1)
+        full_system.close()
@@ -0,0 +1,74 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import unittest
+import numpy as np
+
+from src.fullSystemCPG import FullSystemCPG
+from src.fullSystemORC import FullSystemORC
+from src.capitalCostSystemVectorized import CapitalCostSystemVectorized
+
+from models.simulationParameters import SimulationParameters
+
+from tests.testAssertion import testAssert
+
+
+class CapitalCostSystemVectorizedTest(unittest.TestCase):
+
+    def testCapitalCostSystemCPG(self):
+        outputs = []
+        for m_dot in [10., 80.]:
+            params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+            params.m_dot_IP = m_dot
+            outputs.append(FullSystemCPG.getDefaultCPGSystem(params).solve())
+
+        energy = CapitalCostSystemVectorized.getEnergyColumns(outputs, CapitalCostSystemVectorized.cpg_columns)
+        results = CapitalCostSystemVectorized(params).solveCPG(energy)
+        for i, output in enumerate(outputs):
+            self.assertTrue(*testAssert(results.C_surface_plant.C_plant[i], output.capital_cost_model.C_surface_plant.C_plant, 'test_C_plant_%s'%i))
+            self.assertTrue(*testAssert(results.C_greenfield[i], output.capital_cost_model.C_greenfield, 'test_C_greenfield_%s'%i))
+            self.assertTrue(*testAssert(results.C_brownfield[i], output.capital_cost_model.C_brownfield, 'test_C_brownfield_%s'%i))
+            self.assertTrue(*testAssert(results.LCOE_greenfield[i], output.capital_cost_model.LCOE_greenfield.LCOE, 'test_LCOE_greenfield_%s'%i))
+
+        # design parameters are broadcast against the energy results
+        discount_rate = np.array([[0.05], [0.096]])
+        results = CapitalCostSystemVectorized(params).solveCPG(energy, discount_rate = discount_rate, cost_year = 2019)
+        self.assertEqual(results.LCOE_brownfield.shape, (2, 2))
+        self.assertTrue(*testAssert(results.LCOE_brownfield[1, 1], outputs[1].capital_cost_model.LCOE_brownfield.LCOE, 'test_LCOE_brownfield_discount_rate'))
+        self.assertTrue(np.all(results.LCOE_brownfield[0] < results.LCOE_brownfield[1]))
+
+        # design points rejected by the scalar cost model are nan
+        energy['W_turbine_total'] = np.array([-1., energy['W_turbine_total'][1]])
+        results = CapitalCostSystemVectorized(params).solveCPG(energy)
+        self.assertTrue(np.isnan(results.LCOE_greenfield[0]))
+        self.assertTrue(*testAssert(results.LCOE_greenfield[1], outputs[1].capital_cost_model.LCOE_greenfield.LCOE, 'test_LCOE_greenfield_valid'))
+
+    def testCapitalCostSystemORC(self):
+        params = SimulationParameters(working_fluid = 'water', orc_fluid = 'R245fa', capacity_factor = 0.9)
+        params.m_dot_IP = 40
+        output = FullSystemORC.getDefaultWaterSystem(params).solve()
+
+        energy = CapitalCostSystemVectorized.getEnergyColumns([output], CapitalCostSystemVectorized.orc_columns)
+        results = CapitalCostSystemVectorized(params).solveORC(energy, depth = np.array([2500., 3500.]))
+        self.assertTrue(*testAssert(results.C_greenfield[0], output.capital_cost_model.C_greenfield, 'test_C_greenfield'))
+        self.assertTrue(*testAssert(results.LCOE_brownfield[0], output.capital_cost_model.LCOE_brownfield.LCOE, 'test_LCOE_brownfield'))
+        self.assertTrue(results.C_wells_production[0] < results.C_wells_production[1])
+
+        # the ORC system shares the economics re-evaluation of the full systems
+        full_system = FullSystemORC.getDefaultWaterSystem(params)
+        output_economics = full_system.solveEconomics(output, discount_rate = 0.05)
+        scenarios = full_system.solveEconomicScenarios(output, discount_rate = np.array([0.05, params.discount_rate]))
+        self.assertTrue(*testAssert(scenarios.LCOE_brownfield[0], output_economics.capital_cost_model.LCOE_brownfield.LCOE, 'test_LCOE_brownfield_economics'))
+        self.assertTrue(*testAssert(scenarios.LCOE_brownfield[1], output.capital_cost_model.LCOE_brownfield.LCOE, 'test_LCOE_brownfield_scenarios'))
@@ -0,0 +1,141 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from CoolProp.CoolProp import PropsSI
+
+from utils.coolPropInterface import CoolPropCache, coolProp, property_cache, abstract_state_pool, tabulated_backend, near_critical_band, P_crit_co2, dP_tolerance
+from utils.coolPropTables import PropertyTable
+from utils.fluidConstants import getFluidConstants
+from utils.fluidState import FluidState
+
+from tests.testAssertion import testAssert
+
+
+class CoolPropInterfaceTest(unittest.TestCase):
+
+    def testPropertyCache(self):
+        cache = CoolPropCache(maxsize = 2)
+        key1 = cache.getKey('T', 'P', 1e6, 'HMASS', 1e5, 'Water')
+        key2 = cache.getKey('T', 'P', 2e6, 'HMASS', 1e5, 'Water')
+        key3 = cache.getKey('T', 'P', 3e6, 'HMASS', 1e5, 'Water')
+        cache.put(key1, 1.)
+        cache.put(key2, 2.)
+        self.assertEqual(cache.get(key1), 1.)
+        # key2 is least recently used and is evicted
+        cache.put(key3, 3.)
+        self.assertIsNone(cache.get(key2))
+        self.assertEqual(cache.info()['hits'], 1)
+        self.assertEqual(cache.info()['misses'], 1)
+        self.assertEqual(cache.info()['size'], 2)
+        # rounded inputs share the same entry
+        self.assertEqual(key1, cache.getKey('T', 'P', 1e6 * (1 + 1e-14), 'HMASS', 1e5, 'water'))
+        cache.enabled = False
+        self.assertIsNone(cache.getKey('T', 'P', 1e6, 'HMASS', 1e5, 'Water'))
+
+    def testCoolPropCached(self):
+        property_cache.clear()
+        T_ref = PropsSI('T', 'P', 5e6, 'HMASS', 3e5, 'CO2')
+        self.assertTrue(*testAssert(coolProp('T', 'P', 5e6, 'HMASS', 3e5, 'CO2'), T_ref, 'testCoolPropCached_miss'))
+        self.assertTrue(*testAssert(coolProp('T', 'P', 5e6, 'HMASS', 3e5, 'CO2'), T_ref, 'testCoolPropCached_hit'))
+        self.assertEqual(property_cache.hits, 1)
+
+    def testSingleFlash(self):
+        FluidState.single_flash = True
+        try:
+            updates = abstract_state_pool.updates
+            state = FluidState.getStateFromPh(5e6, 3e5, 'CO2')
+            self.assertTrue(*testAssert(state.T_C, PropsSI('T', 'P', 5e6, 'HMASS', 3e5, 'CO2') - 273.15, 'testSingleFlash_T'))
+            self.assertTrue(*testAssert(state.rho_kgm3, PropsSI('DMASS', 'P', 5e6, 'HMASS', 3e5, 'CO2'), 'testSingleFlash_rho'))
+            self.assertTrue(*testAssert(state.mu_Pas, PropsSI('V', 'P', 5e6, 'HMASS', 3e5, 'CO2'), 'testSingleFlash_mu'))
+            self.assertEqual(abstract_state_pool.updates - updates, 1)
+            # near critical band is interpolated as in coolProp
+            state = FluidState.getStateFromPh(7.3773e6, 3e5, 'CO2')
+            self.assertTrue(*testAssert(state.T_C, coolProp('T', 'P', 7.3773e6, 'HMASS', 3e5, 'CO2') - 273.15, 'testSingleFlash_T_crit'))
+        finally:
+            FluidState.single_flash = False
+
+    def testArrayInputs(self):
+        # the second and third pressure are in the near critical band of CO2
+        P = np.array([5e6, 7.3753e6, 7.3793e6, 1e7])
+        h = np.array([3e5, 3.5e5, 4e5, 4.5e5])
+        state = FluidState.getStateFromPh(P, h, 'CO2')
+        T_C = state.T_C
+        self.assertEqual(T_C.shape, P.shape)
+        for i in range(len(P)):
+            T_ref = FluidState.getStateFromPh(P[i], h[i], 'CO2').T_C
+            self.assertTrue(*testAssert(T_C[i], T_ref, 'testArrayInputs_T_%s'%i))
+        # scalars are broadcast and lists are accepted
+        rho = FluidState.getStateFromPT(list(P), 60., 'CO2').rho_kgm3
+        self.assertTrue(*testAssert(rho[2], FluidState.getStateFromPT(P[2], 60., 'CO2').rho_kgm3, 'testArrayInputs_rho'))
+
+    def testNearCriticalBand(self):
+        P_edges = [P_crit_co2 - dP_tolerance, P_crit_co2 + dP_tolerance]
+        P = P_crit_co2 + 1e3
+        for h in [2.5e5, 3e5, 3.5e5, 4.5e5]:
+            T_ref = np.interp(P, P_edges, [PropsSI('T', 'P', P_edges[0], 'HMASS', h, 'CO2'), PropsSI('T', 'P', P_edges[1], 'HMASS', h, 'CO2')])
+            T = near_critical_band.evaluate('T', 'HMASS', P, h)
+            self.assertTrue(*testAssert(T, T_ref, 'testNearCriticalBand_T_%s'%h, 1e-5))
+        # blocks are built once and shared by later calls
+        blocks = len(near_critical_band.blocks)
+        T = near_critical_band.evaluate('T', 'HMASS', np.array([P, P]), np.array([3e5 + 1., 3.5e5 + 1.]))
+        self.assertEqual(len(near_critical_band.blocks), blocks)
+        self.assertEqual(T.shape, (2,))
+
+    def testFluidConstants(self):
+        constants = getFluidConstants('R245fa')
+        self.assertIs(constants, getFluidConstants('r245fa'))
+        self.assertEqual(FluidState.getPcrit('R245fa'), PropsSI('PCRIT', '', 0, '', 0, 'R245fa'))
+        self.assertEqual(FluidState.getTcrit('R245fa'), PropsSI('TCRIT', '', 0, '', 0, 'R245fa') - 273.15)
+        # interpolated saturation states
+        state = FluidState.getStateFromTQ(80., 1, 'R245fa', interpolate = True)
+        self.assertTrue(*testAssert(state.P_Pa, PropsSI('P', 'T', 353.15, 'Q', 1, 'R245fa'), 'testFluidConstants_P_sat'))
+        self.assertTrue(*testAssert(state.h_Jkg, PropsSI('HMASS', 'T', 353.15, 'Q', 1, 'R245fa'), 'testFluidConstants_h_v'))
+        state = FluidState.getStateFromPQ(np.array([5e5, 1e6]), 0, 'R245fa', interpolate = True)
+        self.assertTrue(*testAssert(state.T_C[1], PropsSI('T', 'P', 1e6, 'Q', 0, 'R245fa') - 273.15, 'testFluidConstants_T_sat'))
+        self.assertTrue(*testAssert(state.s_JK[0], PropsSI('SMASS', 'P', 5e5, 'Q', 0, 'R245fa'), 'testFluidConstants_s_l'))
+        # states above the critical point are not in the table
+        self.assertIsNone(constants.getSaturationProps('P', 2 * constants.P_crit, 1))
+
+    def testTabulatedBackend(self):
+        table = PropertyTable.build('Water', P_min = 1e6, P_max = 3e7, T_min_C = 20., T_max_C = 150., N_P = 30, N_T = 30, N_h = 30)
+        path = os.path.join(tempfile.mkdtemp(), 'properties_water.npz')
+        table.save(path)
+        h_exact = coolProp('HMASS', 'P', 1e7, 'T', 353.15, 'Water')
+        tabulated_backend.enable('Water', path = path)
+        try:
+            h = coolProp('HMASS', 'P', 1e7, 'T', 353.15, 'Water')
+            # the exact value cached before enable does not hide the table
+            self.assertNotEqual(h, h_exact)
+            self.assertTrue(*testAssert(h, PropsSI('HMASS', 'P', 1e7, 'T', 353.15, 'Water'), 'testTabulatedBackend_h'))
+            T = coolProp('T', 'P', 1e7, 'HMASS', h, 'Water')
+            self.assertTrue(*testAssert(T, 353.15, 'testTabulatedBackend_T'))
+            # outside of the table window the equation of state is used
+            rho = coolProp('DMASS', 'P', 5e7, 'T', 353.15, 'Water')
+            self.assertEqual(rho, PropsSI('DMASS', 'P', 5e7, 'T', 353.15, 'Water'))
+            # arrays are answered partially by the table and the rest by the equation of state
+            rho = coolProp('DMASS', 'P', np.array([1e7, 5e7]), 'T', 353.15, 'Water')
+            self.assertTrue(*testAssert(rho[0], PropsSI('DMASS', 'P', 1e7, 'T', 353.15, 'Water'), 'testTabulatedBackend_rho_table'))
+            self.assertEqual(rho[1], PropsSI('DMASS', 'P', 5e7, 'T', 353.15, 'Water'))
+            for key, report in table.accuracyReport(N = 200).items():
+                self.assertTrue(report['max_rel_error'] < 1e-3, key)
+        finally:
+            tabulated_backend.disable()
+        # the table values cached while enabled are not returned after disable
+        self.assertEqual(coolProp('HMASS', 'P', 1e7, 'T', 353.15, 'Water'), h_exact)
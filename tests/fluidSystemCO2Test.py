@@ -18,6 +18,8 @@ import numpy as np
 
 from src.fullSystemCPG import FullSystemCPG
 from src.fullSystemSolver import FullSystemSolver
+from src.fullSystemSolverBrent import FullSystemSolverBrent
+from src.fullSystemSolverParallel import FullSystemSolverParallel
 
 from models.simulationParameters import SimulationParameters
 
@@ -79,6 +81,88 @@ class FluidSystemCO2Test(unittest.TestCase):
         self.assertTrue(*testAssert(output.capital_cost_model.C_greenfield, 4.8021e7, 'test_C_greenfield_N'))
         self.assertTrue(*testAssert(output.capital_cost_model.LCOE_brownfield.LCOE, 1.5247e-4, 'test_LCOE_brownfield'))
 
+    def testFluidSystemCO2Economics(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        full_system = FullSystemCPG.getDefaultCPGSystem(params)
+        # a custom fixed cost of the system is kept by the re-evaluation
+        full_system.capital_cost_model.CapitalCost_Stimulation = 5e6
+        output = full_system.solve()
+        # later changes of the system params do not change the economics of the output
+        params.m_dot_IP = 40
+        params.depth = 3000.
+
+        # economics only re-evaluation equals a full solve with the changed params
+        output_economics = full_system.solveEconomics(output, discount_rate = 0.05, F_OM = 0.03)
+        params_ref = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9, discount_rate = 0.05, F_OM = 0.03)
+        params_ref.m_dot_IP = 80
+        full_system_ref = FullSystemCPG.getDefaultCPGSystem(params_ref)
+        full_system_ref.capital_cost_model.CapitalCost_Stimulation = 5e6
+        output_ref = full_system_ref.solve()
+        self.assertIs(output_economics.energy_results, output.energy_results)
+        self.assertTrue(*testAssert(output_economics.capital_cost_model.LCOE_brownfield.LCOE, output_ref.capital_cost_model.LCOE_brownfield.LCOE, 'test_LCOE_brownfield_economics'))
+        self.assertTrue(*testAssert(output.capital_cost_model.LCOE_brownfield.LCOE, 2.6650e-4, 'test_LCOE_brownfield_unchanged'))
+        self.assertTrue(*testAssert(output_economics.capital_cost_model.C_greenfield, output_ref.capital_cost_model.C_greenfield, 'test_C_greenfield_economics'))
+
+        scenarios = full_system.solveEconomicScenarios(output, discount_rate = np.array([0.05, 0.096]), F_OM = 0.03)
+        self.assertTrue(*testAssert(scenarios.LCOE_brownfield[0], output_ref.capital_cost_model.LCOE_brownfield.LCOE, 'test_LCOE_brownfield_scenarios'))
+        self.assertRaises(Exception, full_system.solveEconomics, output, depth = 3000.)
+
+    def testFluidSystemCO2Reuse(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        full_system = FullSystemCPG.getDefaultCPGSystem(params)
+        full_system.solve()
+        well_cost = full_system.capital_cost_model.CapitalCost_Production_Well.value
+
+        # the same system follows a change of depth in wells and costs
+        params.depth = 3500.
+        output = full_system.solve()
+        params_ref = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9, depth = 3500.)
+        params_ref.m_dot_IP = 80
+        output_ref = FullSystemCPG.getDefaultCPGSystem(params_ref).solve()
+        self.assertTrue(*testAssert(output.energy_results.W_net, output_ref.energy_results.W_net, 'test_W_net_reuse'))
+        self.assertTrue(*testAssert(output.capital_cost_model.C_greenfield, output_ref.capital_cost_model.C_greenfield, 'test_C_greenfield_reuse'))
+        self.assertTrue(output.capital_cost_model.C_wells_production > well_cost)
+
+    def testFluidSystemCO2WellReuse(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 10
+        full_system = FullSystemCPG.getDefaultCPGSystem(params)
+        output = full_system.solve()
+        fluid_system = full_system.fluid_system_solver
+
+        # the throttled injection well is solved once in the dP_pump loop
+        self.assertTrue(output.fluid_system_solver.pp.dP_pump < 0)
+        self.assertTrue(output.fluid_system_solver.dP_loops > 1)
+        self.assertEqual(fluid_system.injection_well.reuse_hits, output.fluid_system_solver.dP_loops - 1)
+        # all wells are reused by a repeated solve
+        full_system.solve()
+        self.assertEqual(fluid_system.production_well.reuse_hits, 1)
+
+        # same results as without reuse
+        params_ref = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9, well_reuse_tolerance_P = -1.)
+        params_ref.m_dot_IP = 10
+        output_ref = FullSystemCPG.getDefaultCPGSystem(params_ref).solve()
+        self.assertTrue(*testAssert(output.energy_results.W_net, output_ref.energy_results.W_net, 'test_W_net_well_reuse'))
+
+    def testFluidSystemCO2Newton(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        full_system = FullSystemCPG.getDefaultCPGSystem(params)
+        full_system.fluid_system_solver.dP_newton = True
+        params.m_dot_IP = 80
+        output = full_system.solve()
+        self.assertTrue(*testAssert(output.energy_results.W_net, 4.9940e+05, 'test_W_net_newton'))
+        self.assertTrue(output.fluid_system_solver.dP_loops <= 4)
+        # the next flow rate starts from the pump pressure and slope of the last solve
+        params.m_dot_IP = 82
+        output = full_system.solve()
+        params_ref = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params_ref.m_dot_IP = 82
+        output_ref = FullSystemCPG.getDefaultCPGSystem(params_ref).solve()
+        self.assertTrue(*testAssert(output.energy_results.W_net, output_ref.energy_results.W_net, 'test_W_net_newton_next', 1e-4))
+        self.assertTrue(output.fluid_system_solver.dP_loops < output_ref.fluid_system_solver.dP_loops)
+
     def testFluidSystemCO2SolverOptMdot(self):
         params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
 
@@ -90,3 +174,29 @@ class FluidSystemCO2Test(unittest.TestCase):
         self.assertTrue(*testAssert(output.optMdot, 54.8493, 'test_optMdot_solver_optMdot', 1e-3))
         self.assertTrue(*testAssert(output.energy_results.W_net, 4.5411e5, 'test_optMdot_solver_w_net', 1e-3))
         self.assertTrue(*testAssert(output.capital_cost_model.LCOE_brownfield.LCOE, 2.3915e-4, 'test_optMdot_solver_LCOE_brownfield', 1e-3))
+
+    def testFluidSystemCO2SolverBrentOptMdot(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+
+        full_system = FullSystemCPG.getDefaultCPGSystem(params)
+        full_system_solver = FullSystemSolverBrent(full_system)
+
+        output = full_system_solver.solve()
+
+        self.assertTrue(*testAssert(output.optMdot, 54.8493, 'test_optMdot_brent_optMdot', 1e-3))
+        self.assertTrue(*testAssert(output.capital_cost_model.LCOE_brownfield.LCOE, 2.3915e-4, 'test_optMdot_brent_LCOE_brownfield', 1e-3))
+        # the stepping search of FullSystemSolver needs 34 evaluations
+        self.assertTrue(output.evaluations < 15)
+        self.assertEqual(full_system.params.m_dot_IP, output.optMdot)
+
+    def testFluidSystemCO2SolverParallelOptMdot(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+
+        full_system = FullSystemCPG.getDefaultCPGSystem(params)
+        full_system_solver = FullSystemSolverParallel(full_system, processes = 2, points = 6, m_dot_min = 20., m_dot_max = 160., xtol = 5e-4)
+
+        output = full_system_solver.solve()
+
+        self.assertTrue(*testAssert(output.optMdot, 54.8493, 'test_optMdot_parallel_optMdot', 1e-3))
+        self.assertTrue(*testAssert(output.capital_cost_model.LCOE_brownfield.LCOE, 2.3915e-4, 'test_optMdot_parallel_LCOE_brownfield', 1e-3))
+        self.assertEqual(output.evaluations, len(full_system_solver.evaluations))
@@ -0,0 +1,104 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import unittest
+
+from src.fullSystemSolver import FullSystemSolver
+from src.fullSystemSolverBrent import FullSystemSolverBrent
+
+from models.simulationParameters import SimulationParameters
+
+from tests.testAssertion import testAssert
+
+
+class ParabolicOutput(object):
+    pass
+
+class ParabolicSystem(object):
+    """Synthetic full system with an LCOE minimum at m_dot_IP = 54.8."""
+
+    def __init__(self, params):
+        self.params = params
+        self.evaluations = 0
+
+    def solve(self):
+        self.evaluations += 1
+        output = ParabolicOutput()
+        output.capital_cost_model = ParabolicOutput()
+        output.capital_cost_model.LCOE_brownfield = ParabolicOutput()
+        output.capital_cost_model.LCOE_brownfield.LCOE = 2.4e-4 * (1 + ((self.params.m_dot_IP - 54.8) / 30.)**2)
+        return output
+
+class MonotoneSystem(ParabolicSystem):
+    """Synthetic full system with an LCOE decreasing with the flow rate, which
+    exceeds the production pump pressure above m_dot_max."""
+
+    def __init__(self, params, m_dot_max = None):
+        super().__init__(params)
+        self.m_dot_max = m_dot_max
+
+    def solve(self):
+        if self.m_dot_max != None and self.params.m_dot_IP > self.m_dot_max:
+            raise Exception('GenGeo::Synthetic:ExceedsMaxProductionPumpPressure - Exceeds the pump pressure!')
+        output = super().solve()
+        output.capital_cost_model.LCOE_brownfield.LCOE = 1e-3 / self.params.m_dot_IP
+        return output
+
+
+class FullSystemSolverTest(unittest.TestCase):
+
+    def testSolverWarmStart(self):
+        system = ParabolicSystem(SimulationParameters())
+        output = FullSystemSolver(system).solve()
+        cold_evaluations = system.evaluations
+        self.assertTrue(*testAssert(output.optMdot, 54.8, 'test_optMdot_cold', 1e-3))
+
+        # the peak iterator starts from the guess, a bracket is not used
+        for m_dot_IP in [40., 54.8, 60.]:
+            system = ParabolicSystem(SimulationParameters())
+            solver = FullSystemSolver(system)
+            solver.setInitialGuess(m_dot_IP, (m_dot_IP / 1.1, m_dot_IP * 1.1))
+            output = solver.solve()
+            self.assertTrue(*testAssert(output.optMdot, 54.8, 'test_optMdot_warm_%s'%m_dot_IP, 1e-3))
+            self.assertTrue(system.evaluations < cold_evaluations)
+
+    def testBrentWarmStart(self):
+        # cold start of the default solver of a sweep
+        system = ParabolicSystem(SimulationParameters())
+        output = FullSystemSolver(system).solve()
+        cold_evaluations = system.evaluations
+
+        # guesses within and outside of a +-10% bracket around the guess
+        for m_dot_IP in [40., 50., 54.8, 60.]:
+            system = ParabolicSystem(SimulationParameters())
+            solver = FullSystemSolverBrent(system)
+            solver.setInitialGuess(m_dot_IP, (m_dot_IP / 1.1, m_dot_IP * 1.1))
+            output = solver.solve()
+            self.assertTrue(*testAssert(output.optMdot, 54.8, 'test_optMdot_brent_warm_%s'%m_dot_IP, 1e-3))
+            self.assertTrue(system.evaluations < cold_evaluations)
+            self.assertEqual(output.evaluations, system.evaluations)
+
+    def testBrentMonotone(self):
+        # the bracket expansion stops at the flow rate limit
+        system = MonotoneSystem(SimulationParameters())
+        solver = FullSystemSolverBrent(system, m_dot_limit = 1e3)
+        self.assertRaises(Exception, solver.solve)
+        self.assertTrue(system.evaluations < 20)
+
+        # infeasible ends of the bracket are not passed to Brent's method
+        system = MonotoneSystem(SimulationParameters(), m_dot_max = 60.)
+        output = FullSystemSolverBrent(system).solve()
+        self.assertTrue(output.optMdot <= 60.)
+        self.assertTrue(*testAssert(output.optMdot, 60., 'test_optMdot_brent_feasible', 1e-3))
@@ -0,0 +1,112 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from src import parameterSweep
+from src.fullSystemCPG import FullSystemCPG
+from src.parameterSweep import ParameterSweep, SweepJournal, worker_state, getPointDistance
+
+from models.simulationParameters import SimulationParameters
+
+from tests.testAssertion import testAssert
+
+def getRow(point, output, error):
+    if error != None:
+        return list(point.values()) + [0., error]
+    return list(point.values()) + [output.energy_results.W_net, '']
+
+
+class ParameterSweepTest(unittest.TestCase):
+
+    def testParameterSweep(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        points = ParameterSweep.getGrid(depth = [2500., 3500.], m_dot_IP = [10., 80.])
+        self.assertEqual(points[1], {'depth': 2500., 'm_dot_IP': 80.})
+        # failing points are reported as in exampleCPGSystemStudy.py
+        points.append({'depth': 2500., 'unknown_param': 1.})
+
+        output_file = io.StringIO()
+        sweep = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 2, solver = None, get_row = getRow)
+        rows = sweep.run(points, output_file)
+        rows_serial = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getRow).run(points)
+
+        self.assertEqual(len(output_file.getvalue().splitlines()), len(points))
+        self.assertTrue(*testAssert(rows[1][2], 4.9940e+05, 'test_W_net_sweep'))
+        for row, row_serial in zip(rows, rows_serial):
+            self.assertEqual(row, row_serial)
+        self.assertTrue(rows[-1][-1].find('UnknownParameter') > -1)
+
+    def testSweepJournal(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        folder = tempfile.mkdtemp()
+        journal = SweepJournal(os.path.join(folder, 'sweep.journal'))
+        output_path = os.path.join(folder, 'sweep.csv')
+        sweep = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getRow)
+
+        rows = sweep.run(ParameterSweep.getGrid(depth = [2500., 3500.]), journal = journal, output_path = output_path)
+        self.assertEqual(len(journal.load()), 2)
+        # an interrupted write leaves an incomplete line
+        with open(journal.path, 'a') as journal_file:
+            journal_file.write('{"key": "abc", "row": [')
+
+        # only the new point is solved
+        output_file = io.StringIO()
+        rows_resumed = sweep.run(ParameterSweep.getGrid(depth = [2500., 3000., 3500.]), output_file, journal = journal, output_path = output_path)
+        self.assertEqual(output_file.getvalue().split(',')[0], '3000.0')
+        self.assertEqual(rows_resumed[0], rows[0])
+        self.assertEqual(rows_resumed[2], rows[1])
+        self.assertEqual(len(journal.load()), 3)
+        with open(output_path) as output_csv:
+            self.assertEqual(len(output_csv.read().splitlines()), 3)
+
+        # all params are part of the key
+        key = sweep.getKey({'depth': 2500.})
+        sweep.params.capacity_factor = 0.8
+        self.assertNotEqual(sweep.getKey({'depth': 2500.}), key)
+
+    def testSweepWarmStart(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        points = ParameterSweep.getGrid(depth = [2500., 2600., 3500.])
+        rows = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getRow).run(points)
+        rows_warm = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getRow, warm_start = True).run(points)
+        for row, row_warm in zip(rows, rows_warm):
+            self.assertTrue(*testAssert(row_warm[1], row[1], 'test_W_net_warm_start', 1e-4))
+
+        # the last point started from the pump pressure of the previous point
+        self.assertEqual(worker_state['previous'][0], points[2])
+        self.assertTrue(worker_state['system'].fluid_system_solver.dP_pump_initial != None)
+        self.assertTrue(np.isinf(getPointDistance(points[0], {'depth': 'deep'})))
+
+        # the neighbors do not depend on the number of processes
+        warm_start_run = parameterSweep.warm_start_run
+        parameterSweep.warm_start_run = 2
+        try:
+            rows_serial = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getRow, warm_start = True).run(points)
+            rows_parallel = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 2, solver = None, get_row = getRow, warm_start = True).run(points)
+        finally:
+            parameterSweep.warm_start_run = warm_start_run
+        self.assertEqual(rows_parallel, rows_serial)
+        # warm started and cold results are journaled with different keys
+        sweep = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, solver = None, get_row = getRow)
+        sweep_warm = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, solver = None, get_row = getRow, warm_start = True)
+        self.assertNotEqual(sweep_warm.getKey(points[0]), sweep.getKey(points[0]))
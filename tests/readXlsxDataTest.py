@@ -0,0 +1,44 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from utils.constantsAndPaths import getWellCost
+from utils.readXlsxData import PPIIndexStore, readCostTable, readXlsxColumn
+
+from tests.testAssertion import testAssert
+
+
+class ReadXlsxDataTest(unittest.TestCase):
+
+    def testPPIIndexStore(self):
+        table = readXlsxColumn(getWellCost(), 'Sheet1', ['Year', 'PPI_O&G'], 1)
+        reference = table.query('Year == 2019')['PPI_O&G'].values[0]
+        cache_path = os.path.join(tempfile.mkdtemp(), 'PPI_Table.npz')
+        store = PPIIndexStore(cache_path = cache_path)
+        self.assertEqual(store.getIndex('PPI_O&G', 2019), reference)
+        self.assertTrue(os.path.exists(cache_path))
+        # a new store reads the binary cache
+        cached_store = PPIIndexStore(cache_path = cache_path)
+        self.assertEqual(cached_store.getIndex('PPI_O&G', 2019), reference)
+        self.assertEqual(readCostTable('PPI_O&G', cost_year = 2019), reference)
+        self.assertEqual(readCostTable('PPI_O&G')[2019], reference)
+        # vectorized lookup of several years
+        values = cached_store.getIndex('PPI_O&G', np.array([2019, 2000]))
+        self.assertTrue(*testAssert(values[1], table.query('Year == 2000')['PPI_O&G'].values[0], 'testPPIIndexStore_2000'))
+        self.assertRaises(Exception, cached_store.getIndex, 'PPI_O&G', 1900)
@@ -0,0 +1,102 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from src.fullSystemCPG import FullSystemCPG
+from src.parameterSweep import ParameterSweep, SweepJournal
+from src.resultStore import ResultStore, getResultRow
+
+from models.simulationParameters import SimulationParameters
+
+from tests.testAssertion import testAssert
+
+
+class ResultStoreTest(unittest.TestCase):
+
+    def testResultStore(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        path = os.path.join(tempfile.mkdtemp(), 'sweep')
+        store = ResultStore(path, batch_size = 2)
+        points = ParameterSweep.getGrid(depth = [2500., 3500.]) + [{'unknown_param': 1.}]
+        sweep = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getResultRow)
+        sweep.run(points, result_store = store)
+
+        results = ResultStore.read(path)
+        self.assertEqual(len(results['params.depth']), 3)
+        self.assertTrue(*testAssert(results['energy_results.W_net'][0], 4.9940e+05, 'test_W_net'))
+        self.assertTrue(*testAssert(results['capital_cost_model.LCOE_brownfield.LCOE'][0], 2.6650e-4, 'test_LCOE_brownfield'))
+        self.assertTrue(results['capital_cost_model.C_wells_production'][1] > results['capital_cost_model.C_wells_production'][0])
+        self.assertTrue(*testAssert(results['fluid_system_solver.production_well.state.T_C'][0], 59.0540, 'test_T_prod_surface_C'))
+        self.assertTrue(np.isnan(results['energy_results.W_net'][2]))
+        self.assertTrue(results['error'][2].decode().find('UnknownParameter') > -1)
+
+        # rows are appended to an existing store, new columns are added
+        store = ResultStore(path)
+        store.append({'params.depth': 4000., 'energy_results.W_net': 1., 'other': 2.})
+        store.flush()
+        results = ResultStore.read(path, columns = ['params.depth', 'energy_results.W_net', 'error', 'other'])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(np.isnan(results['params.depth'][2]))
+        self.assertEqual(results['params.depth'][3], 4000.)
+        self.assertEqual(results['error'][3], b'')
+        self.assertTrue(np.isnan(results['other'][0]))
+        self.assertEqual(results['other'][3], 2.)
+
+    def testResultStoreFirstPointFails(self):
+        params = SimulationParameters(working_fluid = 'co2', capacity_factor = 0.9)
+        params.m_dot_IP = 80
+        folder = tempfile.mkdtemp()
+        path = os.path.join(folder, 'sweep')
+        journal = SweepJournal(os.path.join(folder, 'sweep.journal'))
+        points = [{'unknown_param': 1.}] + ParameterSweep.getGrid(depth = [2500.])
+        store = ResultStore(path, batch_size = 1)
+        sweep = ParameterSweep(FullSystemCPG.getDefaultCPGSystem, params, processes = 1, solver = None, get_row = getResultRow)
+        sweep.run(points, journal = journal, result_store = store)
+
+        results = ResultStore.read(path)
+        self.assertTrue(results['error'][0].decode().find('UnknownParameter') > -1)
+        self.assertTrue(np.isnan(results['energy_results.W_net'][0]))
+        self.assertTrue(*testAssert(results['energy_results.W_net'][1], 4.9940e+05, 'test_W_net_first_fails'))
+
+        # rows of the journal which were not flushed to the store are appended on resume
+        store = ResultStore(os.path.join(folder, 'sweep_resumed'))
+        sweep.run(points + ParameterSweep.getGrid(depth = [3500.]), journal = journal, result_store = store)
+        results = ResultStore.read(store.path)
+        self.assertEqual(len(results['journal_key']), 3)
+        self.assertEqual(len(set(results['journal_key'])), 3)
+
+        # a declared schema does not accept other columns
+        store = ResultStore(os.path.join(folder, 'declared'), columns = [('params.depth', 'f8'), ('error', ResultStore.string_dtype)])
+        store.append({'params.depth': 1., 'other': 2.})
+        with self.assertRaises(Exception):
+            store.flush()
+        store = ResultStore(os.path.join(folder, 'typed'))
+        store.append({'params.depth': 1.})
+        store.flush()
+        store.append({'params.depth': 'a'})
+        with self.assertRaises(Exception):
+            store.flush()
+
+        # long strings are cut at a character boundary
+        store = ResultStore(os.path.join(folder, 'strings'))
+        store.append({'error': 'a' + 'Δ' * 200})
+        store.flush()
+        error = ResultStore.read(store.path)['error'][0].decode()
+        self.assertEqual(error, 'a' + 'Δ' * 127)
@@ -0,0 +1,56 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import io
+import contextlib
+import unittest
+import numpy as np
+
+from utils.solver import Solver
+from utils.rootEstimator import RootEstimator
+
+from tests.testAssertion import testAssert
+
+
+class RootEstimatorTest(unittest.TestCase):
+
+    def testRootEstimatorSecant(self):
+        estimator = RootEstimator()
+        self.assertTrue(np.isnan(estimator.addDataAndEstimate(0., 1e6)))
+        x_zero = estimator.addDataAndEstimate(1e6, 5e5)
+        self.assertTrue(*testAssert(x_zero, 2e6, 'test_secant'))
+        # duplicate points are ignored
+        self.assertEqual(estimator.addDataAndEstimate(1e6, 5e5), x_zero)
+        self.assertEqual(len(estimator.points), 2)
+
+    def testRootEstimatorSolver(self):
+        # same estimates as Solver for interpolation, extrapolation and divergent points
+        rng = np.random.RandomState(0)
+        # Solver prints its nudges and divides by zero for divergent points
+        with contextlib.redirect_stdout(io.StringIO()), np.errstate(divide = 'ignore', invalid = 'ignore'):
+            for trial in range(200):
+                solver = Solver()
+                estimator = RootEstimator()
+                for k in range(6):
+                    if trial % 2 == 0:
+                        x, y = rng.randn(2)
+                    else:
+                        x, y = rng.randint(-2, 3, 2).astype(float)
+                    x_solver = solver.addDataAndEstimate(x, y)
+                    x_estimator = estimator.addDataAndEstimate(x, y)
+                    if np.isnan(x_solver):
+                        self.assertTrue(np.isnan(x_estimator))
+                    else:
+                        self.assertEqual(x_estimator, x_solver)
@@ -180,3 +180,68 @@ class SemiAnalyticalWellTest(unittest.TestCase):
                         (vertical_well_results.state.T_C, 222.2246),
                         (vertical_well_results.state.h_Jkg, 6.8717e5))
 
+
+    def testAdaptiveSegments(self):
+        ###
+        #  Testing the adaptive segment lengths against a finely segmented well
+        ###
+        params = SimulationParameters(working_fluid = 'water',
+                                        time_years = 10.,
+                                        m_dot_IP=136.,
+                                        well_segments = 1000,
+                                        well_profiles = True)
+        well = SemiAnalyticalWell(params, T_e_initial=102.5, dz_total=2500.)
+        initial_state = FluidState.getStateFromPT(25.e6, 97., params.working_fluid)
+        reference = well.solve(initial_state)
+
+        params.well_segments = 100
+        params.well_segments_adaptive = True
+        wellresult = well.solve(initial_state)
+
+        # the smooth liquid water profile needs fewer segments
+        self.assertLess(wellresult.segments, 100)
+        self.assertEqual(len(wellresult.P_Pa), wellresult.segments + 1)
+        self.assertLess(abs(wellresult.state.P_Pa - reference.state.P_Pa), params.well_tolerance_P)
+        self.assertLess(abs(wellresult.state.T_C - reference.state.T_C), params.well_tolerance_T)
+
+    def testReuse(self):
+        ###
+        #  Testing the reuse of well solutions for unchanged inputs
+        ###
+        params = SimulationParameters(working_fluid = 'co2',
+                                        time_years = 10.,
+                                        m_dot_IP=136.)
+        well = SemiAnalyticalWell(params, T_e_initial=102.5, dz_total=2500.)
+        initial_state = FluidState.getStateFromPT(25.e6, 97., params.working_fluid)
+        wellresult = well.solve(initial_state)
+        self.assertIs(well.solve(FluidState.getStateFromPT(25.e6, 97., params.working_fluid)), wellresult)
+        # changed inputs and parameters are solved again
+        self.assertIsNot(well.solve(FluidState.getStateFromPT(25.e6 + 100., 97., params.working_fluid)), wellresult)
+        params.m_dot_IP = 100.
+        changed_result = well.solve(initial_state)
+        self.assertTrue(changed_result.state.P_Pa > wellresult.state.P_Pa)
+        # reuse within tolerance
+        params.well_reuse_tolerance_P = 1000.
+        tolerance_result = well.solve(initial_state)
+        self.assertIs(well.solve(FluidState.getStateFromPT(25.e6 + 100., 97., params.working_fluid)), tolerance_result)
+
+    def testOutletOnly(self):
+        ###
+        #  Testing outlet-only results against full profiles
+        ###
+        params = SimulationParameters(working_fluid = 'co2',
+                                        time_years = 10.,
+                                        m_dot_IP=136.)
+        well = SemiAnalyticalWell(params, T_e_initial=102.5, dz_total=2500.)
+        initial_state = FluidState.getStateFromPT(25.e6, 97., params.working_fluid)
+        outlet_result = well.solve(initial_state)
+        params.well_profiles = True
+        wellresult = well.solve(initial_state)
+
+        self.assertFalse(hasattr(outlet_result, 'P_Pa'))
+        self.assertEqual(outlet_result.segments, wellresult.segments)
+        self.assertEqual(outlet_result.state.P_Pa, wellresult.state.P_Pa)
+        self.assertEqual(outlet_result.state.T_C, wellresult.state.T_C)
+        self.assertTrue(*testAssert(outlet_result.getHeat(), wellresult.getHeat(), 'OutletOnly_Heat'))
+        self.assertTrue(*testAssert(outlet_result.getPressureLoss(), wellresult.getPressureLoss(), 'OutletOnly_PressureLoss'))
+        self.assertRaises(Exception, outlet_result.getPressureAlongWell)
@@ -0,0 +1,60 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import pickle
+import unittest
+
+from src.fullSystemCPG import FullSystemCPG
+from src.porousReservoirBase import PorousReservoirBase
+
+from models.simulationParameters import SimulationParameters, FrozenSimulationParameters, parameter_names
+from models.wellFieldType import WellFieldType
+
+from tests.testAssertion import testAssert
+
+
+class SimulationParametersTest(unittest.TestCase):
+
+    def testFrozenSimulationParameters(self):
+        params = SimulationParameters(working_fluid = 'water', wellFieldType = WellFieldType.Doublet)
+        frozen = params.freeze()
+        self.assertEqual(frozen.key(), params.key())
+        self.assertEqual(frozen, FrozenSimulationParameters(working_fluid = 'water', wellFieldType = WellFieldType.Doublet))
+        self.assertEqual(len({frozen, params.freeze()}), 1)
+        self.assertEqual(frozen, pickle.loads(pickle.dumps(frozen)))
+        self.assertRaises(Exception, setattr, frozen, 'depth', 3000.)
+
+        # replace returns a changed copy
+        deeper = frozen.replace(depth = 3000.)
+        self.assertEqual(frozen.depth, 2500.)
+        self.assertEqual(deeper.depth, 3000.)
+        self.assertNotEqual(deeper.key(), frozen.key())
+        self.assertEqual(params.replace(depth = 3000.).key(), deeper.key())
+        self.assertRaises(Exception, frozen.replace, unknown_param = 1.)
+
+        # derived quantities
+        self.assertTrue(*testAssert(deeper.T_reservoir(), 15. + 3000. * 0.035, 'test_T_reservoir'))
+        self.assertTrue(*testAssert(PorousReservoirBase.getPSystemMin(frozen), PorousReservoirBase.getPSystemMin(params), 'test_P_system_min'))
+
+        # all parameters are declared, others are not dropped silently
+        self.assertEqual(set(parameter_names), set(vars(SimulationParameters())))
+        params.unknown_param = 1.
+        self.assertRaises(Exception, params.freeze)
+
+    def testFrozenSystem(self):
+        params = FrozenSimulationParameters(working_fluid = 'co2', capacity_factor = 0.9, m_dot_IP = 80)
+        output = FullSystemCPG.getDefaultCPGSystem(params).solve()
+        self.assertTrue(*testAssert(output.energy_results.W_net, 4.9940e+05, 'test_W_net'))
+        self.assertEqual(params.m_dot_IP, 80)
@@ -0,0 +1,44 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import numpy as np
+
+from utils.rootEstimator import RootEstimator
+
+class BroydenEstimator(object):
+    """BroydenEstimator estimates the zero of a function with Newton steps on a
+    slope which is updated from the last two points (Broyden's method in one
+    dimension). If a step does not reduce the residual or the slope changes its
+    sign, the estimate of RootEstimator from all points is used instead."""
+
+    def __init__(self, jacobian):
+        # initial slope dy/dx, e.g. of a previous solve
+        self.jacobian = jacobian
+        self.root_estimator = RootEstimator()
+        self.x = np.nan
+        self.y = np.nan
+
+    def addDataAndEstimate(self, x, y):
+        x_fallback = self.root_estimator.addDataAndEstimate(x, y)
+        if not np.isnan(self.x) and x != self.x:
+            jacobian = (y - self.y) / (x - self.x)
+            if np.isfinite(jacobian) and np.sign(jacobian) == np.sign(self.jacobian):
+                self.jacobian = jacobian
+        reduced = np.isnan(self.y) or abs(y) < abs(self.y)
+        self.x = x
+        self.y = y
+        if not reduced and not np.isnan(x_fallback):
+            return x_fallback
+        return x - y / self.jacobian
@@ -25,6 +25,15 @@ def getProjectRoot() -> Path:
 def getWellCost():
     return os.path.join(getProjectRoot(), 'data', 'PPI_Table.xlsx')
 
+def getWellCostCache():
+    return os.path.join(getProjectRoot(), 'data', 'tables', 'PPI_Table.npz')
+
+def getFullSystemCache():
+    return os.path.join(getProjectRoot(), 'data', 'tables', 'full_system_cache.sqlite')
+
+def getPropertyTable(fluid):
+    return os.path.join(getProjectRoot(), 'data', 'tables', 'properties_%s.npz'%fluid.lower())
+
 def getPboilOptimum():
     return os.path.join(getProjectRoot(), 'data', 'ORC_Pboil_optimum.csv')
 
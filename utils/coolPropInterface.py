@@ -13,26 +13,359 @@
 #
 
 ############################
+from collections import OrderedDict
+import os
 import numpy as np
 
-from CoolProp.CoolProp import PropsSI
+from CoolProp import AbstractState
+from CoolProp.CoolProp import PropsSI, generate_update_pair, get_parameter_index
+
+from utils.constantsAndPaths import getPropertyTable
+from utils.coolPropTables import PropertyTable, catmullRomWeights, evaluateStates
+
+class CoolPropCache(object):
+    """CoolPropCache is a bounded least-recently-used cache of coolprop calls.
+    Entries are keyed on the output property, the fluid, the input names and
+    the input values rounded to a number of significant digits.
+    Only scalar inputs are cached.
+    """
+    def __init__(self, maxsize = 2**16, digits = 12, enabled = True):
+        self.maxsize = maxsize
+        self.digits = digits
+        self.enabled = enabled
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def roundValue(self, val):
+        return float('%.*g'%(self.digits, val))
+
+    def getKey(self, outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
+        if not self.enabled or self.maxsize <= 0:
+            return None
+        if not np.isscalar(prop1Val) or not np.isscalar(prop2Val):
+            return None
+        return (outPropName, fluid.lower(), prop1Name, self.roundValue(prop1Val), prop2Name, self.roundValue(prop2Val))
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last = False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.data) > max(self.maxsize, 0):
+            self.data.popitem(last = False)
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.data), 'maxsize': self.maxsize, 'enabled': self.enabled}
+
+# process wide property cache, use property_cache.enabled = False to switch it off
+property_cache = CoolPropCache()
+
+class TabulatedBackend(object):
+    """TabulatedBackend answers P-T and P-h queries of selected fluids from
+    precomputed property tables. Queries outside of the tabulated window or
+    of other properties fall back to the full equation of state."""
+    def __init__(self):
+        self.tables = {}
+
+    def enable(self, fluid, table = None, path = None, **kwargs):
+        # load the table from disk or build and save it on first use
+        if table == None:
+            if path == None:
+                path = getPropertyTable(fluid)
+            if os.path.exists(path):
+                table = PropertyTable.load(path)
+            else:
+                table = PropertyTable.build(fluid, **kwargs)
+                table.save(path)
+        self.tables[fluid.lower()] = table
+        # cached values of the equation of state would hide the table
+        property_cache.clear()
+        return table
+
+    def disable(self, fluid = None):
+        if fluid == None:
+            self.tables.clear()
+        else:
+            self.tables.pop(fluid.lower(), None)
+        # cached table values would outlive the table
+        property_cache.clear()
+
+    def evaluate(self, outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
+        table = self.tables.get(fluid.lower())
+        if table == None:
+            return None
+        value = table.evaluate(outPropName, prop1Name, prop1Val, prop2Name, prop2Val)
+        if value is None:
+            return None
+        if np.ndim(value) == 0:
+            if np.isnan(value):
+                return None
+            return float(value)
+        # arrays are returned with nan where the table has no answer
+        return value
+
+# tables are only used for fluids enabled with tabulated_backend.enable(fluid)
+tabulated_backend = TabulatedBackend()
 
 def coolProps(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
-    return PropsSI(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid)
+    if np.ndim(prop1Val) == 0 and np.ndim(prop2Val) == 0:
+        # zero-dimensional arrays are passed as floats
+        return PropsSI(outPropName, prop1Name, float(prop1Val), prop2Name, float(prop2Val), fluid)
+    prop1Val, prop2Val = np.broadcast_arrays(np.asarray(prop1Val, dtype = float), np.asarray(prop2Val, dtype = float))
+    if prop1Val.size == 0:
+        return np.zeros(prop1Val.shape)
+    value = np.reshape(PropsSI(outPropName, prop1Name, prop1Val.ravel(), prop2Name, prop2Val.ravel(), fluid), prop1Val.shape)
+    # PropsSI returns inf for failed states of arrays, raise the coolprop error as for scalars
+    finite = np.isfinite(prop1Val) & np.isfinite(prop2Val)
+    failed = np.isinf(value) & finite
+    if np.any(failed):
+        k = np.flatnonzero(failed)[0]
+        PropsSI(outPropName, prop1Name, prop1Val.flat[k], prop2Name, prop2Val.flat[k], fluid)
+    # states of nan inputs are nan
+    return np.where(finite, value, np.nan)
 
 P_crit_co2 = coolProps('PCRIT', "", 0, "", 0, 'CO2')
 dP_tolerance = 5e3
 
-def coolProp(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
+class NearCriticalBand(object):
+    """NearCriticalBand tabulates the properties of CO2 at the two edges of the
+    near critical pressure band as a function of the second input (T, HMASS or
+    SMASS). The table is split into blocks which are built lazily on first use
+    and shared by all calls. Each block is validated at the interval midpoints
+    and intervals which are not accurate (e.g. across the saturation dome of the
+    lower edge) are answered by direct coolprop calls."""
+
+    outputs = {'T': ['HMASS', 'DMASS', 'SMASS', 'CPMASS', 'V'],
+               'HMASS': ['T', 'DMASS', 'SMASS', 'CPMASS', 'V'],
+               'SMASS': ['T', 'HMASS', 'DMASS', 'CPMASS', 'V']}
+    spacing = {'T': 1., 'HMASS': 1e3, 'SMASS': 5.}
+
+    def __init__(self, block_size = 16, tolerance = 1e-6, enabled = True):
+        self.block_size = block_size
+        self.tolerance = tolerance
+        self.enabled = enabled
+        self.blocks = {}
+
+    def getEdges(self):
+        return (P_crit_co2 - dP_tolerance, P_crit_co2 + dP_tolerance)
+
+    def getBlock(self, prop2Name, index):
+        block = self.blocks.get((prop2Name, index))
+        if block == None:
+            block = self.buildBlock(prop2Name, index)
+            self.blocks[(prop2Name, index)] = block
+        return block
+
+    def buildBlock(self, prop2Name, index):
+        outputs = NearCriticalBand.outputs[prop2Name]
+        spacing = NearCriticalBand.spacing[prop2Name]
+        x_0 = index * self.block_size * spacing
+        # one extra node on each side for the cubic interpolation
+        nodes = x_0 + spacing * np.arange(-1, self.block_size + 2)
+        midpoints = x_0 + spacing * (np.arange(self.block_size) + 0.5)
+        values = {}
+        valid = {}
+        w = catmullRomWeights(0.5)
+        for P in self.getEdges():
+            node_values = evaluateStates('CO2', prop2Name, np.full(len(nodes), P), nodes, outputs)
+            exact_values = evaluateStates('CO2', prop2Name, np.full(len(midpoints), P), midpoints, outputs)
+            for out in outputs:
+                v = node_values[out]
+                table = w[0] * v[:-3] + w[1] * v[1:-2] + w[2] * v[2:-1] + w[3] * v[3:]
+                exact = exact_values[out]
+                with np.errstate(invalid = 'ignore'):
+                    error = np.abs(table - exact) / np.abs(exact)
+                values.setdefault(out, []).append(v)
+                valid[out] = valid.get(out, True) & (error <= self.tolerance)
+        for out in outputs:
+            values[out] = np.array(values[out])
+        return (x_0, values, valid)
+
+    def evaluate(self, outPropName, prop2Name, prop1Val, prop2Val):
+        outputs = NearCriticalBand.outputs.get(prop2Name)
+        if not self.enabled or outputs == None or outPropName not in outputs:
+            return None
+        if np.ndim(prop1Val) == 0 and np.ndim(prop2Val) == 0:
+            return self.evaluateScalar(outPropName, prop2Name, prop1Val, prop2Val)
+        P, val = np.broadcast_arrays(np.asarray(prop1Val, dtype = float), np.asarray(prop2Val, dtype = float))
+        spacing = NearCriticalBand.spacing[prop2Name]
+        with np.errstate(invalid = 'ignore'):
+            block_index = np.floor(val / (self.block_size * spacing))
+        P_lower, P_upper = self.getEdges()
+        value = np.full(val.shape, np.nan)
+        for index in np.unique(block_index[np.isfinite(block_index)]):
+            x_0, values, valid = self.getBlock(prop2Name, int(index))
+            selected = block_index == index
+            u = (val[selected] - x_0) / spacing
+            i = np.clip(np.floor(u).astype(int), 0, self.block_size - 1)
+            w = catmullRomWeights(u - i)
+            table = values[outPropName]
+            lower = w[0] * table[0, i] + w[1] * table[0, i+1] + w[2] * table[0, i+2] + w[3] * table[0, i+3]
+            upper = w[0] * table[1, i] + w[1] * table[1, i+1] + w[2] * table[1, i+2] + w[3] * table[1, i+3]
+            slope = (upper - lower) / (P_upper - P_lower)
+            value[selected] = np.where(valid[outPropName][i], slope * (P[selected] - P_lower) + lower, np.nan)
+        return value
+
+    def evaluateScalar(self, outPropName, prop2Name, prop1Val, prop2Val):
+        spacing = NearCriticalBand.spacing[prop2Name]
+        if not np.isfinite(prop2Val):
+            return None
+        x_0, values, valid = self.getBlock(prop2Name, int(np.floor(prop2Val / (self.block_size * spacing))))
+        u = (prop2Val - x_0) / spacing
+        i = min(max(int(np.floor(u)), 0), self.block_size - 1)
+        if not valid[outPropName][i]:
+            return None
+        w = catmullRomWeights(u - i)
+        table = values[outPropName]
+        lower = np.dot(w, table[0, i:i+4])
+        upper = np.dot(w, table[1, i:i+4])
+        P_lower, P_upper = self.getEdges()
+        return float(np.interp(prop1Val, [P_lower, P_upper], [lower, upper]))
+
+    def clear(self):
+        self.blocks.clear()
+
+# lazily built table of the near critical CO2 band, shared by all calls
+near_critical_band = NearCriticalBand()
+
+def coolPropNearCritical(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
     if fluid.lower() == 'co2':
         if prop1Name.lower() == 'p':
             P_lower = P_crit_co2 - dP_tolerance
             P_upper = P_crit_co2 + dP_tolerance
-            if P_lower < prop1Val < P_upper:
-                lower = coolProps(outPropName, 'P', P_lower, prop2Name, prop2Val, fluid)
-                upper = coolProps(outPropName, 'P', P_upper, prop2Name, prop2Val, fluid)
-                prop1Vals = np.array([P_lower, P_upper])
-                prop2Vals = np.array([lower, upper])
-                return np.interp(prop1Val, prop1Vals, prop2Vals)
+            if np.ndim(prop1Val) == 0 and np.ndim(prop2Val) == 0:
+                if P_lower < prop1Val < P_upper:
+                    value = near_critical_band.evaluate(outPropName, prop2Name, prop1Val, prop2Val)
+                    if value is not None:
+                        return value
+                    lower = coolProps(outPropName, 'P', P_lower, prop2Name, prop2Val, fluid)
+                    upper = coolProps(outPropName, 'P', P_upper, prop2Name, prop2Val, fluid)
+                    prop1Vals = np.array([P_lower, P_upper])
+                    prop2Vals = np.array([lower, upper])
+                    return np.interp(prop1Val, prop1Vals, prop2Vals)
+            else:
+                # interpolate element-wise within the band, all others directly
+                prop1Val, prop2Val = np.broadcast_arrays(np.asarray(prop1Val, dtype = float), np.asarray(prop2Val, dtype = float))
+                band = (P_lower < prop1Val) & (prop1Val < P_upper)
+                if np.any(band):
+                    value = np.empty(prop1Val.shape)
+                    outside = ~band
+                    value[outside] = coolProps(outPropName, prop1Name, prop1Val[outside], prop2Name, prop2Val[outside], fluid)
+                    band_value = near_critical_band.evaluate(outPropName, prop2Name, prop1Val[band], prop2Val[band])
+                    if band_value is None:
+                        band_value = np.full(np.count_nonzero(band), np.nan)
+                    missing = np.isnan(band_value)
+                    if np.any(missing):
+                        prop1Band = prop1Val[band][missing]
+                        prop2Band = prop2Val[band][missing]
+                        lower = coolProps(outPropName, 'P', P_lower, prop2Name, prop2Band, fluid)
+                        upper = coolProps(outPropName, 'P', P_upper, prop2Name, prop2Band, fluid)
+                        slope = (upper - lower) / (P_upper - P_lower)
+                        band_value[missing] = slope * (prop1Band - P_lower) + lower
+                    value[band] = band_value
+                    return value
 
     return coolProps(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid)
+
+def coolProp(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
+    key = property_cache.getKey(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid)
+    if key is not None:
+        value = property_cache.get(key)
+        if value is not None:
+            return value
+
+    value = None
+    if tabulated_backend.tables:
+        value = tabulated_backend.evaluate(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid)
+    if value is None:
+        value = coolPropNearCritical(outPropName, prop1Name, prop1Val, prop2Name, prop2Val, fluid)
+    elif np.ndim(value) > 0:
+        # elements not answered by the table are evaluated with the equation of state
+        missing = np.isnan(value)
+        if np.any(missing):
+            prop1Val, prop2Val = np.broadcast_arrays(np.asarray(prop1Val, dtype = float), np.asarray(prop2Val, dtype = float))
+            value[missing] = coolPropNearCritical(outPropName, prop1Name, prop1Val[missing], prop2Name, prop2Val[missing], fluid)
+
+    if key is not None:
+        property_cache.put(key, value)
+    return value
+
+class AbstractStatePool(object):
+    """AbstractStatePool holds one coolprop AbstractState per fluid and keeps
+    track of which flash the state has last been updated to."""
+    def __init__(self, backend = 'HEOS'):
+        self.backend = backend
+        self.states = {}
+        self.owners = {}
+        self.updates = 0
+
+    def acquire(self, flash):
+        fluid = flash.fluid.lower()
+        state = self.states.get(fluid)
+        if state is None:
+            state = AbstractState(self.backend, flash.fluid)
+            self.states[fluid] = state
+        if self.owners.get(fluid) is not flash:
+            self.owners[fluid] = None
+            state.update(*flash.getUpdatePair())
+            self.owners[fluid] = flash
+            self.updates += 1
+        return state
+
+abstract_state_pool = AbstractStatePool()
+
+class CoolPropFlash(object):
+    """CoolPropFlash evaluates a fluid state with a single AbstractState update
+    and reads the single properties lazily from the pooled AbstractState.
+    The near critical band of CO2 is interpolated between the band edges."""
+    def __init__(self, prop1Name, prop1Val, prop2Name, prop2Val, fluid):
+        self.prop1Name = prop1Name
+        self.prop1Val = prop1Val
+        self.prop2Name = prop2Name
+        self.prop2Val = prop2Val
+        self.fluid = fluid
+        self.values = {}
+        self.edges = None
+        if fluid.lower() == 'co2' and prop1Name.lower() == 'p':
+            P_lower = P_crit_co2 - dP_tolerance
+            P_upper = P_crit_co2 + dP_tolerance
+            if P_lower < prop1Val < P_upper:
+                self.edges = (CoolPropFlash('P', P_lower, prop2Name, prop2Val, fluid),
+                              CoolPropFlash('P', P_upper, prop2Name, prop2Val, fluid))
+
+    def getUpdatePair(self):
+        return generate_update_pair(get_parameter_index(self.prop1Name), self.prop1Val,
+                                    get_parameter_index(self.prop2Name), self.prop2Val)
+
+    def getProp(self, prop):
+        value = self.values.get(prop)
+        if value is None:
+            if self.edges != None:
+                value = near_critical_band.evaluate(prop, self.prop2Name, self.prop1Val, self.prop2Val)
+                if value is None:
+                    lower, upper = self.edges
+                    prop1Vals = np.array([lower.prop1Val, upper.prop1Val])
+                    prop2Vals = np.array([lower.getProp(prop), upper.getProp(prop)])
+                    value = np.interp(self.prop1Val, prop1Vals, prop2Vals)
+            else:
+                value = abstract_state_pool.acquire(self).keyed_output(get_parameter_index(prop))
+            self.values[prop] = value
+        return value
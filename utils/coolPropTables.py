@@ -0,0 +1,216 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import os
+import numpy as np
+
+from CoolProp import AbstractState
+from CoolProp.CoolProp import PropsSI, generate_update_pair, get_parameter_index
+
+def catmullRomWeights(t):
+    t2 = t * t
+    t3 = t2 * t
+    return np.array([(-t3 + 2.*t2 - t) / 2.,
+                     (3.*t3 - 5.*t2 + 2.) / 2.,
+                     (-3.*t3 + 4.*t2 + t) / 2.,
+                     (t3 - t2) / 2.])
+
+def evaluateStates(fluid, inputName, P, val, outputs):
+    # one AbstractState update per state for all outputs, failed states are nan
+    state = AbstractState('HEOS', fluid)
+    indices = [get_parameter_index(out) for out in outputs]
+    P_index = get_parameter_index('P')
+    val_index = get_parameter_index(inputName)
+    values = np.full((len(outputs), len(P)), np.nan)
+    for k in range(len(P)):
+        try:
+            state.update(*generate_update_pair(P_index, P[k], val_index, val[k]))
+            for n, index in enumerate(indices):
+                values[n, k] = state.keyed_output(index)
+        except ValueError:
+            pass
+    return dict(zip(outputs, values))
+
+class PropertyGrid(object):
+    """PropertyGrid holds the property values of one fluid on a regular grid of
+    log(P) and a second input (T or HMASS) and interpolates them bicubically.
+    Cells which cross a phase boundary or fail the validation against the
+    full equation of state are marked invalid and are not answered."""
+
+    def __init__(self, inputName, x, y, values, valid):
+        self.inputName = inputName
+        self.x = x
+        self.y = y
+        self.values = values
+        self.valid = valid
+
+    def interpolate(self, outPropName, P, val):
+        lnP = np.log(np.asarray(P, dtype = float))
+        val = np.asarray(val, dtype = float)
+        lnP, val = np.broadcast_arrays(lnP, val)
+        u = (lnP - self.x[0]) / (self.x[1] - self.x[0])
+        v = (val - self.y[0]) / (self.y[1] - self.y[0])
+        with np.errstate(invalid = 'ignore'):
+            i = np.floor(u)
+            j = np.floor(v)
+            inside = (i >= 1) & (i <= len(self.x) - 3) & (j >= 1) & (j <= len(self.y) - 3)
+        i = np.where(inside, i, 1).astype(int)
+        j = np.where(inside, j, 1).astype(int)
+        w_u = catmullRomWeights(u - i)
+        w_v = catmullRomWeights(v - j)
+        table = self.values[outPropName]
+        result = np.zeros(lnP.shape)
+        with np.errstate(invalid = 'ignore'):
+            for a in range(4):
+                for b in range(4):
+                    result += w_u[a] * w_v[b] * table[i - 1 + a, j - 1 + b]
+        ok = inside & self.valid[i, j]
+        return np.where(ok, result, np.nan)
+
+class PropertyTable(object):
+    """PropertyTable provides tabulated P-T and P-h properties of a fluid within
+    a bounded pressure and temperature window.
+    Units are the coolprop SI units (P [Pa], T [K], h [J/kg])."""
+
+    outputs = {'T': ['HMASS', 'DMASS', 'SMASS', 'CPMASS', 'V'],
+               'HMASS': ['T', 'DMASS', 'SMASS', 'CPMASS', 'V']}
+
+    def __init__(self, fluid, grids):
+        self.fluid = fluid
+        self.grids = grids
+
+    def evaluate(self, outPropName, prop1Name, prop1Val, prop2Name, prop2Val):
+        if prop1Name != 'P' or prop2Name not in self.grids:
+            return None
+        if outPropName not in PropertyTable.outputs[prop2Name]:
+            return None
+        return self.grids[prop2Name].interpolate(outPropName, prop1Val, prop2Val)
+
+    @staticmethod
+    def build(fluid, P_min = 1e5, P_max = 2e8, T_min_C = 0., T_max_C = 500., N_P = 250, N_T = 250, N_h = 250, tolerance = 1e-4):
+        x = np.linspace(np.log(P_min), np.log(P_max), N_P)
+        P = np.exp(x)
+        T = np.linspace(T_min_C + 273.15, T_max_C + 273.15, N_T)
+        P_crit = PropsSI('PCRIT', '', 0, '', 0, fluid)
+
+        # saturation properties of the rows below the critical pressure
+        P_sub = np.where(P < P_crit, P, np.nan)
+        T_sat = PropsSI('T', 'P', np.nan_to_num(P_sub, nan = P_min), 'Q', 0, fluid)
+        T_sat = np.where(P < P_crit, T_sat, np.nan)
+
+        h_min = np.min(PropsSI('HMASS', 'P', P, 'T', T[0], fluid))
+        h_max = np.max(PropsSI('HMASS', 'P', P, 'T', T[-1], fluid))
+        h = np.linspace(h_min, h_max, N_h)
+        h_l = np.where(P < P_crit, PropsSI('HMASS', 'P', np.nan_to_num(P_sub, nan = P_min), 'Q', 0, fluid), np.nan)
+        h_v = np.where(P < P_crit, PropsSI('HMASS', 'P', np.nan_to_num(P_sub, nan = P_min), 'Q', 1, fluid), np.nan)
+
+        grids = {}
+        grids['T'] = PropertyTable.buildGrid(fluid, 'T', x, T, [T_sat], tolerance)
+        # two-phase properties (e.g. cp) are not tabulated
+        grids['HMASS'] = PropertyTable.buildGrid(fluid, 'HMASS', x, h, [h_l, h_v], tolerance, (h_l, h_v))
+        return PropertyTable(fluid, grids)
+
+    @staticmethod
+    def buildGrid(fluid, inputName, x, y, boundaries, tolerance, two_phase = None):
+        X, Y = np.meshgrid(np.exp(x), y, indexing = 'ij')
+        outputs = PropertyTable.outputs[inputName]
+        values = evaluateStates(fluid, inputName, X.ravel(), Y.ravel(), outputs)
+        finite = np.ones(X.shape, dtype = bool)
+        for out in outputs:
+            values[out] = values[out].reshape(X.shape)
+            finite &= np.isfinite(values[out])
+        if two_phase != None:
+            lower, upper = two_phase
+            with np.errstate(invalid = 'ignore'):
+                finite &= ~((Y > lower[:, None]) & (Y < upper[:, None]))
+
+        # a cell (i, j) is interpolated from the nodes i-1..i+2 and j-1..j+2
+        N_x, N_y = X.shape
+        valid = np.zeros((N_x - 1, N_y - 1), dtype = bool)
+        valid[1:N_x-2, 1:N_y-2] = True
+        for a in range(4):
+            for b in range(4):
+                valid[1:N_x-2, 1:N_y-2] &= finite[a:N_x-3+a, b:N_y-3+b]
+
+        # cells must not cross a phase boundary
+        for boundary in boundaries:
+            for a in range(4):
+                row = boundary[a:N_x-3+a]
+                crosses = (row[:, None] >= y[None, 0:N_y-3]) & (row[:, None] <= y[None, 3:N_y])
+                valid[1:N_x-2, 1:N_y-2] &= ~crosses
+
+        grid = PropertyGrid(inputName, x, y, values, valid)
+
+        # validate all cells against the equation of state at the cell centres
+        x_c = 0.5 * (x[:-1] + x[1:])
+        y_c = 0.5 * (y[:-1] + y[1:])
+        X_c, Y_c = np.meshgrid(np.exp(x_c), y_c, indexing = 'ij')
+        # only cells which are valid so far need to be checked
+        checked = np.flatnonzero(valid)
+        exact_values = evaluateStates(fluid, inputName, X_c.ravel()[checked], Y_c.ravel()[checked], outputs)
+        for out in outputs:
+            exact = np.full(X_c.size, np.nan)
+            exact[checked] = exact_values[out]
+            exact = exact.reshape(X_c.shape)
+            table = grid.interpolate(out, X_c, Y_c)
+            scale = 1e-3 * np.nanmax(np.abs(values[out][np.isfinite(values[out])]))
+            with np.errstate(invalid = 'ignore'):
+                error = np.abs(table - exact) / np.maximum(np.abs(exact), scale)
+            valid &= error <= tolerance
+        return grid
+
+    def save(self, path):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        data = {'fluid': np.array(self.fluid)}
+        for inputName, grid in self.grids.items():
+            data['%s_x'%inputName] = grid.x
+            data['%s_y'%inputName] = grid.y
+            data['%s_valid'%inputName] = grid.valid
+            for out, values in grid.values.items():
+                data['%s_%s'%(inputName, out)] = values
+        np.savez_compressed(path, **data)
+
+    @staticmethod
+    def load(path):
+        data = np.load(path)
+        grids = {}
+        for inputName in PropertyTable.outputs:
+            values = {}
+            for out in PropertyTable.outputs[inputName]:
+                values[out] = data['%s_%s'%(inputName, out)]
+            grids[inputName] = PropertyGrid(inputName, data['%s_x'%inputName], data['%s_y'%inputName], values, data['%s_valid'%inputName])
+        return PropertyTable(str(data['fluid']), grids)
+
+    def accuracyReport(self, N = 2000, seed = 0):
+        """Compares the table with the full equation of state at random points
+        inside the table window. Returns per input pair and output property the
+        coverage (fraction answered by the table) and the max/mean relative error."""
+        rng = np.random.RandomState(seed)
+        report = {}
+        for inputName, grid in self.grids.items():
+            P = np.exp(rng.uniform(grid.x[0], grid.x[-1], N))
+            val = rng.uniform(grid.y[0], grid.y[-1], N)
+            for out in PropertyTable.outputs[inputName]:
+                exact = PropsSI(out, 'P', P, inputName, val, self.fluid)
+                table = grid.interpolate(out, P, val)
+                answered = np.isfinite(table) & np.isfinite(exact)
+                error = np.abs(table[answered] - exact[answered]) / np.abs(exact[answered])
+                report[('P', inputName, out)] = {
+                    'coverage': np.mean(answered),
+                    'max_rel_error': np.max(error) if len(error) > 0 else np.nan,
+                    'mean_rel_error': np.mean(error) if len(error) > 0 else np.nan}
+        return report
@@ -0,0 +1,91 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import numpy as np
+
+from CoolProp.CoolProp import PropsSI
+
+class FluidConstants(object):
+    """FluidConstants holds the critical point, the triple point and a dense
+    saturation table of one fluid. The constants are read from coolprop once,
+    the saturation table is built on first use.
+    Units are the coolprop SI units (T [K], P [Pa], h [J/kg], s [J/kg/K])."""
+
+    def __init__(self, fluid, N_sat = 2000):
+        self.fluid = fluid
+        self.N_sat = N_sat
+        self.T_crit = PropsSI('TCRIT', '', 0, '', 0, fluid)
+        self.P_crit = PropsSI('PCRIT', '', 0, '', 0, fluid)
+        self.T_triple = PropsSI('TTRIPLE', '', 0, '', 0, fluid)
+        self.P_triple = PropsSI('PTRIPLE', '', 0, '', 0, fluid)
+        self.saturation = None
+
+    def getSaturationTable(self):
+        if self.saturation == None:
+            T_min = max(self.T_triple, PropsSI('TMIN', '', 0, '', 0, self.fluid))
+            # nodes are clustered towards the critical point, which is excluded
+            s = np.linspace(0., 1., self.N_sat)
+            T = self.T_crit - (self.T_crit - T_min) * (1. - s)**2
+            T = T[T < self.T_crit - 1e-3]
+            P = PropsSI('P', 'T', T, 'Q', 0, self.fluid)
+            # ln(P) is close to linear in -1/T (Clausius-Clapeyron)
+            self.saturation = {
+                'T': T,
+                'P': P,
+                'x': -1. / T,
+                'lnP': np.log(P),
+                'HMASS_0': PropsSI('HMASS', 'T', T, 'Q', 0, self.fluid),
+                'HMASS_1': PropsSI('HMASS', 'T', T, 'Q', 1, self.fluid),
+                'SMASS_0': PropsSI('SMASS', 'T', T, 'Q', 0, self.fluid),
+                'SMASS_1': PropsSI('SMASS', 'T', T, 'Q', 1, self.fluid)}
+        return self.saturation
+
+    def getSaturationProps(self, inputName, val, Q):
+        # returns T, P, h and s of the saturated liquid (Q = 0) or vapor (Q = 1)
+        # or None if the state is not covered by the saturation table
+        if np.ndim(Q) != 0 or Q not in (0, 1):
+            return None
+        table = self.getSaturationTable()
+        val = np.asarray(val, dtype = float)
+        if inputName == 'T':
+            if np.any(~(val >= table['T'][0])) or np.any(~(val <= table['T'][-1])):
+                return None
+            x = -1. / val
+            T = val
+            P = np.exp(np.interp(x, table['x'], table['lnP']))
+        elif inputName == 'P':
+            if np.any(~(val >= table['P'][0])) or np.any(~(val <= table['P'][-1])):
+                return None
+            T = np.interp(np.log(val), table['lnP'], table['T'])
+            x = -1. / T
+            P = val
+        else:
+            return None
+        values = {'T': T, 'P': P,
+                  'HMASS': np.interp(x, table['x'], table['HMASS_%d'%Q]),
+                  'SMASS': np.interp(x, table['x'], table['SMASS_%d'%Q])}
+        if np.ndim(val) == 0:
+            values = {key: float(value) for key, value in values.items()}
+        return values
+
+# per fluid registry, use getFluidConstants(fluid) to access it
+fluid_constants = {}
+
+def getFluidConstants(fluid):
+    constants = fluid_constants.get(fluid.lower())
+    if constants == None:
+        constants = FluidConstants(fluid)
+        fluid_constants[fluid.lower()] = constants
+    return constants
@@ -13,8 +13,11 @@
 #
 
 ############################
-from utils.coolPropInterface import coolProp
+import numpy as np
+
+from utils.coolPropInterface import coolProp, CoolPropFlash
 from utils.constantsAndPaths import ConversionConstants
+from utils.fluidConstants import getFluidConstants
 
 class FluidState(object):
     """FluidState pulls fluid states from coolprop and provides methods for
@@ -27,13 +30,30 @@ class FluidState(object):
         - cp [J/K]
         - rho [kg/m^3]
         - S [J/K]
+    If single_flash is set, all properties of a state are read from one
+    coolprop AbstractState update instead of one PropsSI call per property.
+    All states accept numpy arrays (or lists) as input values and then return
+    arrays of the broadcast shape for all properties.
+    Saturated states from getStateFromTQ/PQ with interpolate = True take T, P,
+    h and s from the saturation table of the fluid constants.
         """
+    single_flash = False
+
     def __init__(self, prop1Name = None, prop1Val = None, prop2Name = None, prop2Val = None, fluid = None):
         self.prop1Name = prop1Name
-        self.prop1Val = prop1Val
+        self.prop1Val = FluidState.asValue(prop1Val)
         self.prop2Name = prop2Name
-        self.prop2Val = prop2Val
+        self.prop2Val = FluidState.asValue(prop2Val)
         self.fluid = fluid
+        self.flash = None
+        self.values = {}
+
+    @staticmethod
+    def asValue(val):
+        # lists and tuples are evaluated as arrays
+        if isinstance(val, (list, tuple)):
+            return np.asarray(val, dtype = float)
+        return val
 
     @property
     def P_Pa(self):
@@ -57,7 +77,7 @@ class FluidState(object):
 
     @T_C.setter
     def T_C(self, T_C):
-        self.setProp('T', T_C + ConversionConstants.kelvin2celsius)
+        self.setProp('T', FluidState.asValue(T_C) + ConversionConstants.kelvin2celsius)
 
     @property
     def s_JK(self):
@@ -84,9 +104,18 @@ class FluidState(object):
             return self.prop1Val
         if self.prop2Name == prop:
             return self.prop2Val
+        if prop in self.values:
+            return self.values[prop]
+        if FluidState.single_flash and np.isscalar(self.prop1Val) and np.isscalar(self.prop2Val):
+            if self.flash == None:
+                self.flash = CoolPropFlash(self.prop1Name, self.prop1Val, self.prop2Name, self.prop2Val, self.fluid)
+            return self.flash.getProp(prop)
         return coolProp(prop, self.prop1Name, self.prop1Val, self.prop2Name, self.prop2Val, self.fluid)
 
     def setProp(self, prop, value):
+        self.flash = None
+        self.values = {}
+        value = FluidState.asValue(value)
         if self.prop1Name == prop:
             self.prop1Val = value
         elif self.prop2Name == prop:
@@ -106,27 +135,30 @@ class FluidState(object):
 
     @staticmethod
     def getStateFromPT(P_Pa, T_C, fluid):
-        return FluidState(prop1Name = 'P', prop1Val = P_Pa, prop2Name = 'T', prop2Val = T_C + ConversionConstants.kelvin2celsius, fluid = fluid)
+        return FluidState(prop1Name = 'P', prop1Val = P_Pa, prop2Name = 'T', prop2Val = FluidState.asValue(T_C) + ConversionConstants.kelvin2celsius, fluid = fluid)
 
     @staticmethod
-    def getStateFromPQ(P_Pa, Q, fluid):
-        return FluidState(prop1Name = 'P', prop1Val = P_Pa, prop2Name = 'Q', prop2Val = Q, fluid = fluid)
+    def getStateFromPQ(P_Pa, Q, fluid, interpolate = False):
+        state = FluidState(prop1Name = 'P', prop1Val = P_Pa, prop2Name = 'Q', prop2Val = Q, fluid = fluid)
+        if interpolate:
+            state.values = getFluidConstants(fluid).getSaturationProps('P', state.prop1Val, Q) or {}
+        return state
 
     @staticmethod
     def getStateFromPS(P_Pa, s_JK, fluid):
         return FluidState(prop1Name = 'P', prop1Val = P_Pa, prop2Name = 'SMASS', prop2Val = s_JK, fluid = fluid)
 
     @staticmethod
-    def getStateFromTQ(T_C, Q, fluid):
-        return FluidState(prop1Name = 'T', prop1Val = T_C + ConversionConstants.kelvin2celsius, prop2Name = 'Q', prop2Val = Q, fluid = fluid)
-
-
-
+    def getStateFromTQ(T_C, Q, fluid, interpolate = False):
+        state = FluidState(prop1Name = 'T', prop1Val = FluidState.asValue(T_C) + ConversionConstants.kelvin2celsius, prop2Name = 'Q', prop2Val = Q, fluid = fluid)
+        if interpolate:
+            state.values = getFluidConstants(fluid).getSaturationProps('T', state.prop1Val, Q) or {}
+        return state
 
     @staticmethod
     def getTcrit(fluid):
-        return coolProp('TCRIT', "", 0, "", 0, fluid) - ConversionConstants.kelvin2celsius
+        return getFluidConstants(fluid).T_crit - ConversionConstants.kelvin2celsius
 
     @staticmethod
     def getPcrit(fluid):
-        return coolProp('PCRIT', "", 0, "", 0, fluid)
+        return getFluidConstants(fluid).P_crit
@@ -19,11 +19,12 @@ from  utils.fluidState import FluidState
 
 def frictionFactor(well_radius, P, h, m_dot, fluid, epsilon):
 
-    if well_radius == None or P == None or h == None or m_dot == None or fluid == None or epsilon == None:
+    if well_radius is None or P is None or h is None or m_dot is None or fluid is None or epsilon is None:
         return 0
 
-    rho_fluid = FluidState.getStateFromPh(P, h, fluid).rho_kgm3
-    mu = FluidState.getStateFromPh(P, h, fluid).mu_Pas
+    state = FluidState.getStateFromPh(P, h, fluid)
+    rho_fluid = state.rho_kgm3
+    mu = state.mu_Pas
 
     A_c = np.pi * well_radius**2
     V = m_dot / A_c / rho_fluid
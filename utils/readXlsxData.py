@@ -13,15 +13,82 @@
 #
 
 ############################
+import os
+import numpy as np
 import pandas as pd
 
-from utils.constantsAndPaths import getWellCost
+from utils.constantsAndPaths import getWellCost, getWellCostCache
 
 def readXlsxColumn(file, sheet, headers, headerline):
     return pd.read_excel(file, sheet_name = sheet, header = headerline, usecols = headers)
 
+class PPIIndexStore(object):
+    """PPIIndexStore parses the PPI cost index workbook once per process and
+    serves (column, year) lookups from numpy arrays. The parsed table is cached
+    as a compact binary file next to the property tables, which is rebuilt
+    when the modification time of the workbook changes."""
+
+    def __init__(self, path = None, cache_path = None, use_cache = True):
+        self.path = path if path != None else getWellCost()
+        self.cache_path = cache_path if cache_path != None else getWellCostCache()
+        self.use_cache = use_cache
+        self.years = None
+        self.columns = None
+        self.year_index = None
+
+    def load(self):
+        mtime = os.path.getmtime(self.path)
+        if self.use_cache and os.path.exists(self.cache_path):
+            data = np.load(self.cache_path)
+            if float(data['mtime']) == mtime:
+                self.setTable(data['years'], list(data['names']), data['values'])
+                return
+        table = readXlsxColumn(self.path, 'Sheet1', None, 1)
+        names = [name for name in table.columns if name != 'Year']
+        self.setTable(table['Year'].to_numpy(), names, table[names].to_numpy(dtype = float).T)
+        if self.use_cache:
+            try:
+                folder = os.path.dirname(self.cache_path)
+                if folder and not os.path.exists(folder):
+                    os.makedirs(folder)
+                np.savez(self.cache_path, mtime = mtime, years = self.years, names = np.array(names), values = np.array(list(self.columns.values())))
+            except OSError:
+                pass
+
+    def setTable(self, years, names, values):
+        self.years = np.asarray(years, dtype = float)
+        self.columns = dict(zip(names, values))
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+
+    def getColumn(self, column):
+        if self.columns == None:
+            self.load()
+        values = self.columns.get(column)
+        if values is None:
+            raise Exception('GenGeo::PPIIndexStore:UnknownColumn - Unknown cost index %s!'%column)
+        return values
+
+    def getIndex(self, column, cost_year):
+        values = self.getColumn(column)
+        if np.ndim(cost_year) == 0:
+            i = self.year_index.get(cost_year)
+            if i == None:
+                raise Exception('GenGeo::PPIIndexStore:UnknownYear - No %s cost index for %s!'%(column, cost_year))
+            return values[i]
+        # vectorized lookup of an array of years
+        cost_year = np.asarray(cost_year, dtype = float)
+        i = np.clip(np.searchsorted(self.years, cost_year), 0, len(self.years) - 1)
+        if np.any(self.years[i] != cost_year):
+            raise Exception('GenGeo::PPIIndexStore:UnknownYear - No %s cost index for %s!'%(column, cost_year[self.years[i] != cost_year]))
+        return values[i]
+
+    def getTable(self, column):
+        return dict(zip(self.years, self.getColumn(column)))
+
+# process wide store of the PPI cost indices
+ppi_index_store = PPIIndexStore()
+
 def readCostTable(column, cost_year = None):
-    table = readXlsxColumn(getWellCost(), 'Sheet1', ['Year', column], 1)
-    if cost_year == None:
-        return dict(table.to_numpy())
-    return table.query('Year == %s'%cost_year)[column].values[0]
+    if cost_year is None:
+        return ppi_index_store.getTable(column)
+    return ppi_index_store.getIndex(column, cost_year)
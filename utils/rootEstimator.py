@@ -0,0 +1,113 @@
+# Licensed under LGPL 2.1, please see LICENSE for details
+# https://www.gnu.org/licenses/lgpl-2.1.html
+#
+# The work on this project has been performed at the GEG Group at ETH Zurich:
+# --> https://geg.ethz.ch
+#
+# The initial version of this file has been implemented by:
+#
+#     Philipp Schaedle (https://github.com/philippschaedle)
+#     Benjamin M. Adams
+#
+# Further changes are done by:
+#
+
+############################
+import bisect
+import numpy as np
+
+from utils.solver import Solver
+
+class RootEstimator(object):
+    """RootEstimator estimates the zero of a function from its past points with
+    the same interpolation and extrapolation rules as Solver (getIntersection
+    with the x axis). The points are kept sorted and unique as they are added
+    and the crossings of all segments are found with numpy. Two points are the
+    secant estimate. Solver takes the first crossing in x, which for
+    non-monotone points can be any segment, so all segments are scanned
+    instead of a bisection of a bracket, and there is no Illinois step, which
+    would give other estimates than Solver."""
+
+    def __init__(self):
+        # unique (x, y) points sorted by x and y
+        self.points = []
+        # points with nan are estimated by Solver
+        self.solver = None
+
+    def addDataAndEstimate(self, x, y):
+        if self.solver != None or np.isnan(x) or np.isnan(y):
+            if self.solver == None:
+                self.solver = Solver()
+                self.solver.func1 = [np.array(point) for point in self.points]
+            return self.solver.addDataAndEstimate(x, y)
+
+        point = (np.float64(x), np.float64(y))
+        i = bisect.bisect_left(self.points, point)
+        if i == len(self.points) or self.points[i] != point:
+            self.points.insert(i, point)
+        return self.convergeToZero()
+
+    def convergeToZero(self):
+        if len(self.points) < 2:
+            # Only single values
+            # Guess last result
+            if self.points[-1][1] == 0:
+                return self.points[-1][0]
+            return np.nan
+
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            if len(self.points) == 2:
+                (x_a, y_a), (x_b, y_b) = self.points
+                m = (y_b - y_a) / (x_b - x_a)
+                x_zero = (0. - (y_a - m * x_a)) / m
+                if np.isfinite(x_zero):
+                    return x_zero
+                return self.noIntersection()
+
+            x, y = np.array(self.points).T
+            x_a = x[:-1]
+            x_b = x[1:]
+            m = (y[1:] - y[:-1]) / (x_b - x_a)
+            x_int = (0. - (y[:-1] - m * x_a)) / m
+            within = (x_int >= x_a) & (x_int < x_b)
+            # crossings within [0, 1) of the x axis segment are taken first
+            on_axis = (x_int >= 0) & (x_int < 1)
+
+            crossing = np.flatnonzero(within & on_axis)
+            if len(crossing) > 0:
+                return x_int[crossing[0]]
+
+            # extrapolation of the segments at both ends
+            left = np.sign(x_int[0] - x_a[0]) == np.sign(x_a[0] - x_b[0])
+            right = np.sign(x_int[-1] - x_b[-1]) == np.sign(x_b[-1] - x_a[-1])
+            extrap_data = within & ((x_int < 0) | (x_int > 1))
+            extrap_data[0] |= left and on_axis[0]
+            extrap_data[-1] |= right and on_axis[-1]
+            crossing = np.flatnonzero(extrap_data)
+            if len(crossing) > 0:
+                return x_int[crossing[0]]
+
+        # extrapolations crossing the extrapolated x axis, closest to the data
+        x_max = max(x[-1], 1)
+        x_min = min(x[0], 0)
+        x_zero = np.nan
+        dx_min = np.inf
+        extrap = []
+        if left and not on_axis[0]:
+            extrap.append(x_int[0])
+        if right and not on_axis[-1]:
+            extrap.append(x_int[-1])
+        for x_extrap in extrap:
+            dx_left = x_max - x_extrap if x_max - x_extrap >= 0 else np.inf
+            dx_right = x_extrap - x_min if x_extrap - x_min >= 0 else np.inf
+            if min(dx_left, dx_right) < dx_min:
+                dx_min = min(dx_left, dx_right)
+                x_zero = x_extrap
+        if np.isinf(dx_min):
+            return self.noIntersection()
+        return x_zero
+
+    def noIntersection(self):
+        # The lines appear divergent on either end.
+        print('Converge to zero not working. Nudging x to %s' %np.nan)
+        return np.nan